@@ -0,0 +1,82 @@
+"""contact full-text search indexes per user
+
+Revision ID: 5b2e8d0a7c19
+Revises: f3b6a1c8d472
+Create Date: 2026-10-17 18:40:12.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b2e8d0a7c19'
+down_revision: Union[str, None] = 'f3b6a1c8d472'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # btree_gin дає GIN-клас операторів для user_id
+    op.execute('CREATE EXTENSION IF NOT EXISTS btree_gin')
+
+    # Збіг і user_id перетинаються в самому індексі: рядки чужих контактів
+    # не читаються з таблиці
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_contacts_user_search_vector',
+            'contacts',
+            ['user_id', 'search_vector'],
+            postgresql_using='gin',
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_contacts_user_search_text_trgm',
+            'contacts',
+            ['user_id', 'search_text'],
+            postgresql_using='gin',
+            postgresql_ops={'search_text': 'gin_trgm_ops'},
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            'ix_contacts_search_text_trgm',
+            table_name='contacts',
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            'ix_contacts_search_vector',
+            table_name='contacts',
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_contacts_search_vector',
+            'contacts',
+            ['search_vector'],
+            postgresql_using='gin',
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_contacts_search_text_trgm',
+            'contacts',
+            ['search_text'],
+            postgresql_using='gin',
+            postgresql_ops={'search_text': 'gin_trgm_ops'},
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            'ix_contacts_user_search_text_trgm',
+            table_name='contacts',
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            'ix_contacts_user_search_vector',
+            table_name='contacts',
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,56 @@
+"""contact sort indexes
+
+Revision ID: a7c3e5f19b20
+Revises: 3f2a9c1d7e45
+Create Date: 2026-10-17 14:05:47.391206
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c3e5f19b20'
+down_revision: Union[str, None] = '3f2a9c1d7e45'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SORT_INDEXES = {
+    'ix_contacts_user_id_id': ['user_id', 'id'],
+    'ix_contacts_user_last_name': ['user_id', 'last_name', 'id'],
+    'ix_contacts_user_first_name': ['user_id', 'first_name', 'id'],
+    'ix_contacts_user_created_at': ['user_id', 'created_at', 'id'],
+    'ix_contacts_user_updated_at': ['user_id', 'updated_at', 'id'],
+    'ix_contacts_user_birth_date': ['user_id', 'birth_date', 'id'],
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Keyset-пагінація не працює з NULL у ключі сортування
+    op.execute(
+        "UPDATE contacts SET created_at = COALESCE(created_at, updated_at, now()), "
+        "updated_at = COALESCE(updated_at, created_at, now()) "
+        "WHERE created_at IS NULL OR updated_at IS NULL"
+    )
+    op.alter_column('contacts', 'created_at', existing_type=sa.DateTime(), nullable=False)
+    op.alter_column('contacts', 'updated_at', existing_type=sa.DateTime(), nullable=False)
+
+    # CONCURRENTLY не блокує записи, але не може йти в транзакції
+    with op.get_context().autocommit_block():
+        for name, columns in SORT_INDEXES.items():
+            op.create_index(
+                name, 'contacts', columns, postgresql_concurrently=True
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name in SORT_INDEXES:
+            op.drop_index(name, table_name='contacts', postgresql_concurrently=True)
+
+    op.alter_column('contacts', 'updated_at', existing_type=sa.DateTime(), nullable=True)
+    op.alter_column('contacts', 'created_at', existing_type=sa.DateTime(), nullable=True)
@@ -0,0 +1,47 @@
+"""contact search trigram indexes
+
+Revision ID: c4d8e2a6f031
+Revises: a7c3e5f19b20
+Create Date: 2026-10-17 15:21:09.614382
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4d8e2a6f031'
+down_revision: Union[str, None] = 'a7c3e5f19b20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TRIGRAM_COLUMNS = ('first_name', 'last_name', 'email')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+
+    # Фільтр user_id обслуговує ix_contacts_user_id_id (user_id — перша колонка)
+    with op.get_context().autocommit_block():
+        for column in TRIGRAM_COLUMNS:
+            op.create_index(
+                f'ix_contacts_{column}_trgm',
+                'contacts',
+                [column],
+                postgresql_using='gin',
+                postgresql_ops={column: 'gin_trgm_ops'},
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for column in TRIGRAM_COLUMNS:
+            op.drop_index(
+                f'ix_contacts_{column}_trgm',
+                table_name='contacts',
+                postgresql_concurrently=True,
+            )
@@ -0,0 +1,69 @@
+"""contact full-text search columns
+
+Revision ID: e91b7d3c5a28
+Revises: c4d8e2a6f031
+Create Date: 2026-10-17 16:02:44.187530
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e91b7d3c5a28'
+down_revision: Union[str, None] = 'c4d8e2a6f031'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Згенерована колонка не може посилатися на іншу, тож вираз повторюється
+SEARCH_TEXT = (
+    "lower(coalesce(first_name, '') || ' ' || coalesce(last_name, '') || ' ' || "
+    "coalesce(email, '') || ' ' || coalesce(phone_number, '') || ' ' || "
+    "coalesce(note, ''))"
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # STORED-колонки підтримує сама СУБД при кожному INSERT/UPDATE
+    op.execute(
+        f"ALTER TABLE contacts "
+        f"ADD COLUMN search_text text GENERATED ALWAYS AS ({SEARCH_TEXT}) STORED, "
+        f"ADD COLUMN search_vector tsvector "
+        f"GENERATED ALWAYS AS (to_tsvector('simple'::regconfig, {SEARCH_TEXT})) STORED"
+    )
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_contacts_search_vector',
+            'contacts',
+            ['search_vector'],
+            postgresql_using='gin',
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_contacts_search_text_trgm',
+            'contacts',
+            ['search_text'],
+            postgresql_using='gin',
+            postgresql_ops={'search_text': 'gin_trgm_ops'},
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_contacts_search_text_trgm',
+            table_name='contacts',
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            'ix_contacts_search_vector',
+            table_name='contacts',
+            postgresql_concurrently=True,
+        )
+    op.drop_column('contacts', 'search_vector')
+    op.drop_column('contacts', 'search_text')
@@ -0,0 +1,49 @@
+"""contact birthday month-day column
+
+Revision ID: f3b6a1c8d472
+Revises: e91b7d3c5a28
+Create Date: 2026-10-17 17:21:09.553108
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3b6a1c8d472'
+down_revision: Union[str, None] = 'e91b7d3c5a28'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('contacts', sa.Column('birthday_md', sa.SmallInteger(), nullable=True))
+    # month * 100 + day, як src.database.models.month_day
+    op.execute(
+        "UPDATE contacts SET birthday_md = "
+        "EXTRACT(MONTH FROM birth_date) * 100 + EXTRACT(DAY FROM birth_date)"
+    )
+    op.alter_column('contacts', 'birthday_md', existing_type=sa.SmallInteger(), nullable=False)
+
+    # CONCURRENTLY не блокує записи, але не може йти в транзакції
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_contacts_user_birthday_md',
+            'contacts',
+            ['user_id', 'birthday_md', 'id'],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_contacts_user_birthday_md',
+            table_name='contacts',
+            postgresql_concurrently=True,
+        )
+    op.drop_column('contacts', 'birthday_md')
@@ -0,0 +1,225 @@
+"""
+Benchmark: /contacts/search/ queries on a 1M-contact table.
+
+Seeds a scratch schema with 1M contacts spread over 10,000 users, then times the
+repository's search query before and after creating the ``user_id`` and
+``pg_trgm`` GIN indexes, and finally the ranked ``q=`` search over the
+full-text columns, first with global GIN indexes and then with the per-user
+``(user_id, ...)`` ones. The query plan of each run is printed, so a sequential
+scan is easy to tell from an index scan.
+
+Requires PostgreSQL with the pg_trgm and btree_gin extensions available. The
+scratch schema is dropped at the end; the application tables are not touched.
+
+Run from the backend directory:
+    DB_URL=postgresql+asyncpg://... python -m benchmarks.bench_contact_search
+"""
+
+import asyncio
+import os
+import statistics
+import time
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.conf.config import config
+from src.database.models import Base, Contact
+from src.repository.contacts import (
+    _contains_pattern,
+    _ranked_search_stmt,
+    _search_stmt,
+)
+
+SCHEMA = "bench_search"
+CONTACTS = int(os.getenv("BENCH_CONTACTS", 1_000_000))
+USERS = int(os.getenv("BENCH_USERS", 10_000))
+RUNS = 50
+SEARCHES = [
+    ("first_name", "ame42"),
+    ("last_name", "c0ffe"),
+    ("email", "mail7.c"),
+]
+# "name" схожий на ім'я кожного контакту: глобальний індекс повертає всю таблицю
+RANKED_QUERIES = ["name", "name42", "nmae42 last", "mail7.com"]
+NEW_INDEXES = ("ix_contacts_user_id_id",) + tuple(
+    f"ix_contacts_{column}_trgm" for column in ("first_name", "last_name", "email")
+)
+FULL_TEXT_INDEXES = (
+    "ix_contacts_user_search_vector",
+    "ix_contacts_user_search_text_trgm",
+)
+# Попередні глобальні індекси (до міграції 5b2e8d0a7c19), для порівняння
+GLOBAL_FULL_TEXT_INDEXES = {
+    "ix_contacts_search_vector": "gin (search_vector)",
+    "ix_contacts_search_text_trgm": "gin (search_text gin_trgm_ops)",
+}
+
+
+async def seed(conn) -> None:
+    """
+    Creates the scratch tables without the new indexes and fills them.
+
+    Args:
+        conn: An async connection with the scratch schema translation applied.
+    """
+    await conn.run_sync(Base.metadata.create_all)
+    for index in Contact.__table__.indexes:
+        await conn.execute(text(f"DROP INDEX {SCHEMA}.{index.name}"))
+    await conn.execute(
+        text(
+            f"INSERT INTO {SCHEMA}.users (username, email, hashed_password, "
+            "created_at, role, token_version) "
+            "SELECT 'user' || i, 'user' || i || '@example.com', 'x', now(), "
+            "'USER', 0 FROM generate_series(1, :users) AS i"
+        ),
+        {"users": USERS},
+    )
+    await conn.execute(
+        text(
+            f"INSERT INTO {SCHEMA}.contacts (first_name, last_name, email, "
+            "phone_number, birth_date, birthday_md, created_at, updated_at, "
+            "user_id) "
+            "SELECT 'Name' || (i % 5000), 'Last' || left(md5(i::text), 8), "
+            "'c' || i || '@mail' || (i % 100) || '.com', '555-' || i, "
+            "d, EXTRACT(MONTH FROM d) * 100 + EXTRACT(DAY FROM d), now(), now(), "
+            "1 + i % :users "
+            "FROM generate_series(1, :contacts) AS i, "
+            "LATERAL (SELECT date '1970-01-01' + (i % 18000) AS d) AS birth"
+        ),
+        {"users": USERS, "contacts": CONTACTS},
+    )
+    await conn.execute(text(f"ANALYZE {SCHEMA}.contacts"))
+
+
+async def measure(conn, label: str) -> None:
+    """
+    Times each search over ``RUNS`` users and prints the median and p99.
+
+    Args:
+        conn: An async connection with the scratch schema translation applied.
+        label (str): Name of the index setup being measured.
+    """
+    print(f"\n{label}")
+    for column, term in SEARCHES:
+        flags = {name: name == column for name in ("first_name", "last_name", "email")}
+        stmt = _search_stmt(**flags, keyset=False)
+        timings = []
+        for run in range(RUNS):
+            params = {
+                column: _contains_pattern(term),
+                "user_id": 1 + run % USERS,
+                "skip": 0,
+                "limit": 10,
+            }
+            start = time.perf_counter()
+            await conn.execute(stmt, params)
+            timings.append((time.perf_counter() - start) * 1000)
+
+        plan = await conn.execute(
+            text(
+                f"EXPLAIN SELECT id FROM {SCHEMA}.contacts "
+                f"WHERE {column} ILIKE :pattern AND user_id = 1 ORDER BY id LIMIT 10"
+            ),
+            {"pattern": _contains_pattern(term)},
+        )
+        nodes = [row[0].strip() for row in plan if "Scan" in row[0]]
+        timings.sort()
+        print(
+            f"  {column:<10} p50 {statistics.median(timings):8.2f} ms  "
+            f"p99 {timings[int(len(timings) * 0.99) - 1]:8.2f} ms  "
+            f"{nodes[0] if nodes else ''}"
+        )
+
+
+async def create_indexes(conn, names: tuple[str, ...]) -> None:
+    """
+    Creates the named indexes of the `Contact` model and refreshes statistics.
+
+    Args:
+        conn: An async connection with the scratch schema translation applied.
+        names (tuple[str, ...]): Names of the indexes to create.
+    """
+    for index in Contact.__table__.indexes:
+        if index.name in names:
+            await conn.run_sync(index.create)
+    await conn.execute(text(f"ANALYZE {SCHEMA}.contacts"))
+
+
+async def measure_ranked(conn, label: str) -> None:
+    """
+    Times the ranked ``q=`` search over ``RUNS`` users.
+
+    Args:
+        conn: An async connection with the scratch schema translation applied.
+        label (str): Name of the index setup being measured.
+    """
+    print(f"\n{label}")
+    stmt = _ranked_search_stmt(postgresql=True, keyset=False)
+    for q in RANKED_QUERIES:
+        timings = []
+        for run in range(RUNS):
+            params = {"q": q, "user_id": 1 + run % USERS, "skip": 0, "limit": 10}
+            start = time.perf_counter()
+            await conn.execute(stmt, params)
+            timings.append((time.perf_counter() - start) * 1000)
+
+        plan = await conn.execute(
+            text(
+                f"EXPLAIN SELECT id FROM {SCHEMA}.contacts WHERE user_id = 1 AND "
+                "(search_vector @@ websearch_to_tsquery('simple', :q) "
+                "OR :q <% search_text)"
+            ),
+            {"q": q},
+        )
+        nodes = [row[0].strip() for row in plan if "Scan" in row[0]]
+        timings.sort()
+        print(
+            f"  {q!r:<14} p50 {statistics.median(timings):8.2f} ms  "
+            f"p99 {timings[int(len(timings) * 0.99) - 1]:8.2f} ms  "
+            f"{'; '.join(nodes)}"
+        )
+
+
+async def main():
+    engine = create_async_engine(config.DB_URL)
+    async with engine.connect() as raw:
+        await raw.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        await raw.execute(text("CREATE EXTENSION IF NOT EXISTS btree_gin"))
+        await raw.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        await raw.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+        await raw.commit()
+
+        conn = await raw.execution_options(schema_translate_map={None: SCHEMA})
+        try:
+            print(f"Seeding {CONTACTS:,} contacts for {USERS:,} users...")
+            await seed(conn)
+            await conn.commit()
+            await measure(conn, "Before: primary key and unique email only")
+
+            await create_indexes(conn, NEW_INDEXES)
+            await conn.commit()
+            await measure(conn, "After: user_id and pg_trgm GIN indexes")
+
+            for name, definition in GLOBAL_FULL_TEXT_INDEXES.items():
+                await conn.execute(
+                    text(f"CREATE INDEX {name} ON {SCHEMA}.contacts USING {definition}")
+                )
+            await conn.execute(text(f"ANALYZE {SCHEMA}.contacts"))
+            await conn.commit()
+            await measure_ranked(conn, "Ranked q= search: global GIN indexes")
+
+            for name in GLOBAL_FULL_TEXT_INDEXES:
+                await conn.execute(text(f"DROP INDEX {SCHEMA}.{name}"))
+            await create_indexes(conn, FULL_TEXT_INDEXES)
+            await conn.commit()
+            await measure_ranked(conn, "Ranked q= search: per-user GIN indexes")
+        finally:
+            await conn.rollback()
+            await raw.execute(text(f"DROP SCHEMA {SCHEMA} CASCADE"))
+            await raw.commit()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
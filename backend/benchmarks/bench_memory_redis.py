@@ -0,0 +1,80 @@
+"""
+Benchmark: auth cache and rate limiter on the in-process ``memory://`` backend.
+
+Measures the per-call cost of the Redis-facing code paths without a Redis
+server, so changes to them can be compared in one process. Network latency is
+not included; with a real server each call adds one round trip.
+
+Run from the backend directory:
+    python -m benchmarks.bench_memory_redis
+"""
+
+import asyncio
+import os
+import time
+
+os.environ.setdefault("REDIS_URL", "memory://")
+
+from src.core.rate_limiter import ALGORITHMS, RateLimiter  # noqa: E402
+from src.core.user_cache import UserCache  # noqa: E402
+from src.database.models import UserRole  # noqa: E402
+from src.schemas import UserPrincipal  # noqa: E402
+
+CALLS = 20_000
+USERS = 1_000
+
+
+async def run(label: str, call, calls: int = CALLS) -> float:
+    """
+    Awaits ``call(i)`` for every i and prints the per-call cost.
+
+    Args:
+        label (str): Name printed next to the result.
+        call: Coroutine function taking the call index.
+        calls (int): Number of calls.
+
+    Returns:
+        float: Mean cost per call in microseconds.
+    """
+    start = time.perf_counter()
+    for i in range(calls):
+        await call(i)
+    per_call = (time.perf_counter() - start) / calls * 1e6
+    print(f"{label:<34} {per_call:8.2f} us/call")
+    return per_call
+
+
+async def main():
+    principals = [
+        UserPrincipal(
+            id=i,
+            username=f"user{i}",
+            email=f"user{i}@example.com",
+            role=UserRole.USER,
+            is_verified=True,
+        )
+        for i in range(USERS)
+    ]
+
+    cache = UserCache(local_size=USERS, local_ttl=30, redis_ttl=600)
+    await run(
+        "user_cache.set (HSET+EXPIRE)",
+        lambda i: cache.set(f"user{i % USERS}", principals[i % USERS]),
+    )
+    await run("user_cache.get, local hit", lambda i: cache.get(f"user{i % USERS}"))
+
+    async def redis_hit(i):
+        cache.clear()
+        return await cache.get(f"user{i % USERS}")
+
+    await run("user_cache.get, redis hit", redis_hit)
+
+    for algorithm in sorted(ALGORITHMS):
+        limiter = RateLimiter(limit=100, window=60, algorithm=algorithm, local=False)
+        await run(
+            f"rate limit, {algorithm}", lambda i: limiter.hit(f"user:{i % USERS}")
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,166 @@
+"""
+Benchmark: per-call cost of repository queries, rebuilt vs prebuilt statements.
+
+"rebuilt" constructs the ``select()`` on every call, as the repositories did
+before; "prebuilt" executes the module-level statements with bound parameters.
+Both run against a small in-memory SQLite database, so the difference between
+the columns is Python overhead (statement construction and cache-key
+generation), not query time.
+
+Run from the backend directory:
+    python -m benchmarks.bench_repository_statements
+"""
+
+import asyncio
+import os
+import time
+from datetime import date
+
+os.environ.setdefault("DB_URL", "sqlite+aiosqlite://")
+
+from sqlalchemy import and_, extract, or_, select  # noqa: E402
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+
+from src.database.models import Base, Contact, User  # noqa: E402
+from src.repository.contacts import ContactRepository  # noqa: E402
+from src.repository.users import UserRepository  # noqa: E402
+
+CALLS = 5_000
+CONTACTS = 50
+TODAY = date(2024, 6, 1)
+NEXT_WEEK = date(2024, 6, 8)
+
+
+def rebuilt_queries(user: User) -> dict:
+    """
+    Returns the queries as the repositories used to build them, per call.
+
+    Args:
+        user (User): The owner of the contacts.
+
+    Returns:
+        dict: Method name to a zero-argument statement factory.
+    """
+    doy = extract("doy", Contact.birth_date)
+    return {
+        "get_contacts": lambda: select(Contact)
+        .filter_by(user_id=user.id)
+        .offset(0)
+        .limit(10),
+        "get_contact_by_id": lambda: select(Contact).filter_by(id=1, user_id=user.id),
+        "get_contacts_by_ids": lambda: select(Contact).where(
+            Contact.id.in_([1, 2, 3]), Contact.user_id == user.id
+        ),
+        "search_contacts": lambda: select(Contact)
+        .filter(Contact.first_name.ilike("%a%"))
+        .filter(Contact.email.ilike("%example%"))
+        .filter_by(user_id=user.id)
+        .offset(0)
+        .limit(10),
+        "get_upcoming_birthdays": lambda: select(Contact)
+        .filter_by(user_id=user.id)
+        .filter(or_(and_(doy >= 153, doy <= 160)))
+        .order_by(doy)
+        .offset(0)
+        .limit(10),
+        "get_user_by_id": lambda: select(User).filter_by(id=user.id),
+        "get_user_by_username": lambda: select(User).filter_by(username=user.username),
+        "get_user_by_email": lambda: select(User).filter_by(email=user.email),
+    }
+
+
+def prebuilt_queries(session, user: User) -> dict:
+    """
+    Returns the current repository methods as zero-argument coroutines.
+
+    Args:
+        session: The session the repositories use.
+        user (User): The owner of the contacts.
+
+    Returns:
+        dict: Method name to a coroutine function.
+    """
+    contacts = ContactRepository(session)
+    users = UserRepository(session)
+    return {
+        "get_contacts": lambda: contacts.get_contacts(0, 10, user),
+        "get_contact_by_id": lambda: contacts.get_contact_by_id(1, user),
+        "get_contacts_by_ids": lambda: contacts.get_contacts_by_ids([1, 2, 3], user),
+        "search_contacts": lambda: contacts.search_contacts(
+            0, 10, "a", None, "example", user
+        ),
+        "get_upcoming_birthdays": lambda: contacts.get_upcoming_birthdays(
+            TODAY, NEXT_WEEK, 0, 10, user
+        ),
+        "get_user_by_id": lambda: users.get_user_by_id(user.id),
+        "get_user_by_username": lambda: users.get_user_by_username(user.username),
+        "get_user_by_email": lambda: users.get_user_by_email(user.email),
+    }
+
+
+async def per_call_us(call) -> float:
+    """
+    Awaits ``call()`` CALLS times and returns the mean cost.
+
+    Args:
+        call: Coroutine function without arguments.
+
+    Returns:
+        float: Mean cost per call in microseconds.
+    """
+    for _ in range(100):
+        await call()
+    start = time.perf_counter()
+    for _ in range(CALLS):
+        await call()
+    return (time.perf_counter() - start) / CALLS * 1e6
+
+
+async def main():
+    engine = create_async_engine(
+        "sqlite+aiosqlite://",
+        poolclass=StaticPool,
+        connect_args={"check_same_thread": False},
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    session_maker = async_sessionmaker(engine, expire_on_commit=False)
+    async with session_maker() as session:
+        user = User(username="bench", email="bench@example.com", hashed_password="x")
+        session.add(user)
+        await session.flush()
+        session.add_all(
+            Contact(
+                first_name=f"Name{i}",
+                last_name=f"Last{i}",
+                email=f"name{i}@example.com",
+                phone_number=f"+38050{i:07d}",
+                birth_date=date(1990, 1 + i % 12, 1 + i % 28),
+                user_id=user.id,
+            )
+            for i in range(CONTACTS)
+        )
+        await session.commit()
+
+        async def execute(factory):
+            result = await session.execute(factory())
+            return result.scalars().all()
+
+        rebuilt = rebuilt_queries(user)
+        prebuilt = prebuilt_queries(session, user)
+        print(f"{'method':<24} {'rebuilt':>10} {'prebuilt':>10} {'saved':>8}")
+        for name, factory in rebuilt.items():
+            before = await per_call_us(lambda: execute(factory))
+            after = await per_call_us(prebuilt[name])
+            print(
+                f"{name:<24} {before:8.1f}us {after:8.1f}us "
+                f"{(1 - after / before) * 100:7.1f}%"
+            )
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
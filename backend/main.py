@@ -1,12 +1,40 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import Response
 from src.api import utils, contacts, auth_router, users, create_admin
+from src.core.hashing import hash_executor
+from src.core.suggest_index import suggest_index
+from src.services.birthdays import run_daily_birthday_refresh
+from src.core.user_cache import user_cache
 import os
 
 # source $(poetry env info --path)/bin/activate
 
-app = FastAPI(debug=True)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Starts background workers for the lifetime of the application.
+
+    Subscribes to user cache and typeahead index invalidations so this worker
+    evicts its local entries when another worker changes a user or a contact,
+    and refreshes the materialized upcoming birthdays daily.
+    """
+    listeners = [
+        asyncio.create_task(user_cache.listen_for_invalidations()),
+        asyncio.create_task(suggest_index.listen_for_invalidations()),
+        asyncio.create_task(run_daily_birthday_refresh()),
+    ]
+    yield
+    for listener in listeners:
+        listener.cancel()
+    hash_executor.shutdown()
+
+
+app = FastAPI(debug=True, lifespan=lifespan)
 
 # 👇 Дозволяємо CORS
 origins = [
@@ -21,6 +49,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Link"],
 )
 
 
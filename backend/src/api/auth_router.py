@@ -2,12 +2,20 @@ from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks,
 from sqlalchemy.orm import Session
 from fastapi.security import OAuth2PasswordRequestForm
 from src.schemas import UserCreate, Token, User, RequestPasswordReset, PasswordResetConfirm
-from src.services.auth import  Hash
+from src.services.auth import Hash
+from src.core.jwt_cache import jwt_cache
+from src.core.token_versions import mirror_token_version, set_token_version
+from src.core.user_cache import user_cache
 from src.services.users import UserService
 from src.database.db import get_db
 from src.conf.config import config
-from jose import jwt, JWTError
-from src.utils.tokens import generate_password_reset_token, create_access_token, create_refresh_token
+from jose import JWTError
+from src.utils.tokens import (
+    generate_password_reset_token,
+    create_access_token,
+    create_refresh_token,
+    principal_claims,
+)
 
 
 router  = APIRouter(tags=["auth"])
@@ -44,7 +52,7 @@ async def register_user(user_data: UserCreate, db: Session = Depends(get_db)):
             status_code=status.HTTP_409_CONFLICT,
             detail="Користувач з таким іменем вже існує",
         )
-    user_data.password = Hash().get_password_hash(user_data.password)
+    user_data.password = await Hash().get_password_hash_async(user_data.password)
     new_user = await user_service.create_user(user_data)
 
     return new_user
@@ -58,6 +66,9 @@ async def login_user(
     """
     Authenticate a user and return JWT access and refresh tokens.
 
+    A password hash stored with an outdated scheme or cost is transparently
+    rehashed with the current parameters.
+
     Args:
         form_data (OAuth2PasswordRequestForm): User's login credentials.
         db (Session): Database session dependency.
@@ -70,15 +81,30 @@ async def login_user(
     """
     user_service = UserService(db)
     user = await user_service.get_user_by_username(form_data.username)
-    if not user or not Hash().verify_password(form_data.password, user.hashed_password):
+    verified, new_hash = (
+        await Hash().verify_and_update_async(form_data.password, user.hashed_password)
+        if user
+        else (False, None)
+    )
+    if not verified:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Неправильний логін або пароль",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    access_token = await create_access_token(data={"sub": user.username})
-    refresh_token = await create_refresh_token(data={"sub": user.username})
+    # Хеш зі застарілими параметрами — перехешовуємо поточними
+    if new_hash:
+        user.hashed_password = new_hash
+        await db.commit()
+        await db.refresh(user)
+
+    claims = principal_claims(user)
+    if config.JWT_CLAIMS_PRINCIPAL:
+        await mirror_token_version(user.id, user.token_version)
+
+    access_token = await create_access_token(data=claims)
+    refresh_token = await create_refresh_token(data=claims)
     return {
         "access_token": access_token,
         "refresh_token": refresh_token,
@@ -87,22 +113,29 @@ async def login_user(
 
 
 @router.post("/refresh", response_model=Token)
-async def refresh_access_token(refresh_token: str = Body(..., embed=True)):
+async def refresh_access_token(
+    refresh_token: str = Body(..., embed=True), db: Session = Depends(get_db)
+):
     """
     Generate a new access token using a valid refresh token.
 
+    Claims-based tokens are re-issued from the current user row, so a refresh
+    token whose version has been revoked is rejected and role changes are
+    picked up.
+
     Args:
         refresh_token (str): JWT refresh token.
+        db (Session): Database session dependency.
 
     Returns:
         dict: Dictionary containing a new access token, original refresh token, and token type.
 
     Raises:
-        HTTPException: If the token is invalid or expired.
+        HTTPException: If the token is invalid, expired or revoked.
     """
     try:
-        payload = jwt.decode(
-            refresh_token, config.JWT_SECRET_REFRESH, algorithms=[config.JWT_ALGORITHM]
+        payload = jwt_cache.decode(
+            refresh_token, config.JWT_SECRET_REFRESH, config.JWT_ALGORITHM
         )
         username = payload.get("sub")
         if not username:
@@ -110,7 +143,14 @@ async def refresh_access_token(refresh_token: str = Body(..., embed=True)):
     except JWTError:
         raise HTTPException(status_code=401, detail="Invalid or expired refresh token")
 
-    new_access_token = await create_access_token(data={"sub": username})
+    if not config.JWT_CLAIMS_PRINCIPAL and "uid" not in payload:
+        new_access_token = await create_access_token(data={"sub": username})
+    else:
+        user = await UserService(db).get_user_by_username(username)
+        if not user or payload.get("ver", user.token_version) != user.token_version:
+            raise HTTPException(status_code=401, detail="Invalid or expired refresh token")
+        new_access_token = await create_access_token(data=principal_claims(user))
+
     return {
         "access_token": new_access_token,
         "refresh_token": refresh_token,
@@ -123,6 +163,9 @@ async def verify_email(token: str, db: Session = Depends(get_db)):
     """
     Verify user's email using a JWT token.
 
+    Tokens issued before verification carry a stale verification claim, so
+    verifying bumps the user's token version and revokes them.
+
     Args:
         token (str): Email verification token.
         db (Session): Database session dependency.
@@ -135,9 +178,7 @@ async def verify_email(token: str, db: Session = Depends(get_db)):
     """
 
     try:
-        payload = jwt.decode(
-            token, config.JWT_SECRET, algorithms=[config.JWT_ALGORITHM]
-        )
+        payload = jwt_cache.decode(token, config.JWT_SECRET, config.JWT_ALGORITHM)
         email = payload["sub"]
     except JWTError:
         raise HTTPException(status_code=400, detail="Invalid or expired token")
@@ -147,8 +188,14 @@ async def verify_email(token: str, db: Session = Depends(get_db)):
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
-    user.is_verified = True  # Підтверджуємо email
-    await db.commit()
+    if not user.is_verified:
+        user.is_verified = True  # Підтверджуємо email
+        # Видані раніше токени несуть vrf=false: відкликаємо їх, як при зміні пароля
+        user.token_version += 1
+        await db.commit()
+        await db.refresh(user)
+        await set_token_version(user.id, user.token_version)
+        await user_cache.invalidate(user)
     return {"message": "Email verified successfully"}
 
 
@@ -202,8 +249,8 @@ async def password_reset_confirm(
         HTTPException: If token is invalid or user not found.
     """
     try:
-        payload = jwt.decode(
-            data.token, config.JWT_SECRET, algorithms=[config.JWT_ALGORITHM]
+        payload = jwt_cache.decode(
+            data.token, config.JWT_SECRET, config.JWT_ALGORITHM
         )
         email = payload["sub"]
     except JWTError:
@@ -215,7 +262,13 @@ async def password_reset_confirm(
         raise HTTPException(status_code=404, detail="User not found")
 
     hash_service = Hash()
-    user.password = hash_service.get_password_hash(data.new_password)
+    user.hashed_password = await hash_service.get_password_hash_async(
+        data.new_password
+    )
+    # Відкликаємо всі видані раніше токени
+    user.token_version += 1
     await db.commit()
+    await db.refresh(user)
+    await set_token_version(user.id, user.token_version)
 
     return {"message": "Password reset successfully"}
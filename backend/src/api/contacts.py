@@ -1,48 +1,215 @@
-from typing import List
+import json
+from typing import List, Literal
 
-from fastapi import APIRouter, HTTPException, Depends, status, Query
+from fastapi import APIRouter, HTTPException, Depends, Request, Response, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.database.db import get_db
-from src.schemas import ContactCreate, ContactResponse
+from src.database.db import get_db, get_read_db
+from src.schemas import (
+    ContactCreate,
+    ContactImportResult,
+    ContactResponse,
+    ContactSuggestion,
+    ContactUpdate,
+)
 from src.services.contacts import ContactService
-from src.services.auth import get_current_user
+from src.services.auth import get_current_principal
 from src.database.models import User
+from src.core.cursors import InvalidCursorError, decode_cursor, encode_cursor
+from src.core.rate_limiter import RateLimiter
+from src.repository.contacts import (
+    birthday_sort_key,
+    contact_sort_key,
+    parse_birthday_sort_key,
+    parse_contact_sort_key,
+    parse_ranked_sort_key,
+)
+from src.conf.config import config
+from src.utils.contact_files import CONTENT_TYPES, READERS
 
 from typing import List, Optional
 
-router = APIRouter(prefix="/contacts", tags=["contacts"])
+contacts_rate_limiter = RateLimiter(
+    limit=config.RATE_LIMIT_CONTACTS,
+    window=config.RATE_LIMIT_WINDOW,
+    algorithm=config.RATE_LIMIT_ALGORITHM,
+    scope="contacts",
+)
+
+router = APIRouter(
+    prefix="/contacts",
+    tags=["contacts"],
+    dependencies=[Depends(contacts_rate_limiter)],
+)
+
+CURSOR_DESCRIPTION = (
+    "Opaque cursor from the `Link: rel=\"next\"` header of the previous page; "
+    "replaces `skip`"
+)
+
+
+def _cursor_scope(listing: str, *params) -> str:
+    """
+    Builds the scope of a listing's cursors.
+
+    Every parameter that changes which rows are listed or in what order must be
+    passed in, so a cursor is rejected once any of them differs.
+
+    Args:
+        listing (str): Name of the listing.
+        *params: The listing's ordering and filter parameters.
+
+    Returns:
+        str: The scope; JSON, so values containing separators stay unambiguous.
+    """
+    return json.dumps([listing, *params], separators=(",", ":"))
+
+
+def _cursor_key(cursor: Optional[str], scope: str, parse) -> list | None:
+    """
+    Decodes the ``cursor`` query parameter of a paginated listing.
+
+    Args:
+        cursor (Optional[str]): The cursor sent by the client, if any.
+        scope (str): Scope of the listing, see `_cursor_scope`.
+        parse: Function that validates the decoded key and restores its types.
+
+    Returns:
+        list | None: The sort key to resume after, or None for offset paging.
+
+    Raises:
+        HTTPException: 400 if the cursor is invalid.
+    """
+    if cursor is None:
+        return None
+    try:
+        return parse(decode_cursor(cursor, scope))
+    except (InvalidCursorError, ValueError) as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+def _link_next_page(
+    request: Request,
+    response: Response,
+    contacts: list,
+    limit: int,
+    scope: str,
+    sort_key,
+) -> None:
+    """
+    Sets the ``Link: rel="next"`` header with the cursor of the next page.
+
+    Args:
+        request (Request): The current request; its URL is the base of the link.
+        response (Response): The response to add the header to.
+        contacts (list): The rows of the current page.
+        limit (int): The page size.
+        scope (str): Scope of the listing, see `_cursor_scope`.
+        sort_key: Function returning the sort key of a row.
+    """
+    # Неповна (або порожня) сторінка — остання
+    if not contacts or len(contacts) < limit:
+        return
+    token = encode_cursor(scope, sort_key(contacts[-1]))
+    url = request.url.remove_query_params("skip").include_query_params(cursor=token)
+    response.headers["Link"] = f'<{url}>; rel="next"'
 
 
 @router.get("/", response_model=List[ContactResponse])
 async def read_contacts(
-    skip: int = 0,
-    limit: int = 100,
-    db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    request: Request,
+    response: Response,
+    skip: int = Query(0, ge=0, description="Number of records to skip (must be >= 0)"),
+    limit: int = Query(
+        100, ge=1, le=1000, description="Maximum number of records to return (1-1000)"
+    ),
+    sort: Literal[
+        "id", "last_name", "first_name", "created_at", "updated_at", "birth_date"
+    ] = Query("id", description="Column to sort by; ties are broken by ID"),
+    order: Literal["asc", "desc"] = Query("asc", description="Sort direction"),
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    db: AsyncSession = Depends(get_read_db),
+    user: User = Depends(get_current_principal),
 ):
     """
-    Get a list of user's contacts.
+    Get a sorted list of user's contacts.
+
+    Every sort order is served by a ``(user_id, column, id)`` index. The
+    ``Link`` header of a full page points to the next one through a keyset
+    cursor, which costs the same at any depth.
 
     Args:
+        request (Request): The current request.
+        response (Response): The response, used for the ``Link`` header.
         skip (int): Number of records to skip. Defaults to 0.
-        limit (int): Maximum number of contacts to return. Defaults to 100.
+        limit (int): Maximum number of contacts to return (1-1000). Defaults to 100.
+        sort (str): Column to sort by. Defaults to ``id``.
+        order (str): ``asc`` or ``desc``. Defaults to ``asc``.
+        cursor (Optional[str]): Cursor of the next page; replaces ``skip``.
         db (AsyncSession): Database session.
         user (User): Authenticated user.
 
     Returns:
         List[ContactResponse]: List of contacts belonging to the user.
+
+    Raises:
+        HTTPException: 400 if the cursor is invalid or from another sort order.
     """
+    scope = _cursor_scope("contacts", sort, order)
+    after = _cursor_key(cursor, scope, lambda key: parse_contact_sort_key(key, sort))
     contact_service = ContactService(db)
-    contacts = await contact_service.get_contacts(skip, limit, user)
+    contacts = await contact_service.get_contacts(
+        skip, limit, user, after, sort, order == "desc"
+    )
+    _link_next_page(
+        request,
+        response,
+        contacts,
+        limit,
+        scope,
+        lambda contact: contact_sort_key(contact, sort),
+    )
     return contacts
 
 
+# Оголошено перед /{contact_id}, інакше "suggest" розбирався б як ID
+@router.get("/suggest", response_model=List[ContactSuggestion])
+async def suggest_contacts(
+    q: str = Query(
+        ..., min_length=1, max_length=100, description="What the user has typed so far"
+    ),
+    limit: int = Query(
+        10, ge=1, le=50, description="Maximum number of suggestions (1-50)"
+    ),
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(get_current_principal),
+):
+    """
+    Suggest contacts as the user types.
+
+    Every word of ``q`` must start the first name, last name or email of a
+    contact. Suggestions come from an in-process prefix index, so keystrokes do
+    not query the database; only the first request of a user builds the index.
+    It is built from the primary, so replica lag is never frozen into it.
+
+    Args:
+        q (str): What the user has typed so far.
+        limit (int): Maximum number of suggestions.
+        db (AsyncSession): Database session, used only to build the index.
+        user (User): Authenticated user.
+
+    Returns:
+        List[ContactSuggestion]: Matching contacts, ordered by the matched term.
+    """
+    contact_service = ContactService(db)
+    return await contact_service.suggest(q, limit, user)
+
+
 @router.get("/{contact_id}", response_model=ContactResponse)
 async def read_contact(
     contact_id: int,
-    db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_read_db),
+    user: User = Depends(get_current_principal),
 ):
     """
     Retrieve a specific contact by ID.
@@ -72,7 +239,7 @@ async def read_contact(
 async def create_contact(
     body: ContactCreate,
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: User = Depends(get_current_principal),
 ):
     """
     Create a new contact for the authenticated user.
@@ -89,12 +256,56 @@ async def create_contact(
     return await contact_service.create_contact(body, user)
 
 
+@router.post("/import", response_model=ContactImportResult)
+async def import_contacts(
+    request: Request,
+    format: Optional[Literal["csv", "jsonl", "vcard"]] = Query(
+        None, description="File format; taken from the Content-Type when omitted"
+    ),
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(get_current_principal),
+):
+    """
+    Import contacts from a CSV, JSON Lines or vCard file sent as the request body.
+
+    The body is read as it streams in and written in batches, so files of any
+    size are imported in constant memory. Records that fail validation, or
+    whose email already exists, are reported by line; the rest are imported.
+    Each batch is committed on its own, so if the database fails mid-import
+    the earlier batches stay and the result reports where the import stopped.
+
+    Args:
+        request (Request): The incoming request carrying the file.
+        format (Optional[str]): The file format.
+        db (AsyncSession): Database session.
+        user (User): Authenticated user.
+
+    Returns:
+        ContactImportResult: Imported and failed counts with per-line errors.
+
+    Raises:
+        HTTPException: 415 if the file format is not recognized.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    format = format or CONTENT_TYPES.get(content_type.lower())
+    if format is None:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Send text/csv, application/x-ndjson or text/vcard, "
+            "or set the format parameter",
+        )
+    contact_service = ContactService(db)
+    return await contact_service.import_contacts(
+        READERS[format](request.stream()), user
+    )
+
+
 @router.put("/{contact_id}", response_model=ContactResponse)
 async def update_contact(
     body: ContactCreate,
     contact_id: int,
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: User = Depends(get_current_principal),
 ):
     """
     Update an existing contact.
@@ -121,11 +332,42 @@ async def update_contact(
     return contact
 
 
+@router.patch("/{contact_id}", response_model=ContactResponse)
+async def patch_contact(
+    body: ContactUpdate,
+    contact_id: int,
+    db: AsyncSession = Depends(get_db),
+    user: User = Depends(get_current_principal),
+):
+    """
+    Update only the supplied fields of a contact.
+
+    Args:
+        body (ContactUpdate): The fields to change; omitted fields are kept.
+        contact_id (int): ID of the contact to update.
+        db (AsyncSession): Database session.
+        user (User): Authenticated user.
+
+    Returns:
+        ContactResponse: The updated contact.
+
+    Raises:
+        HTTPException: If the contact is not found.
+    """
+    contact_service = ContactService(db)
+    contact = await contact_service.patch_contact(contact_id, body, user)
+    if contact is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Contact not found"
+        )
+    return contact
+
+
 @router.delete("/{contact_id}", response_model=ContactResponse)
 async def remove_contact(
     contact_id: int,
     db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    user: User = Depends(get_current_principal),
 ):
     """
     Delete a contact by ID.
@@ -152,6 +394,8 @@ async def remove_contact(
 
 @router.get("/search/", response_model=List[ContactResponse])
 async def search_contacts(
+    request: Request,
+    response: Response,
     skip: int = Query(0, ge=0, description="Number of records to skip (must be >= 0)"),
     limit: int = Query(
         10, ge=1, le=100, description="Maximum number of records to return (1-100)"
@@ -165,33 +409,80 @@ async def search_contacts(
     email: Optional[str] = Query(
         None, description="Filter contacts by email address (case-insensitive)"
     ),
-    db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    q: Optional[str] = Query(
+        None,
+        min_length=1,
+        max_length=200,
+        description=(
+            "Ranked search over names, email, phone and note; tolerates typos. "
+            "Cannot be combined with the field filters"
+        ),
+    ),
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    db: AsyncSession = Depends(get_read_db),
+    user: User = Depends(get_current_principal),
 ) -> List[ContactResponse]:
     """
     Search contacts by first name, last name, or email with pagination.
 
+    Field filters return results ordered by ID. With ``q``, all text fields are
+    searched and results are ordered by relevance. The ``Link`` header of a
+    full page points to the next one.
+
     Args:
+        request (Request): The current request.
+        response (Response): The response, used for the ``Link`` header.
         skip (int): Number of records to skip (default: 0, must be >= 0).
         limit (int): Maximum number of records to return (default: 10, range: 1-100).
         first_name (Optional[str]): Filter by first name (optional).
         last_name (Optional[str]): Filter by last name (optional).
         email (Optional[str]): Filter by email address (optional).
+        q (Optional[str]): Ranked full-text query (optional).
+        cursor (Optional[str]): Cursor of the next page; replaces ``skip``.
         db (AsyncSession): The database session.
         user (User): The currently authenticated user.
 
     Returns:
         List[ContactResponse]: A list of contacts matching the search criteria.
+
+    Raises:
+        HTTPException: 400 if the cursor is invalid or from other filters, or
+        ``q`` is combined with field filters.
     """
     contact_service = ContactService(db)
+    if q is not None:
+        if first_name or last_name or email:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="q cannot be combined with field filters",
+            )
+        # Курсор прив'язаний до запиту: рейтинг залежить від q
+        scope = _cursor_scope("search-q", q)
+        after = _cursor_key(cursor, scope, parse_ranked_sort_key)
+        ranked = await contact_service.ranked_search(q, skip, limit, user, after)
+        _link_next_page(
+            request,
+            response,
+            ranked,
+            limit,
+            scope,
+            lambda row: [row[1], row[0].id],
+        )
+        return [contact for contact, _ in ranked]
+
+    scope = _cursor_scope("search", first_name, last_name, email)
+    after = _cursor_key(cursor, scope, parse_contact_sort_key)
     contacts = await contact_service.search_contacts(
-        skip, limit, first_name, last_name, email, user
+        skip, limit, first_name, last_name, email, user, after
     )
+    _link_next_page(request, response, contacts, limit, scope, contact_sort_key)
     return contacts
 
 
 @router.get("/birthdays/", response_model=List[ContactResponse])
 async def get_upcoming_birthdays(
+    request: Request,
+    response: Response,
     days: int = Query(
         7,
         ge=1,
@@ -202,22 +493,36 @@ async def get_upcoming_birthdays(
     limit: int = Query(
         10, ge=1, le=100, description="Maximum number of records to return (1-100)"
     ),
-    db: AsyncSession = Depends(get_db),
-    user: User = Depends(get_current_user),
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
+    db: AsyncSession = Depends(get_read_db),
+    user: User = Depends(get_current_principal),
 ) -> List[ContactResponse]:
     """
     Retrieve a list of contacts with upcoming birthdays within the next `days` days.
 
+    The ``Link`` header of a full page points to the next one.
+
     Args:
+        request (Request): The current request.
+        response (Response): The response, used for the ``Link`` header.
         days (int): Number of days to look ahead for birthdays (default: 7, range: 1-364).
         skip (int): Number of records to skip (default: 0, must be >= 0).
         limit (int): Maximum number of records to return (default: 10, range: 1-100).
+        cursor (Optional[str]): Cursor of the next page; replaces ``skip``.
         db (AsyncSession): The database session.
         user (User): The currently authenticated user.
 
     Returns:
         List[ContactResponse]: A list of contacts with upcoming birthdays.
+
+    Raises:
+        HTTPException: 400 if the cursor is invalid or from another ``days``.
     """
+    scope = _cursor_scope("upcoming-birthdays", days)
+    after = _cursor_key(cursor, scope, parse_birthday_sort_key)
     contact_service = ContactService(db)
-    contacts = await contact_service.get_upcoming_birthdays(days, skip, limit, user)
+    contacts = await contact_service.get_upcoming_birthdays(
+        days, skip, limit, user, after
+    )
+    _link_next_page(request, response, contacts, limit, scope, birthday_sort_key)
     return contacts
@@ -4,7 +4,8 @@ from src.schemas import UserCreate, User
 from src.database.models import UserRole
 from src.services.users import UserService
 from src.database.db import get_db
-from src.services.auth import get_current_admin_user  
+from src.services.auth import Hash, get_current_admin_user
+from src.core.user_cache import user_cache
 
 router = APIRouter( tags=["Admin"])
 
@@ -40,5 +41,8 @@ async def create_admin(
             status_code=400, detail="Користувач з таким email уже існує"
         )
 
+    body.password = await Hash().get_password_hash_async(body.password)
     new_admin = await user_service.create_user(body, role=UserRole.ADMIN)
+    # Роль змінилась: скидаємо закешованого принципала на всіх воркерах
+    await user_cache.invalidate(new_admin)
     return new_admin
@@ -1,54 +1,34 @@
 from fastapi import APIRouter, Depends, HTTPException
 from src.schemas import User
 from src.services.auth import get_current_user
-import redis.asyncio as redis
-import os
 from src.repository.users import UserRepository
 from fastapi import status
 from sqlalchemy.ext.asyncio import AsyncSession
 from src.database.db import get_db
 from src.database.models import UserRole
-from src.core.redis_client import redis_client
+from src.core.rate_limiter import RateLimiter
+from src.conf.config import config
 from src.schemas import AvatarUpdateSchema
 
 router = APIRouter(prefix="/users", tags=["users"])
 
 
-# Підключення до Redis
-# REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379")
-# redis = redis.from_url(REDIS_URL, decode_responses=True)
+me_rate_limiter = RateLimiter(
+    limit=config.RATE_LIMIT_ME,
+    window=config.RATE_LIMIT_WINDOW,
+    algorithm=config.RATE_LIMIT_ALGORITHM,
+    scope="users-me",
+)
 
 
-async def rate_limit(user: User):
-    # Обмеження 10 запитів за 60 секунд через Redis
-    """
-    Apply a rate limit of 10 requests per 60 seconds using Redis.
-
-    Args:
-        user (User): The current authenticated user.
-
-    Raises:
-        HTTPException: If the user exceeds the allowed request rate.
-    """
-
-    key = f"user:{user.id}:requests"
-    current_count = await redis_client.get(key)
-
-    if current_count is None:
-        # створюємо ключ з TTL 60 секунд
-        await redis_client.set(key, 1, ex=60)
-    else:
-        current_count = int(current_count)
-        if current_count >= 10:
-            raise HTTPException(status_code=429, detail="Too Many Requests.")
-        await redis_client.incr(key)  # Збільшуємо лічильник запитів
-
-
-@router.get("/me", response_model=User)
+@router.get("/me", response_model=User, dependencies=[Depends(me_rate_limiter)])
 async def me(user: User = Depends(get_current_user)):
     """
     Get current authenticated user information.
 
+    Rate limited per user (10 requests per 60 seconds by default); the limit
+    is checked before authentication.
+
     Args:
         user (User): The currently authenticated user (injected via dependency).
 
@@ -58,7 +38,6 @@ async def me(user: User = Depends(get_current_user)):
     Raises:
         HTTPException: If rate limiting threshold is exceeded.
     """
-    await rate_limit(user)  # Обмеження запитів через Redis
     return user
 
 
@@ -2,7 +2,16 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
 
-from src.database.db import get_db
+from src.database.db import get_db, request_metrics, sessionmanager
+from src.core import redis_batch
+from src.core.hashing import hash_executor
+from src.core.jwt_cache import jwt_cache
+from src.core.rate_limiter import rate_limiter_stats
+from src.core.redis_client import pool_stats
+from src.core.birthday_store import birthday_store
+from src.core.suggest_index import suggest_index
+from src.core.user_cache import user_cache
+from src.services.auth import get_current_admin_user
 
 router = APIRouter(tags=["utils"])
 
@@ -39,3 +48,39 @@ async def healthchecker(db: AsyncSession = Depends(get_db)):
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Error connecting to the database",
         )
+
+
+@router.get("/metrics")
+async def metrics(current_user=Depends(get_current_admin_user)):
+    """
+    Expose in-process performance counters of this worker.
+
+    The counters reveal pool, replica, cache and rate-limiter internals, so
+    only administrators may read them.
+
+    Args:
+        current_user: The currently authenticated admin user (authorization check).
+
+    Returns:
+        dict: Counters grouped by subsystem.
+
+    Raises:
+        HTTPException: 401 without a valid token, 403 for non-admin users.
+    """
+    return {
+        "database": {
+            **sessionmanager.pool_stats(),
+            "requests": request_metrics.stats(),
+        },
+        "user_cache": user_cache.stats(),
+        "jwt_cache": jwt_cache.stats(),
+        "suggest_index": suggest_index.stats(),
+        "birthday_store": birthday_store.stats(),
+        "password_hashing": hash_executor.stats(),
+        "rate_limiters": rate_limiter_stats(),
+        "redis": {
+            **redis_batch.stats(),
+            "pool": pool_stats(),
+            "breaker": redis_batch.redis_breaker.stats(),
+        },
+    }
@@ -11,18 +11,82 @@ class Config:
 
     Attributes:
         DB_URL (str): Database connection URL.
+        DB_POOL_SIZE (int): Database connections kept open per worker.
+        DB_MAX_OVERFLOW (int): Extra database connections allowed under load.
+        DB_POOL_TIMEOUT (float): Seconds to wait for a free database connection.
+        DB_POOL_RECYCLE (int): Seconds after which a database connection is replaced.
+        DB_POOL_PRE_PING (bool): Test database connections before handing them out.
+        DB_STATEMENT_CACHE_SIZE (int): Prepared statements cached per asyncpg
+            connection; 0 disables them (required behind pgbouncer).
+        DB_REPLICA_URLS (list[str]): Read replica URLs (comma-separated in the env).
+        DB_REPLICA_SELECTION (str): "round_robin" or "least_busy".
+        DB_READ_YOUR_WRITES_SECONDS (float): Seconds a user's reads stay on the
+            primary after they write.
         JWT_SECRET (str): Secret key for encoding access JWTs.
         JWT_ALGORITHM (str): Algorithm used to sign JWT tokens.
         JWT_EXPIRATION_SECONDS (int): Lifetime of access JWTs in seconds.
         JWT_SECRET_REFRESH (str): Secret key for encoding refresh JWTs.
         JWT_REFRESH_EXPIRATION_SECONDS (int): Lifetime of refresh JWTs in seconds.
+        JWT_CLAIMS_PRINCIPAL (bool): Issue access tokens carrying user id, role,
+            verification flag and token version, so authorization skips user lookups.
         SMTP_SERVER (str): SMTP server address for email sending.
         SMTP_PORT (int): Port used by the SMTP server.
         SMTP_USERNAME (str): SMTP username.
         SMTP_PASSWORD (str): SMTP password.
+        USER_CACHE_TTL (int): Lifetime of cached user principals in Redis, in seconds.
+        USER_CACHE_LOCAL_SIZE (int): Capacity of the in-process user principal cache.
+        USER_CACHE_LOCAL_TTL (float): Lifetime of in-process user principals, in seconds.
+        SUGGEST_INDEX_MAX_TERMS (int): Terms kept by the in-process typeahead
+            index across all users; least recently used users are dropped beyond it.
+        SUGGEST_INDEX_TTL (float): Seconds after which a user's typeahead index is
+            rebuilt, bounding staleness if an invalidation message is lost.
+        BIRTHDAY_DIGEST_DAYS (int): Days ahead covered by the daily upcoming
+            birthdays materialization; longer windows are queried directly.
+        BIRTHDAY_DIGEST_BATCH (int): Contacts read per batch by the daily job.
+        CONTACT_IMPORT_BATCH (int): Rows validated and inserted together by the
+            contact import.
+        CONTACT_IMPORT_MAX_ERRORS (int): Row errors listed in an import report;
+            further failures are only counted.
+        JWT_CACHE_SIZE (int): Capacity of the verified-JWT claims cache.
+        JWT_CACHE_MAX_TTL (float): Upper bound on how long verified claims are cached, in seconds.
+        PASSWORD_HASH_SCHEME (str): passlib scheme used for new password hashes.
+        PASSWORD_HASH_ROUNDS (int | None): Cost of the hashing scheme; scheme default if unset.
+        RATE_LIMIT_ALGORITHM (str): "sliding_window_log", "sliding_window_counter"
+            or "token_bucket".
+        RATE_LIMIT_WINDOW (int): Rate limit window in seconds.
+        RATE_LIMIT_ME (int): Requests per window allowed on /users/me.
+        RATE_LIMIT_CONTACTS (int): Requests per window allowed on the contacts API.
+        RATE_LIMIT_LOCAL_KEYS (int): Keys tracked by each in-process pre-limiter.
+        HASH_EXECUTOR (str): Pool used for password hashing, "thread" or "process".
+        HASH_WORKERS (int): Number of password hashing workers.
+        HASH_MAX_QUEUE (int): Maximum number of hashing calls waiting for a worker.
+        REDIS_URL (str): Redis connection URL.
+        REDIS_MAX_CONNECTIONS (int): Size of the Redis connection pool per worker.
+        REDIS_POOL_TIMEOUT (float): Seconds to wait for a free pooled connection.
+        REDIS_SOCKET_TIMEOUT (float): Seconds to wait for a Redis reply.
+        REDIS_CONNECT_TIMEOUT (float): Seconds to wait for a new Redis connection.
+        REDIS_HEALTH_CHECK_INTERVAL (int): Idle seconds after which a pooled
+            connection is pinged before reuse.
+        REDIS_BREAKER_FAILURES (int): Consecutive Redis failures that open the circuit.
+        REDIS_BREAKER_RESET (float): Seconds the circuit stays open before a trial call.
     """
     # Database
     DB_URL = os.getenv("DB_URL")
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 10))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 10))
+    DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 5))
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 1800))
+    DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in (
+        "1",
+        "true",
+        "yes",
+    )
+    DB_STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", 100))
+    DB_REPLICA_URLS = [
+        url.strip() for url in os.getenv("DB_REPLICA_URLS", "").split(",") if url.strip()
+    ]
+    DB_REPLICA_SELECTION = os.getenv("DB_REPLICA_SELECTION", "round_robin")
+    DB_READ_YOUR_WRITES_SECONDS = float(os.getenv("DB_READ_YOUR_WRITES_SECONDS", 5))
 
     # JWT Access Token
     JWT_SECRET = os.getenv("JWT_SECRET", "super-secret-access-key")
@@ -34,6 +98,11 @@ class Config:
     JWT_REFRESH_EXPIRATION_SECONDS = int(
         os.getenv("JWT_REFRESH_EXPIRATION_SECONDS", 7 * 24 * 60 * 60)
     )  # 7 днів
+    JWT_CLAIMS_PRINCIPAL = os.getenv("JWT_CLAIMS_PRINCIPAL", "false").lower() in (
+        "1",
+        "true",
+        "yes",
+    )
 
     # SMTP (Email)
     SMTP_SERVER = os.getenv("SMTP_SERVER", "smtp.example.com")
@@ -41,5 +110,54 @@ class Config:
     SMTP_USERNAME = os.getenv("SMTP_USERNAME", "your_email@example.com")
     SMTP_PASSWORD = os.getenv("SMTP_PASSWORD", "your_password")
 
+    # User principal cache
+    USER_CACHE_TTL = int(os.getenv("USER_CACHE_TTL", 600))
+    USER_CACHE_LOCAL_SIZE = int(os.getenv("USER_CACHE_LOCAL_SIZE", 10_000))
+    USER_CACHE_LOCAL_TTL = float(os.getenv("USER_CACHE_LOCAL_TTL", 30))
+
+    # Typeahead contact index
+    SUGGEST_INDEX_MAX_TERMS = int(os.getenv("SUGGEST_INDEX_MAX_TERMS", 300_000))
+    SUGGEST_INDEX_TTL = float(os.getenv("SUGGEST_INDEX_TTL", 600))
+
+    # Daily upcoming birthdays materialization
+    BIRTHDAY_DIGEST_DAYS = int(os.getenv("BIRTHDAY_DIGEST_DAYS", 31))
+    BIRTHDAY_DIGEST_BATCH = int(os.getenv("BIRTHDAY_DIGEST_BATCH", 5_000))
+
+    # Bulk contact import
+    CONTACT_IMPORT_BATCH = int(os.getenv("CONTACT_IMPORT_BATCH", 1_000))
+    CONTACT_IMPORT_MAX_ERRORS = int(os.getenv("CONTACT_IMPORT_MAX_ERRORS", 1_000))
+
+    # Verified JWT claims cache
+    JWT_CACHE_SIZE = int(os.getenv("JWT_CACHE_SIZE", 10_000))
+    JWT_CACHE_MAX_TTL = float(os.getenv("JWT_CACHE_MAX_TTL", 300))
+
+    # Rate limiting
+    RATE_LIMIT_ALGORITHM = os.getenv("RATE_LIMIT_ALGORITHM", "sliding_window_log")
+    RATE_LIMIT_WINDOW = int(os.getenv("RATE_LIMIT_WINDOW", 60))
+    RATE_LIMIT_ME = int(os.getenv("RATE_LIMIT_ME", 10))
+    RATE_LIMIT_CONTACTS = int(os.getenv("RATE_LIMIT_CONTACTS", 300))
+    RATE_LIMIT_LOCAL_KEYS = int(os.getenv("RATE_LIMIT_LOCAL_KEYS", 10_000))
+
+    # Password hashing
+    PASSWORD_HASH_SCHEME = os.getenv("PASSWORD_HASH_SCHEME", "bcrypt")
+    PASSWORD_HASH_ROUNDS = (
+        int(os.getenv("PASSWORD_HASH_ROUNDS"))
+        if os.getenv("PASSWORD_HASH_ROUNDS")
+        else None
+    )
+    HASH_EXECUTOR = os.getenv("HASH_EXECUTOR", "thread")
+    HASH_WORKERS = int(os.getenv("HASH_WORKERS", os.cpu_count() or 1))
+    HASH_MAX_QUEUE = int(os.getenv("HASH_MAX_QUEUE", 64))
+
+    # Redis
+    REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379")
+    REDIS_MAX_CONNECTIONS = int(os.getenv("REDIS_MAX_CONNECTIONS", 50))
+    REDIS_POOL_TIMEOUT = float(os.getenv("REDIS_POOL_TIMEOUT", 1))
+    REDIS_SOCKET_TIMEOUT = float(os.getenv("REDIS_SOCKET_TIMEOUT", 0.5))
+    REDIS_CONNECT_TIMEOUT = float(os.getenv("REDIS_CONNECT_TIMEOUT", 0.5))
+    REDIS_HEALTH_CHECK_INTERVAL = int(os.getenv("REDIS_HEALTH_CHECK_INTERVAL", 30))
+    REDIS_BREAKER_FAILURES = int(os.getenv("REDIS_BREAKER_FAILURES", 5))
+    REDIS_BREAKER_RESET = float(os.getenv("REDIS_BREAKER_RESET", 5))
+
 
 config = Config()
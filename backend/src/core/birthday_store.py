@@ -0,0 +1,377 @@
+"""
+Daily materialization of upcoming birthdays in Redis sorted sets.
+
+The upcoming-birthdays answer of a user changes once a day, so a daily job
+(`src.services.birthdays`) stores, per user, the contacts whose next birthday
+falls within the next ``horizon`` days: a sorted set of contact ids scored by
+`birthday_score`. A page of a window is then one ``ZRANGEBYSCORE ... LIMIT``,
+in the same order as the database query.
+
+1. Every run writes a new generation of keys; the pointer hash
+   ``birthdays:current`` names the generation readers use, the one being
+   built, and the last day each covers. Older generations expire on their own.
+2. Contact writes correct the current generation, and the one being built,
+   in place, so reads stay exact between runs.
+3. Anything the store cannot answer (no generation, a window past its horizon,
+   Redis down) returns None and the caller queries the database.
+"""
+
+import asyncio
+from datetime import date, timedelta
+
+from redis.exceptions import RedisError
+
+from src.conf.config import config
+from src.core.local_cache import LocalTTLCache
+from src.core.redis_batch import batched, pipeline
+from src.core.redis_client import redis_client
+
+POINTER_KEY = "birthdays:current"
+# Покажчик живе менше за ключі, тож ніколи не вказує на зниклі множини
+POINTER_TTL = 2 * 24 * 3600
+GENERATION_TTL = 3 * 24 * 3600
+BUILD_LOCK_TTL = 3600
+
+
+def next_birthday(birth_date: date, today: date) -> date:
+    """
+    Returns the first birthday on or after a day.
+
+    Args:
+        birth_date (date): The birth date.
+        today (date): The day to count from.
+
+    Returns:
+        date: The next birthday; February 29th falls on February 28th in
+        other years.
+    """
+    for year in (today.year, today.year + 1):
+        try:
+            birthday = birth_date.replace(year=year)
+        except ValueError:
+            birthday = date(year, 2, 28)
+        if birthday >= today:
+            return birthday
+
+
+def birthday_score(birth_date: date, today: date) -> float:
+    """
+    Returns the sorted-set score of a contact's next birthday.
+
+    The score is the ordinal of `next_birthday`. A February 29th birthday
+    moved to the 28th scores half a day later, so it follows the contacts born
+    on the 28th, as the database orders them by month and day.
+
+    Args:
+        birth_date (date): The birth date.
+        today (date): The day to count from.
+
+    Returns:
+        float: The score.
+    """
+    birthday = next_birthday(birth_date, today)
+    moved = (birth_date.month, birth_date.day) != (birthday.month, birthday.day)
+    return birthday.toordinal() + (0.5 if moved else 0)
+
+
+def _user_key(generation: str, user_id: int) -> str:
+    return f"birthdays:{generation}:{user_id}"
+
+
+def _member(contact_id: int) -> str:
+    # Рівні бали Redis впорядковує за рядком учасника: нулі дають порядок за id
+    return f"{contact_id:010d}"
+
+
+class BirthdayStore:
+    """
+    Reads and corrects the materialized upcoming birthdays.
+
+    Attributes:
+        horizon (int): Days ahead each generation covers.
+        hits (int): Windows answered from Redis.
+        misses (int): Windows the store could not answer.
+        corrections (int): Contact writes applied to the store.
+        redis_errors (int): Redis calls that failed.
+    """
+
+    def __init__(self, horizon: int, pointer_ttl: float = 60):
+        """
+        Initializes the store.
+
+        Args:
+            horizon (int): Days ahead each generation covers.
+            pointer_ttl (float): Seconds readers cache the generation pointer.
+        """
+        self.horizon = horizon
+        self._pointer = LocalTTLCache(1, pointer_ttl)
+        self.hits = 0
+        self.misses = 0
+        self.corrections = 0
+        self.redis_errors = 0
+
+    async def _read_pointer(self) -> dict:
+        pointer = self._pointer.get(POINTER_KEY)
+        if pointer is None:
+            pointer = await batched(redis_client, "hgetall", POINTER_KEY)
+            self._pointer.set(POINTER_KEY, pointer)
+        return pointer
+
+    async def window(
+        self,
+        user_id: int,
+        today: date,
+        days: int,
+        skip: int,
+        limit: int,
+        after: tuple[float, int] | None = None,
+    ) -> list[tuple[int, float]] | None:
+        """
+        Returns a page of the contacts whose next birthday is within ``days``.
+
+        Args:
+            user_id (int): The owner of the contacts.
+            today (date): The first day of the window.
+            days (int): Length of the window in days.
+            skip (int): The number of contacts to skip; ignored with ``after``.
+            limit (int): The maximum number of contacts to return.
+            after (tuple[float, int] | None): Score and ID of the last contact
+                of the previous page.
+
+        Returns:
+            list[tuple[int, float]] | None: Contact ids with their scores, in
+            birthday order, or None if the store does not cover the window.
+        """
+        end = today + timedelta(days=days)
+        # Бал 29 лютого, перенесеного на останній день вікна, на пів дня більший
+        high = end.toordinal() + 0.5
+        try:
+            pointer = await self._read_pointer()
+            if (
+                "generation" not in pointer
+                or int(pointer["generation_through"]) < end.toordinal()
+            ):
+                self.misses += 1
+                return None
+            key = _user_key(pointer["generation"], user_id)
+            if after is None:
+                members = await batched(
+                    redis_client,
+                    "zrangebyscore",
+                    key,
+                    today.toordinal(),
+                    high,
+                    start=skip,
+                    num=limit,
+                    withscores=True,
+                )
+            else:
+                score, contact_id = after
+                # Ровесники курсора (один день) і сторінка після нього — разом
+                ties, later = await asyncio.gather(
+                    batched(redis_client, "zrangebyscore", key, score, score),
+                    batched(
+                        redis_client,
+                        "zrangebyscore",
+                        key,
+                        f"({score}",
+                        high,
+                        start=0,
+                        num=limit,
+                        withscores=True,
+                    ),
+                )
+                members = [
+                    (member, score)
+                    for member in ties
+                    if score <= high and int(member) > contact_id
+                ] + later
+        except RedisError as e:
+            self.redis_errors += 1
+            print(f"Birthday store unavailable: {e}")
+            return None
+        self.hits += 1
+        return [(int(member), float(score)) for member, score in members[:limit]]
+
+    async def _correct(self, user_id: int, apply) -> None:
+        try:
+            # Без локального кешу: запис має потрапити і в покоління, що будується
+            pointer = await batched(redis_client, "hgetall", POINTER_KEY)
+            targets = [
+                (pointer[name], int(pointer[f"{name}_through"]))
+                for name in ("generation", "building")
+                if name in pointer
+            ]
+            if not targets:
+                return
+            async with pipeline(redis_client, transaction=False) as pipe:
+                for generation, through in targets:
+                    apply(pipe, _user_key(generation, user_id), through)
+        except RedisError as e:
+            # Збій не ламає запис контакту; наступний щоденний прогін виправить
+            self.redis_errors += 1
+            print(f"Birthday store correction failed: {e}")
+            return
+        self.corrections += 1
+
+    async def contact_saved(self, user_id: int, contact, today: date) -> None:
+        """
+        Places a created or edited contact in the store, or takes it out.
+
+        Args:
+            user_id (int): The owner of the contact.
+            contact: The saved contact, exposing ``id`` and ``birth_date``.
+            today (date): The current day.
+        """
+        await self.contacts_saved(user_id, [contact], today)
+
+    async def contacts_saved(self, user_id: int, contacts: list, today: date) -> None:
+        """
+        Places many saved contacts of a user in the store in one pipeline.
+
+        Args:
+            user_id (int): The owner of the contacts.
+            contacts (list): The saved contacts, exposing ``id`` and ``birth_date``.
+            today (date): The current day.
+        """
+        scores = {
+            _member(contact.id): birthday_score(contact.birth_date, today)
+            for contact in contacts
+        }
+
+        def apply(pipe, key, through):
+            # Перенесене 29 лютого в останній день покоління теж у ньому
+            upcoming = {m: score for m, score in scores.items() if score < through + 1}
+            later = [m for m, score in scores.items() if score >= through + 1]
+            if upcoming:
+                pipe.zadd(key, upcoming)
+                # Множина могла ще не існувати: без TTL вона пережила б покоління
+                pipe.expire(key, GENERATION_TTL)
+            if later:
+                pipe.zrem(key, *later)
+
+        await self._correct(user_id, apply)
+
+    async def contact_removed(self, user_id: int, contact_id: int) -> None:
+        """
+        Takes a deleted contact out of the store.
+
+        Args:
+            user_id (int): The owner of the contact.
+            contact_id (int): The ID of the deleted contact.
+        """
+        await self._correct(
+            user_id, lambda pipe, key, through: pipe.zrem(key, _member(contact_id))
+        )
+
+    async def begin_build(self, today: date) -> str | None:
+        """
+        Claims today's run and announces the generation being built.
+
+        Args:
+            today (date): The day the generation starts on.
+
+        Returns:
+            str | None: The generation name, or None if it is already built
+            or another worker is building it.
+
+        Raises:
+            redis.exceptions.RedisError: If Redis is unavailable.
+        """
+        generation = today.isoformat()
+        pointer = await batched(redis_client, "hgetall", POINTER_KEY)
+        if pointer.get("generation") == generation:
+            return None
+        lock = f"birthdays:lock:{generation}"
+        if not await batched(redis_client, "set", lock, 1, nx=True, ex=BUILD_LOCK_TTL):
+            return None
+        through = (today + timedelta(days=self.horizon)).toordinal()
+        await batched(
+            redis_client,
+            "hset",
+            POINTER_KEY,
+            mapping={"building": generation, "building_through": through},
+        )
+        return generation
+
+    async def store_batch(
+        self, generation: str, birthdays: dict[int, dict[int, float]]
+    ) -> None:
+        """
+        Writes one batch of the generation being built.
+
+        Args:
+            generation (str): The generation from `begin_build`.
+            birthdays (dict[int, dict[int, float]]): Per user, contact id to
+                its `birthday_score`.
+
+        Raises:
+            redis.exceptions.RedisError: If Redis is unavailable.
+        """
+        async with pipeline(redis_client, transaction=False) as pipe:
+            for user_id, scores in birthdays.items():
+                key = _user_key(generation, user_id)
+                pipe.zadd(key, {_member(id): score for id, score in scores.items()})
+                pipe.expire(key, GENERATION_TTL)
+
+    async def finish_build(self, generation: str) -> None:
+        """
+        Points readers at a fully written generation.
+
+        Args:
+            generation (str): The generation from `begin_build`.
+
+        Raises:
+            redis.exceptions.RedisError: If Redis is unavailable.
+        """
+        pointer = await batched(redis_client, "hgetall", POINTER_KEY)
+        async with pipeline(redis_client) as pipe:
+            pipe.hset(
+                POINTER_KEY,
+                mapping={
+                    "generation": generation,
+                    "generation_through": pointer["building_through"],
+                },
+            )
+            pipe.hdel(POINTER_KEY, "building", "building_through")
+            pipe.expire(POINTER_KEY, POINTER_TTL)
+        self._pointer.clear()
+
+    async def abort_build(self, generation: str) -> None:
+        """
+        Releases a failed run so it can be retried.
+
+        Args:
+            generation (str): The generation from `begin_build`.
+        """
+        try:
+            async with pipeline(redis_client) as pipe:
+                pipe.hdel(POINTER_KEY, "building", "building_through")
+                pipe.delete(f"birthdays:lock:{generation}")
+        except RedisError as e:
+            self.redis_errors += 1
+            print(f"Birthday store abort failed: {e}")
+
+    def clear(self) -> None:
+        """
+        Forgets the locally cached generation pointer.
+        """
+        self._pointer.clear()
+
+    def stats(self) -> dict:
+        """
+        Returns the store counters.
+
+        Returns:
+            dict: Hit, miss, correction and Redis error counters.
+        """
+        return {
+            "horizon_days": self.horizon,
+            "hits": self.hits,
+            "misses": self.misses,
+            "corrections": self.corrections,
+            "redis_errors": self.redis_errors,
+        }
+
+
+birthday_store = BirthdayStore(horizon=config.BIRTHDAY_DIGEST_DAYS)
@@ -0,0 +1,107 @@
+"""
+Calibrates the password hashing cost for the current CPU.
+
+Measures how long one hash takes at increasing costs and prints the highest
+cost that stays within the target time, ready to be put into ``.env``.
+
+Usage:
+    python -m src.core.calibrate_hashing --target-ms 250
+    python -m src.core.calibrate_hashing --scheme pbkdf2_sha256 --target-ms 100
+"""
+
+import argparse
+import statistics
+import time
+
+from passlib.registry import get_crypt_handler
+
+from src.conf.config import config
+from src.core.hashing import build_pwd_context
+
+# Схеми, де вартість задається логарифмічно (кожен раунд подвоює час)
+LOG_COST_SCHEMES = {"bcrypt"}
+
+
+def measure(scheme: str, rounds: int, samples: int = 3) -> float:
+    """
+    Measures the median time of one hash at the given cost.
+
+    Args:
+        scheme (str): The passlib scheme name.
+        rounds (int): The cost parameter.
+        samples (int): Number of hashes to time.
+
+    Returns:
+        float: Median hashing time in seconds.
+    """
+    context = build_pwd_context(scheme, rounds)
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        context.hash("calibration-password")
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def calibrate(scheme: str, target_seconds: float) -> tuple[int, float]:
+    """
+    Picks the highest cost whose hashing time does not exceed the target.
+
+    Log-cost schemes are stepped one round at a time; linear-cost schemes are
+    extrapolated from a measurement at the scheme default and then verified.
+    The scheme minimum is returned if even that is slower than the target.
+
+    Args:
+        scheme (str): The passlib scheme name.
+        target_seconds (float): Target time of one hash in seconds.
+
+    Returns:
+        tuple[int, float]: The chosen cost and its measured hashing time.
+    """
+    handler = get_crypt_handler(scheme)
+    min_rounds = handler.min_rounds or 1
+    max_rounds = handler.max_rounds
+
+    if scheme in LOG_COST_SCHEMES:
+        rounds, elapsed = min_rounds, measure(scheme, min_rounds)
+        while max_rounds is None or rounds < max_rounds:
+            next_elapsed = measure(scheme, rounds + 1)
+            if next_elapsed > target_seconds:
+                break
+            rounds, elapsed = rounds + 1, next_elapsed
+        return rounds, elapsed
+
+    base = handler.default_rounds
+    rounds = max(min_rounds, int(base * target_seconds / measure(scheme, base)))
+    if max_rounds is not None:
+        rounds = min(rounds, max_rounds)
+    elapsed = measure(scheme, rounds)
+    if elapsed > target_seconds and rounds > min_rounds:
+        rounds = max(min_rounds, int(rounds * target_seconds / elapsed))
+        elapsed = measure(scheme, rounds)
+    return rounds, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--scheme",
+        default=config.PASSWORD_HASH_SCHEME,
+        help="passlib scheme to calibrate (default: PASSWORD_HASH_SCHEME)",
+    )
+    parser.add_argument(
+        "--target-ms",
+        type=float,
+        default=250,
+        help="target time of one hash in milliseconds (default: 250)",
+    )
+    args = parser.parse_args()
+
+    rounds, elapsed = calibrate(args.scheme, args.target_ms / 1000)
+    print(f"PASSWORD_HASH_SCHEME={args.scheme}")
+    print(f"PASSWORD_HASH_ROUNDS={rounds}")
+    print(f"# ~{elapsed * 1000:.0f} ms per hash on this CPU")
+
+
+if __name__ == "__main__":
+    main()
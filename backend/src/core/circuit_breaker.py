@@ -0,0 +1,131 @@
+"""
+Circuit breaker for calls to a shared dependency such as Redis.
+
+After ``failure_threshold`` consecutive failures the circuit opens and calls
+are refused immediately, so callers switch to their fallback instead of waiting
+for timeouts. After ``reset_timeout`` seconds a single trial call is let
+through (half-open): success closes the circuit, failure opens it again.
+"""
+
+import time
+from typing import Callable
+
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(RedisConnectionError):
+    """
+    Raised instead of calling Redis while the circuit is open.
+
+    It subclasses the Redis ``ConnectionError``, so fallbacks written for an
+    unreachable Redis also cover the open circuit.
+    """
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    Attributes:
+        failure_threshold (int): Consecutive failures that open the circuit.
+        reset_timeout (float): Seconds the circuit stays open before a trial call.
+        failures (int): Current number of consecutive failures.
+        opened (int): How many times the circuit has opened.
+        rejected (int): Calls refused while the circuit was open.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int,
+        reset_timeout: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initializes a closed circuit.
+
+        Args:
+            failure_threshold (int): Consecutive failures that open the circuit.
+            reset_timeout (float): Seconds the circuit stays open before a trial call.
+            clock (Callable[[], float]): Monotonic time source.
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self.failures = 0
+        self.opened = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        """
+        str: ``"closed"``, ``"open"`` or ``"half_open"``.
+        """
+        if self._state == OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+            return HALF_OPEN
+        return self._state
+
+    def allow(self) -> bool:
+        """
+        Decides whether a call may go through.
+
+        Returns:
+            bool: True if the circuit is closed, or if this is the trial call
+            of a half-open circuit.
+        """
+        state = self.state
+        if state == CLOSED:
+            return True
+        if state == HALF_OPEN and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        self.rejected += 1
+        return False
+
+    def record_success(self) -> None:
+        """
+        Closes the circuit after a successful call.
+        """
+        self._state = CLOSED
+        self._trial_in_flight = False
+        self.failures = 0
+
+    def record_failure(self) -> None:
+        """
+        Counts a failed call and opens the circuit at the threshold.
+        """
+        self.failures += 1
+        # Невдала пробна спроба знову відкриває коло; запізнілі помилки лише рахуються
+        if self._trial_in_flight or (
+            self._state == CLOSED and self.failures >= self.failure_threshold
+        ):
+            self.opened += 1
+            self._state = OPEN
+            self._opened_at = self._clock()
+            self._trial_in_flight = False
+
+    def reset(self) -> None:
+        """
+        Closes the circuit and clears the failure count.
+        """
+        self.record_success()
+
+    def stats(self) -> dict:
+        """
+        Returns the breaker state and counters.
+
+        Returns:
+            dict: State, consecutive failures, times opened and calls refused.
+        """
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "opened": self.opened,
+            "rejected": self.rejected,
+        }
@@ -0,0 +1,238 @@
+"""
+Password hashing primitives and the executor that runs them off the event loop.
+
+bcrypt is deliberately slow (tens of milliseconds per call), so calling it from
+an ``async`` handler stalls every other request on the worker. `HashExecutor`
+runs the hashing functions in a dedicated thread or process pool with a bounded
+queue and records queue depth and latency.
+
+The module only depends on the config, so process-pool workers can import it
+without pulling in the database or Redis clients.
+"""
+
+import asyncio
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+
+from passlib.context import CryptContext
+from passlib.registry import get_crypt_handler
+
+from src.conf.config import config
+from src.core.metrics import percentiles_ms
+
+
+def build_pwd_context(scheme: str, rounds: int | None = None) -> CryptContext:
+    """
+    Builds a passlib context that hashes with one scheme at one cost.
+
+    Hashes produced with another scheme (legacy bcrypt included) or another
+    cost still verify, but are reported as needing an update, so they can be
+    rehashed transparently on the next successful login.
+
+    Args:
+        scheme (str): The passlib scheme name, e.g. ``"bcrypt"``.
+        rounds (int | None): The cost parameter; the scheme default if None.
+
+    Returns:
+        CryptContext: The configured context.
+    """
+    if rounds is None:
+        rounds = get_crypt_handler(scheme).default_rounds
+    schemes = [scheme] if scheme == "bcrypt" else [scheme, "bcrypt"]
+    return CryptContext(
+        schemes=schemes,
+        default=scheme,
+        deprecated="auto",
+        **{
+            f"{scheme}__default_rounds": rounds,
+            f"{scheme}__min_rounds": rounds,
+            f"{scheme}__max_rounds": rounds,
+        },
+    )
+
+
+pwd_context = build_pwd_context(
+    config.PASSWORD_HASH_SCHEME, config.PASSWORD_HASH_ROUNDS
+)
+
+
+def hash_password(password: str) -> str:
+    """
+    Hashes a plain password with the configured scheme.
+
+    Args:
+        password (str): The plain password.
+
+    Returns:
+        str: The encoded hash.
+    """
+    return pwd_context.hash(password)
+
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verifies a plain password against an encoded hash.
+
+    Args:
+        plain_password (str): The plain password.
+        hashed_password (str): The stored hash.
+
+    Returns:
+        bool: True if the password matches.
+    """
+    return pwd_context.verify(plain_password, hashed_password)
+
+
+def verify_and_update(
+    plain_password: str, hashed_password: str
+) -> tuple[bool, str | None]:
+    """
+    Verifies a password and rehashes it if the stored hash is outdated.
+
+    Args:
+        plain_password (str): The plain password.
+        hashed_password (str): The stored hash.
+
+    Returns:
+        tuple[bool, str | None]: Whether the password matches, and a new hash
+        when the stored one uses an outdated scheme or cost.
+    """
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
+def _timed(fn, *args):
+    # Виконується у воркері пулу: повертає результат і чистий час обчислення
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+class HashQueueFull(Exception):
+    """
+    Raised when the hashing queue is full and the call is shed.
+    """
+
+
+class HashExecutor:
+    """
+    Runs password hashing in a dedicated pool with a bounded queue.
+
+    Attributes:
+        kind (str): ``"thread"`` or ``"process"``.
+        max_workers (int): Number of pool workers.
+        max_queue (int): Maximum number of calls waiting for a free worker.
+        in_flight (int): Calls submitted and not yet finished.
+        completed (int): Calls that finished.
+        rejected (int): Calls shed because the queue was full.
+    """
+
+    def __init__(
+        self, kind: str, max_workers: int, max_queue: int, latency_window: int = 1024
+    ):
+        """
+        Initializes the executor; the pool itself is created on first use.
+
+        Args:
+            kind (str): ``"thread"`` or ``"process"``.
+            max_workers (int): Number of pool workers.
+            max_queue (int): Maximum number of calls waiting for a free worker.
+            latency_window (int): Number of recent calls kept for percentiles.
+
+        Raises:
+            ValueError: If ``kind`` is not supported.
+        """
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Unsupported hash executor kind: {kind}")
+        self.kind = kind
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._pool: Executor | None = None
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self._run_times: deque[float] = deque(maxlen=latency_window)
+        self._wait_times: deque[float] = deque(maxlen=latency_window)
+
+    @property
+    def queue_depth(self) -> int:
+        """
+        int: Calls waiting for a free worker.
+        """
+        return max(self.in_flight - self.max_workers, 0)
+
+    def _get_pool(self) -> Executor:
+        if self._pool is None:
+            if self.kind == "process":
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="hash"
+                )
+        return self._pool
+
+    async def run(self, fn, *args):
+        """
+        Runs a hashing function in the pool without blocking the event loop.
+
+        Args:
+            fn: A module-level (picklable) function.
+            *args: Arguments passed to ``fn``.
+
+        Returns:
+            Any: The return value of ``fn``.
+
+        Raises:
+            HashQueueFull: If ``max_queue`` calls are already waiting.
+        """
+        if self.queue_depth >= self.max_queue:
+            self.rejected += 1
+            raise HashQueueFull()
+
+        loop = asyncio.get_running_loop()
+        self.in_flight += 1
+        start = time.perf_counter()
+        try:
+            result, run_time = await loop.run_in_executor(
+                self._get_pool(), _timed, fn, *args
+            )
+        finally:
+            self.in_flight -= 1
+        self.completed += 1
+        self._run_times.append(run_time)
+        self._wait_times.append(max(time.perf_counter() - start - run_time, 0.0))
+        return result
+
+    def shutdown(self) -> None:
+        """
+        Stops the pool, waiting for running calls to finish.
+        """
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+    def stats(self) -> dict:
+        """
+        Returns queue and latency metrics.
+
+        Returns:
+            dict: Queue depth, counters and p50/p99 run and wait times in ms.
+        """
+        return {
+            "kind": self.kind,
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "queue_depth": self.queue_depth,
+            "in_flight": self.in_flight,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "run_ms": percentiles_ms(self._run_times),
+            "wait_ms": percentiles_ms(self._wait_times),
+        }
+
+
+hash_executor = HashExecutor(
+    kind=config.HASH_EXECUTOR,
+    max_workers=config.HASH_WORKERS,
+    max_queue=config.HASH_MAX_QUEUE,
+)
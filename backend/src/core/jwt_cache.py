@@ -0,0 +1,120 @@
+"""
+Memo cache of verified JWT claims.
+
+Decoding a JWT re-parses the token and recomputes its HMAC on every request,
+even though SPA clients send the same bearer token many times in a row. This
+module keeps the claims of successfully verified tokens in a bounded in-process
+LRU, keyed by a SHA-256 digest of the token and partitioned by the secret and
+algorithm that verified it. An entry never outlives the token's ``exp`` claim,
+and invalid tokens are never cached.
+
+Example:
+    payload = jwt_cache.decode(token, config.JWT_SECRET, config.JWT_ALGORITHM)
+"""
+
+import hashlib
+import time
+
+from jose import JWTError, jwt
+
+from src.conf.config import config
+from src.core.local_cache import LocalTTLCache
+
+
+class VerifiedClaimsCache:
+    """
+    Caches the claims of verified JWTs until they expire.
+
+    Attributes:
+        local (LocalTTLCache): The in-process store of verified claims.
+        max_ttl (float): Upper bound on how long an entry is kept, in seconds.
+        uncacheable (int): Verified tokens that were not cached (no ``exp``).
+    """
+
+    def __init__(self, maxsize: int, max_ttl: float):
+        """
+        Initializes an empty cache.
+
+        Args:
+            maxsize (int): Maximum number of cached tokens.
+            max_ttl (float): Upper bound on entry lifetime in seconds.
+        """
+        self.local = LocalTTLCache(maxsize, max_ttl)
+        self.max_ttl = max_ttl
+        self.uncacheable = 0
+
+    def decode(self, token: str, secret: str, algorithm: str) -> dict:
+        """
+        Verifies a JWT, serving repeat tokens from the cache.
+
+        Args:
+            token (str): The encoded JWT.
+            secret (str): The key the token must be signed with.
+            algorithm (str): The expected signing algorithm.
+
+        Returns:
+            dict: A copy of the verified claims.
+
+        Raises:
+            JWTError: If the token is invalid, tampered with or expired.
+        """
+        key = (secret, algorithm, hashlib.sha256(token.encode()).digest())
+        claims = self.local.get(key)
+        if claims is not None:
+            return dict(claims)
+
+        claims = jwt.decode(token, secret, algorithms=[algorithm])
+
+        exp = claims.get("exp")
+        if isinstance(exp, (int, float)):
+            ttl = min(exp - time.time(), self.max_ttl)
+            if ttl > 0:
+                self.local.set(key, claims, ttl=ttl)
+        else:
+            self.uncacheable += 1
+        return dict(claims)
+
+    def clear(self) -> None:
+        """
+        Drops every cached token.
+        """
+        self.local.clear()
+
+    def stats(self) -> dict:
+        """
+        Returns the cache counters.
+
+        Returns:
+            dict: Local cache stats plus the number of uncacheable tokens.
+        """
+        return {**self.local.stats(), "uncacheable": self.uncacheable}
+
+
+jwt_cache = VerifiedClaimsCache(
+    maxsize=config.JWT_CACHE_SIZE, max_ttl=config.JWT_CACHE_MAX_TTL
+)
+
+
+def bearer_subject(request) -> str | None:
+    """
+    Returns who sent a request, judging by its access token alone.
+
+    The token is verified through `jwt_cache`, so this costs no database or
+    Redis lookup.
+
+    Args:
+        request (Request): The incoming request.
+
+    Returns:
+        str | None: The ``uid`` (or ``sub``) claim of a valid bearer token,
+        or None for anonymous requests and invalid tokens.
+    """
+    scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        claims = jwt_cache.decode(token, config.JWT_SECRET, config.JWT_ALGORITHM)
+    except JWTError:
+        return None
+    subject = claims.get("uid") or claims.get("sub")
+    return str(subject) if subject else None
@@ -0,0 +1,126 @@
+"""
+Bounded in-process cache with per-entry expiry.
+
+`LocalTTLCache` is the local tier shared by the caches of this package: user
+principals, verified JWT claims, recent writers, local rate-limit buckets and
+the birthday store pointer.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+
+class LocalTTLCache:
+    """
+    A bounded, in-process LRU cache whose entries expire after a fixed TTL.
+
+    Attributes:
+        maxsize (int): Maximum number of entries kept in memory.
+        ttl (float): Lifetime of an entry in seconds.
+        hits (int): Number of successful lookups.
+        misses (int): Number of lookups that found nothing (or an expired entry).
+        evictions (int): Number of entries dropped to respect ``maxsize``.
+        expirations (int): Number of entries dropped because their TTL elapsed.
+    """
+
+    def __init__(
+        self, maxsize: int, ttl: float, clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initializes an empty cache.
+
+        Args:
+            maxsize (int): Maximum number of entries kept in memory.
+            ttl (float): Lifetime of an entry in seconds.
+            clock (Callable[[], float]): Monotonic time source.
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._data: OrderedDict[Hashable, tuple[Any, float]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable) -> Any | None:
+        """
+        Returns a cached value and marks it as most recently used.
+
+        Args:
+            key (Hashable): The cache key.
+
+        Returns:
+            Any | None: The cached value, or None if absent or expired.
+        """
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        value, expires_at = entry
+        if expires_at <= self._clock():
+            del self._data[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: float | None = None) -> None:
+        """
+        Stores a value, evicting the least recently used entry when full.
+
+        Args:
+            key (Hashable): The cache key.
+            value (Any): The value to store.
+            ttl (float | None): Lifetime of this entry in seconds; defaults to
+                the cache-wide ``ttl``.
+        """
+        if self.maxsize <= 0:
+            return
+        if ttl is None:
+            ttl = self.ttl
+        self._data[key] = (value, self._clock() + ttl)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def pop(self, key: Hashable) -> bool:
+        """
+        Removes an entry if present.
+
+        Args:
+            key (Hashable): The cache key.
+
+        Returns:
+            bool: True if an entry was removed.
+        """
+        return self._data.pop(key, None) is not None
+
+    def clear(self) -> None:
+        """
+        Removes all entries, keeping the counters.
+        """
+        self._data.clear()
+
+    def stats(self) -> dict:
+        """
+        Returns the cache counters.
+
+        Returns:
+            dict: Size, capacity and hit/miss/eviction/expiration counters.
+        """
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
@@ -0,0 +1,573 @@
+"""
+In-process, Redis-compatible async backend selected with ``REDIS_URL=memory://``.
+
+It implements the subset of commands the application uses (strings with TTL,
+``INCR``, ``EXPIRE``, hashes, sorted sets, pipelines, pub/sub and server-side
+scripts) with ``decode_responses=True`` semantics, so the user cache, the rate
+limiter and any future cache run, and can be benchmarked, without a Redis
+server.
+
+* Keys expire exactly like in Redis: an expired key is never returned, and
+  ``SET`` without ``EX``/``PX`` clears the TTL while ``INCR``/``HSET`` keep it.
+  Expired keys are purged lazily on access and from a deadline heap on writes,
+  so memory does not grow with keys nobody reads again.
+* Every command runs synchronously inside the event loop, so single commands,
+  pipelines and scripts are atomic, as they are in Redis.
+* Lua cannot be executed; instead each script the application sends is
+  registered with `register_script` together with a Python implementation
+  that operates on the `MemoryStore`. An unknown script fails with
+  ``NOSCRIPT``, just like an unloaded one on a real server.
+
+The data lives in one process, so it is not shared between workers. Errors use
+the ``redis.exceptions`` types, so callers handle both backends the same way.
+"""
+
+import asyncio
+import fnmatch
+import hashlib
+import heapq
+import math
+import time
+from typing import Any, Callable
+
+from redis.exceptions import NoScriptError, ResponseError
+
+WRONGTYPE = "WRONGTYPE Operation against a key holding the wrong kind of value"
+
+# sha1 скрипта -> Python-реалізація, що працює з MemoryStore
+_scripts: dict[str, Callable[["MemoryStore", list, list], Any]] = {}
+
+
+def register_script(source: str, implementation: Callable) -> str:
+    """
+    Registers the Python implementation of a Lua script.
+
+    Args:
+        source (str): The Lua source sent with ``EVAL``/``EVALSHA``.
+        implementation (Callable): ``fn(store, keys, args)`` returning the
+            script reply; ``args`` are strings, as ``ARGV`` is in Lua.
+
+    Returns:
+        str: The SHA1 digest of the script.
+    """
+    sha = hashlib.sha1(source.encode()).hexdigest()
+    _scripts[sha] = implementation
+    return sha
+
+
+def _encode(value) -> str:
+    if isinstance(value, (bytes, bytearray)):
+        return value.decode()
+    return str(value)
+
+
+def _score_bound(value) -> tuple[float, bool]:
+    # Повертає (межа, виключна?) для "-inf", "+inf", "(5" та чисел
+    if isinstance(value, str) and value.startswith("("):
+        return float(value[1:]), True
+    return float(value), False
+
+
+class MemoryStore:
+    """
+    Keyspace with Redis command semantics; every method is one atomic command.
+
+    Attributes:
+        expired (int): Keys removed because their TTL had passed.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        """
+        Initializes an empty keyspace.
+
+        Args:
+            clock (Callable[[], float]): Monotonic time source in seconds.
+        """
+        self._clock = clock
+        self._data: dict[str, Any] = {}
+        self._expires: dict[str, float] = {}
+        self._deadlines: list[tuple[float, str]] = []
+        self.expired = 0
+
+    # --- keyspace ---
+
+    def _delete(self, key: str) -> bool:
+        self._expires.pop(key, None)
+        return self._data.pop(key, None) is not None
+
+    def _lookup(self, key: str, kind: type | None = None):
+        deadline = self._expires.get(key)
+        if deadline is not None and deadline <= self._clock():
+            self._delete(key)
+            self.expired += 1
+            return None
+        value = self._data.get(key)
+        if value is not None and kind is not None and not isinstance(value, kind):
+            raise ResponseError(WRONGTYPE)
+        return value
+
+    def _purge(self) -> None:
+        now = self._clock()
+        while self._deadlines and self._deadlines[0][0] <= now:
+            deadline, key = heapq.heappop(self._deadlines)
+            # Застарілі записи купи (TTL змінено) просто відкидаються
+            if self._expires.get(key) == deadline:
+                self._delete(key)
+                self.expired += 1
+
+    def _set_deadline(self, key: str, seconds: float) -> None:
+        deadline = self._clock() + seconds
+        self._expires[key] = deadline
+        heapq.heappush(self._deadlines, (deadline, key))
+
+    def delete(self, *keys) -> int:
+        self._purge()
+        return sum(
+            self._lookup(key) is not None and self._delete(key) for key in keys
+        )
+
+    def exists(self, *keys) -> int:
+        return sum(self._lookup(key) is not None for key in keys)
+
+    def expire(self, key, seconds) -> bool:
+        self._purge()
+        if self._lookup(key) is None:
+            return False
+        if seconds <= 0:
+            self._delete(key)
+        else:
+            self._set_deadline(key, seconds)
+        return True
+
+    def pexpire(self, key, milliseconds) -> bool:
+        return self.expire(key, milliseconds / 1000)
+
+    def persist(self, key) -> bool:
+        if self._lookup(key) is None:
+            return False
+        return self._expires.pop(key, None) is not None
+
+    def pttl(self, key) -> int:
+        if self._lookup(key) is None:
+            return -2
+        deadline = self._expires.get(key)
+        if deadline is None:
+            return -1
+        return math.ceil((deadline - self._clock()) * 1000)
+
+    def ttl(self, key) -> int:
+        pttl = self.pttl(key)
+        return pttl if pttl < 0 else math.ceil(pttl / 1000)
+
+    def keys(self, pattern: str = "*") -> list[str]:
+        return [
+            key
+            for key in list(self._data)
+            if fnmatch.fnmatchcase(key, pattern) and self._lookup(key) is not None
+        ]
+
+    def dbsize(self) -> int:
+        self._purge()
+        return len(self._data)
+
+    def flushdb(self) -> bool:
+        self._data.clear()
+        self._expires.clear()
+        self._deadlines.clear()
+        return True
+
+    flushall = flushdb
+
+    def ping(self) -> bool:
+        return True
+
+    # --- strings ---
+
+    def get(self, key):
+        return self._lookup(key, str)
+
+    def set(self, key, value, ex=None, px=None, nx=False, xx=False):
+        self._purge()
+        exists = self._lookup(key) is not None
+        if (nx and exists) or (xx and not exists):
+            return None
+        self._data[key] = _encode(value)
+        self._expires.pop(key, None)
+        if ex is not None:
+            self._set_deadline(key, ex)
+        elif px is not None:
+            self._set_deadline(key, px / 1000)
+        return True
+
+    def incrby(self, key, amount: int = 1) -> int:
+        self._purge()
+        current = self._lookup(key, str)
+        try:
+            value = int(current or 0) + int(amount)
+        except ValueError:
+            raise ResponseError("value is not an integer or out of range")
+        self._data[key] = str(value)
+        return value
+
+    def incr(self, key, amount: int = 1) -> int:
+        return self.incrby(key, amount)
+
+    def decr(self, key, amount: int = 1) -> int:
+        return self.incrby(key, -amount)
+
+    # --- hashes ---
+
+    def hset(self, name, key=None, value=None, mapping=None, items=None) -> int:
+        self._purge()
+        fields = {}
+        if key is not None:
+            fields[key] = value
+        if mapping:
+            fields.update(mapping)
+        if items:
+            fields.update(zip(items[::2], items[1::2]))
+        if not fields:
+            raise ResponseError("wrong number of arguments for 'hset' command")
+        hash_ = self._lookup(name, dict)
+        if hash_ is None:
+            hash_ = self._data[name] = {}
+        added = 0
+        for field, field_value in fields.items():
+            field = _encode(field)
+            added += field not in hash_
+            hash_[field] = _encode(field_value)
+        return added
+
+    def hget(self, name, key):
+        hash_ = self._lookup(name, dict)
+        return hash_.get(_encode(key)) if hash_ else None
+
+    def hgetall(self, name) -> dict:
+        return dict(self._lookup(name, dict) or {})
+
+    def hmget(self, name, keys, *args) -> list:
+        fields = [keys, *args] if isinstance(keys, (str, bytes)) else [*keys, *args]
+        hash_ = self._lookup(name, dict) or {}
+        return [hash_.get(_encode(field)) for field in fields]
+
+    def hdel(self, name, *keys) -> int:
+        hash_ = self._lookup(name, dict)
+        if not hash_:
+            return 0
+        removed = sum(hash_.pop(_encode(key), None) is not None for key in keys)
+        if not hash_:
+            self._delete(name)
+        return removed
+
+    def hincrby(self, name, key, amount: int = 1) -> int:
+        self._purge()
+        hash_ = self._lookup(name, dict)
+        if hash_ is None:
+            hash_ = self._data[name] = {}
+        try:
+            value = int(hash_.get(_encode(key), 0)) + int(amount)
+        except ValueError:
+            raise ResponseError("hash value is not an integer")
+        hash_[_encode(key)] = str(value)
+        return value
+
+    # --- sorted sets ---
+
+    def zadd(self, name, mapping: dict) -> int:
+        self._purge()
+        zset = self._lookup(name, _SortedSet)
+        if zset is None:
+            zset = self._data[name] = _SortedSet()
+        added = 0
+        for member, score in mapping.items():
+            member = _encode(member)
+            added += member not in zset
+            zset[member] = float(score)
+        return added
+
+    def zrem(self, name, *members) -> int:
+        zset = self._lookup(name, _SortedSet)
+        if not zset:
+            return 0
+        removed = sum(zset.pop(_encode(member), None) is not None for member in members)
+        if not zset:
+            self._delete(name)
+        return removed
+
+    def zcard(self, name) -> int:
+        return len(self._lookup(name, _SortedSet) or ())
+
+    def zremrangebyscore(self, name, min, max) -> int:
+        zset = self._lookup(name, _SortedSet)
+        if not zset:
+            return 0
+        low, low_open = _score_bound(min)
+        high, high_open = _score_bound(max)
+        doomed = [
+            member
+            for member, score in zset.items()
+            if (score > low if low_open else score >= low)
+            and (score < high if high_open else score <= high)
+        ]
+        for member in doomed:
+            del zset[member]
+        if not zset:
+            self._delete(name)
+        return len(doomed)
+
+    def zrangebyscore(
+        self,
+        name,
+        min,
+        max,
+        start: int | None = None,
+        num: int | None = None,
+        withscores: bool = False,
+    ) -> list:
+        zset = self._lookup(name, _SortedSet)
+        if not zset:
+            return []
+        low, low_open = _score_bound(min)
+        high, high_open = _score_bound(max)
+        selected = sorted(
+            (
+                (member, score)
+                for member, score in zset.items()
+                if (score > low if low_open else score >= low)
+                and (score < high if high_open else score <= high)
+            ),
+            key=lambda item: (item[1], item[0]),
+        )
+        if start is not None:
+            selected = selected[start : start + num if num >= 0 else None]
+        if withscores:
+            return selected
+        return [member for member, _ in selected]
+
+    def zrange(self, name, start: int, end: int, withscores: bool = False) -> list:
+        zset = self._lookup(name, _SortedSet)
+        if not zset:
+            return []
+        ordered = sorted(zset.items(), key=lambda item: (item[1], item[0]))
+        # Redis включає кінцевий індекс
+        stop = end + 1 if end >= 0 else len(ordered) + end + 1
+        selected = ordered[start:stop]
+        if withscores:
+            return selected
+        return [member for member, _ in selected]
+
+    # --- scripts ---
+
+    def evalsha(self, sha: str, numkeys: int, *keys_and_args):
+        implementation = _scripts.get(sha)
+        if implementation is None:
+            raise NoScriptError("No matching script. Please use EVAL.")
+        keys = [_encode(key) for key in keys_and_args[:numkeys]]
+        args = [_encode(arg) for arg in keys_and_args[numkeys:]]
+        self._purge()
+        return implementation(self, keys, args)
+
+    def eval(self, script: str, numkeys: int, *keys_and_args):
+        sha = hashlib.sha1(script.encode()).hexdigest()
+        if sha not in _scripts:
+            raise ResponseError("memory:// backend cannot run unregistered scripts")
+        return self.evalsha(sha, numkeys, *keys_and_args)
+
+    def script_load(self, script: str) -> str:
+        sha = hashlib.sha1(script.encode()).hexdigest()
+        if sha not in _scripts:
+            raise ResponseError("memory:// backend cannot run unregistered scripts")
+        return sha
+
+    def script_exists(self, *shas) -> list[bool]:
+        return [sha in _scripts for sha in shas]
+
+
+class _SortedSet(dict):
+    # member -> score; окремий тип, щоб відрізняти від хешу для WRONGTYPE
+    pass
+
+
+class MemoryPipeline:
+    """
+    Queues commands and runs them back to back in `execute`.
+
+    Nothing can run in between, so a pipeline is also a transaction.
+    """
+
+    def __init__(self, client: "MemoryRedis", transaction: bool = True):
+        self._client = client
+        self.transaction = transaction
+        self.command_stack: list[tuple[str, tuple, dict]] = []
+
+    def __getattr__(self, name: str):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        self._client._command(name)
+
+        def queue(*args, **kwargs):
+            self.command_stack.append((name, args, kwargs))
+            return self
+
+        return queue
+
+    def __len__(self) -> int:
+        return len(self.command_stack)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.reset()
+
+    def reset(self) -> None:
+        self.command_stack = []
+
+    async def execute(self, raise_on_error: bool = True) -> list:
+        """
+        Runs the queued commands.
+
+        Args:
+            raise_on_error (bool): Raise the first command error after all
+                commands ran, instead of returning it in place of its reply.
+
+        Returns:
+            list: One reply (or exception) per command.
+        """
+        results = []
+        for name, args, kwargs in self.command_stack:
+            try:
+                results.append(self._client._command(name)(*args, **kwargs))
+            except ResponseError as e:
+                results.append(e)
+        self.reset()
+        if raise_on_error:
+            for result in results:
+                if isinstance(result, Exception):
+                    raise result
+        return results
+
+
+class MemoryPubSub:
+    """
+    Subscriber with the ``redis.asyncio`` ``PubSub`` interface.
+    """
+
+    def __init__(self, client: "MemoryRedis"):
+        self._client = client
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self.channels: set[str] = set()
+
+    async def subscribe(self, *channels) -> None:
+        for channel in channels:
+            channel = _encode(channel)
+            self.channels.add(channel)
+            self._client._subscribers.setdefault(channel, set()).add(self)
+            self._queue.put_nowait(
+                {
+                    "type": "subscribe",
+                    "pattern": None,
+                    "channel": channel,
+                    "data": len(self.channels),
+                }
+            )
+
+    async def unsubscribe(self, *channels) -> None:
+        for channel in [_encode(channel) for channel in channels] or list(
+            self.channels
+        ):
+            self.channels.discard(channel)
+            subscribers = self._client._subscribers.get(channel)
+            if subscribers is not None:
+                subscribers.discard(self)
+                if not subscribers:
+                    del self._client._subscribers[channel]
+
+    async def get_message(
+        self, ignore_subscribe_messages: bool = False, timeout: float = 0.0
+    ):
+        try:
+            if timeout:
+                message = await asyncio.wait_for(self._queue.get(), timeout)
+            else:
+                message = self._queue.get_nowait()
+        except (asyncio.TimeoutError, asyncio.QueueEmpty):
+            return None
+        if ignore_subscribe_messages and message["type"] != "message":
+            return None
+        return message
+
+    async def listen(self):
+        while self.channels:
+            yield await self._queue.get()
+
+    async def aclose(self) -> None:
+        await self.unsubscribe()
+
+    reset = aclose
+
+
+class MemoryRedis:
+    """
+    Async client facade over a `MemoryStore`.
+
+    Every `MemoryStore` command is available as a coroutine with the same
+    name, e.g. ``await client.hgetall("user:alice")``.
+
+    Attributes:
+        store (MemoryStore): The keyspace.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        """
+        Initializes an empty backend.
+
+        Args:
+            clock (Callable[[], float]): Monotonic time source in seconds.
+        """
+        self.store = MemoryStore(clock)
+        self._subscribers: dict[str, set[MemoryPubSub]] = {}
+
+    def _command(self, name: str) -> Callable:
+        # Синхронна реалізація команди для клієнта й конвеєра
+        if name == "publish":
+            return self._publish
+        return getattr(self.store, name)
+
+    def __getattr__(self, name: str):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        command = self._command(name)
+
+        async def call(*args, **kwargs):
+            return command(*args, **kwargs)
+
+        call.__name__ = name
+        # Кешуємо обгортку, щоб наступні виклики не проходили через __getattr__
+        setattr(self, name, call)
+        return call
+
+    def pipeline(self, transaction: bool = True) -> MemoryPipeline:
+        return MemoryPipeline(self, transaction)
+
+    def pubsub(self) -> MemoryPubSub:
+        return MemoryPubSub(self)
+
+    def _publish(self, channel, message) -> int:
+        channel = _encode(channel)
+        subscribers = self._subscribers.get(channel, ())
+        for subscriber in subscribers:
+            subscriber._queue.put_nowait(
+                {
+                    "type": "message",
+                    "pattern": None,
+                    "channel": channel,
+                    "data": _encode(message),
+                }
+            )
+        return len(subscribers)
+
+    async def aclose(self) -> None:
+        pass
+
+    close = aclose
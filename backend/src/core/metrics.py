@@ -0,0 +1,23 @@
+"""
+Small helpers shared by the in-process metrics of the core modules.
+"""
+
+
+def percentiles_ms(samples) -> dict:
+    """
+    Summarizes durations as p50/p99 in milliseconds.
+
+    Args:
+        samples: Durations in seconds.
+
+    Returns:
+        dict: ``p50`` and ``p99`` rounded to microseconds, or None if empty.
+    """
+    if not samples:
+        return {"p50": None, "p99": None}
+    ordered = sorted(samples)
+    last = len(ordered) - 1
+    return {
+        "p50": round(ordered[round(last * 0.5)] * 1000, 3),
+        "p99": round(ordered[round(last * 0.99)] * 1000, 3),
+    }
@@ -0,0 +1,576 @@
+"""
+Atomic, single-round-trip Redis rate limiting.
+
+Each algorithm is a Lua script that checks and updates the limit in one
+server-side step, so concurrent requests can never slip past the limit and
+every decision costs a single ``EVALSHA``:
+
+* ``sliding_window_log`` - exact; keeps a timestamp per request in a sorted set.
+* ``sliding_window_counter`` - approximate; weights the previous fixed window.
+* ``token_bucket`` - allows bursts up to ``limit`` and refills continuously.
+
+`RateLimiter` instances are FastAPI dependencies and can be attached per route
+or per router::
+
+    limiter = RateLimiter(limit=10, window=60, algorithm="token_bucket")
+
+    @router.get("/me", dependencies=[Depends(limiter)])
+    ...
+
+    router = APIRouter(dependencies=[Depends(limiter)])
+
+Requests are keyed by user (from the bearer token, without any database or
+cache lookup) and fall back to the client IP for anonymous traffic.
+
+Each limiter also has a `LocalPreLimiter`: an in-process token bucket per key
+that rejects clearly over-limit keys without asking Redis. It only ever counts
+requests Redis allowed from this worker, so it rejects a request only if the
+key is over the limit globally as well. While Redis is unavailable (or its
+circuit breaker is open) the same bucket decides alone, enforcing the limit
+per worker instead of failing the request.
+"""
+
+import hashlib
+import itertools
+import math
+import os
+import time
+import weakref
+from dataclasses import dataclass
+from typing import Callable
+
+from fastapi import HTTPException, Request, Response, status
+from redis.exceptions import NoScriptError, RedisError
+
+from src.conf.config import config
+from src.core.jwt_cache import bearer_subject
+from src.core.local_cache import LocalTTLCache
+from src.core.memory_redis import MemoryStore, register_script
+from src.core.redis_batch import batched
+from src.core.redis_client import redis_client
+
+# Кожен скрипт повертає {allowed, remaining, retry_after_ms, reset_after_ms}
+
+SLIDING_WINDOW_LOG = """
+local limit = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now - window)
+local count = redis.call('ZCARD', KEYS[1])
+if count < limit then
+    redis.call('ZADD', KEYS[1], now, ARGV[4])
+    redis.call('PEXPIRE', KEYS[1], window)
+    local oldest = redis.call('ZRANGE', KEYS[1], 0, 0, 'WITHSCORES')
+    return {1, limit - count - 1, 0, tonumber(oldest[2]) + window - now}
+end
+local oldest = redis.call('ZRANGE', KEYS[1], 0, 0, 'WITHSCORES')
+local retry = math.max(tonumber(oldest[2]) + window - now, 1)
+return {0, 0, retry, retry}
+"""
+
+SLIDING_WINDOW_COUNTER = """
+local limit = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local elapsed = tonumber(ARGV[3])
+local current = tonumber(redis.call('GET', KEYS[1]) or '0')
+local previous = tonumber(redis.call('GET', KEYS[2]) or '0')
+local weighted = previous * (window - elapsed) / window + current
+local reset = window - elapsed
+if weighted + 1 > limit then
+    local retry = reset
+    if current + 1 <= limit then
+        retry = reset - (limit - 1 - current) * window / previous
+    end
+    return {0, 0, math.max(math.ceil(retry), 1), reset}
+end
+redis.call('INCR', KEYS[1])
+redis.call('PEXPIRE', KEYS[1], window * 2)
+return {1, math.floor(limit - weighted - 1), 0, reset}
+"""
+
+TOKEN_BUCKET = """
+local capacity = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local rate = capacity / window
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1])
+local ts = tonumber(state[2])
+if tokens == nil or ts == nil then
+    tokens = capacity
+    ts = now
+end
+tokens = math.min(capacity, tokens + math.max(now - ts, 0) * rate)
+local allowed = 0
+local retry = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+else
+    retry = math.ceil((1 - tokens) / rate)
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', now)
+redis.call('PEXPIRE', KEYS[1], window)
+return {allowed, math.floor(tokens), retry, math.ceil((capacity - tokens) / rate)}
+"""
+
+ALGORITHMS = {
+    "sliding_window_log": SLIDING_WINDOW_LOG,
+    "sliding_window_counter": SLIDING_WINDOW_COUNTER,
+    "token_bucket": TOKEN_BUCKET,
+}
+
+_SHAS = {
+    name: hashlib.sha1(script.encode()).hexdigest()
+    for name, script in ALGORITHMS.items()
+}
+
+
+# Python-версії скриптів для бекенда memory://; мають повторювати Lua рядок у рядок
+
+
+def _sliding_window_log(store: MemoryStore, keys: list, args: list) -> list:
+    limit, window, now = int(args[0]), int(args[1]), int(args[2])
+    store.zremrangebyscore(keys[0], "-inf", now - window)
+    count = store.zcard(keys[0])
+    if count < limit:
+        store.zadd(keys[0], {args[3]: now})
+        store.pexpire(keys[0], window)
+        oldest = store.zrange(keys[0], 0, 0, withscores=True)
+        return [1, limit - count - 1, 0, int(oldest[0][1]) + window - now]
+    oldest = store.zrange(keys[0], 0, 0, withscores=True)
+    retry = max(int(oldest[0][1]) + window - now, 1)
+    return [0, 0, retry, retry]
+
+
+def _sliding_window_counter(store: MemoryStore, keys: list, args: list) -> list:
+    limit, window, elapsed = int(args[0]), int(args[1]), int(args[2])
+    current = int(store.get(keys[0]) or 0)
+    previous = int(store.get(keys[1]) or 0)
+    weighted = previous * (window - elapsed) / window + current
+    reset = window - elapsed
+    if weighted + 1 > limit:
+        retry = reset
+        if current + 1 <= limit:
+            retry = reset - (limit - 1 - current) * window / previous
+        return [0, 0, max(math.ceil(retry), 1), reset]
+    store.incr(keys[0])
+    store.pexpire(keys[0], window * 2)
+    return [1, math.floor(limit - weighted - 1), 0, reset]
+
+
+def _token_bucket(store: MemoryStore, keys: list, args: list) -> list:
+    capacity, window, now = int(args[0]), int(args[1]), int(args[2])
+    rate = capacity / window
+    tokens, ts = store.hmget(keys[0], "tokens", "ts")
+    if tokens is None or ts is None:
+        tokens, ts = capacity, now
+    tokens = min(capacity, float(tokens) + max(now - float(ts), 0) * rate)
+    allowed, retry = 0, 0
+    if tokens >= 1:
+        tokens -= 1
+        allowed = 1
+    else:
+        retry = math.ceil((1 - tokens) / rate)
+    # tostring() у Lua зберігає 14 значущих цифр
+    store.hset(keys[0], mapping={"tokens": "%.14g" % tokens, "ts": now})
+    store.pexpire(keys[0], window)
+    return [allowed, math.floor(tokens), retry, math.ceil((capacity - tokens) / rate)]
+
+
+register_script(SLIDING_WINDOW_LOG, _sliding_window_log)
+register_script(SLIDING_WINDOW_COUNTER, _sliding_window_counter)
+register_script(TOKEN_BUCKET, _token_bucket)
+
+_limiters: "weakref.WeakSet[RateLimiter]" = weakref.WeakSet()
+
+# Унікальні члени sorted set для запитів в одну й ту саму мілісекунду
+_request_ids = itertools.count()
+_worker_id = f"{os.getpid()}-{os.urandom(4).hex()}"
+
+
+@dataclass(frozen=True)
+class RateLimitResult:
+    """
+    Outcome of one rate limit check.
+
+    Attributes:
+        allowed (bool): Whether the request may proceed.
+        limit (int): Requests allowed per window.
+        remaining (int): Requests left in the current window.
+        retry_after (float): Seconds until a rejected request may be retried.
+        reset_after (float): Seconds until the limit is fully replenished.
+    """
+
+    allowed: bool
+    limit: int
+    remaining: int
+    retry_after: float
+    reset_after: float
+
+    def headers(self) -> dict:
+        """
+        Builds the ``X-RateLimit-*`` (and ``Retry-After``) response headers.
+
+        Returns:
+            dict: Header names mapped to values.
+        """
+        headers = {
+            "X-RateLimit-Limit": str(self.limit),
+            "X-RateLimit-Remaining": str(max(self.remaining, 0)),
+            "X-RateLimit-Reset": str(math.ceil(self.reset_after)),
+        }
+        if not self.allowed:
+            headers["Retry-After"] = str(max(math.ceil(self.retry_after), 1))
+        return headers
+
+
+class _LocalBucket:
+    __slots__ = ("tokens", "updated_at", "blocked_until")
+
+    def __init__(self, tokens: float, now: float):
+        self.tokens = tokens
+        self.updated_at = now
+        self.blocked_until = 0.0
+
+
+class LocalPreLimiter:
+    """
+    In-process token bucket per key that sheds clearly over-limit traffic.
+
+    The bucket has the same capacity and refill rate as the global limit but
+    is only charged for requests Redis allowed from this worker, so its usage
+    is a lower bound of the global usage: if it is empty, the key has used up
+    the limit within the last window on this worker alone. It syncs with Redis
+    on every Redis decision; a rejection blocks the key locally for the
+    ``Retry-After`` Redis returned.
+
+    Attributes:
+        limit (int): Bucket capacity.
+        window (float): Seconds to refill an empty bucket.
+    """
+
+    def __init__(
+        self,
+        limit: int,
+        window: float,
+        maxsize: int,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initializes the pre-limiter.
+
+        Args:
+            limit (int): Bucket capacity.
+            window (float): Seconds to refill an empty bucket.
+            maxsize (int): Maximum number of keys tracked in memory.
+            clock (Callable[[], float]): Monotonic time source.
+        """
+        self.limit = limit
+        self.window = window
+        self._rate = limit / window
+        self._clock = clock
+        self._buckets = LocalTTLCache(maxsize, window)
+
+    def _refill(self, bucket: _LocalBucket, now: float) -> None:
+        elapsed = max(now - bucket.updated_at, 0.0)
+        bucket.tokens = min(self.limit, bucket.tokens + elapsed * self._rate)
+        bucket.updated_at = now
+
+    def check(self, key: str) -> float | None:
+        """
+        Decides locally whether a key is clearly over the limit.
+
+        Args:
+            key (str): The rate limit key.
+
+        Returns:
+            float | None: Seconds to wait if the request must be rejected,
+            or None if Redis has to decide.
+        """
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            return None
+        now = self._clock()
+        if bucket.blocked_until > now:
+            return bucket.blocked_until - now
+        self._refill(bucket, now)
+        if bucket.tokens < 1:
+            return (1 - bucket.tokens) / self._rate
+        return None
+
+    def record(self, key: str, result: "RateLimitResult") -> None:
+        """
+        Syncs the local bucket with a decision made by Redis.
+
+        Args:
+            key (str): The rate limit key.
+            result (RateLimitResult): The decision returned by Redis.
+        """
+        now = self._clock()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = _LocalBucket(self.limit, now)
+        else:
+            self._refill(bucket, now)
+        if result.allowed:
+            bucket.tokens = max(bucket.tokens - 1, 0.0)
+        else:
+            bucket.blocked_until = now + result.retry_after
+        self._buckets.set(key, bucket)
+
+    def acquire(self, key: str) -> "RateLimitResult":
+        """
+        Decides entirely in memory; used while Redis is unavailable.
+
+        Args:
+            key (str): The rate limit key.
+
+        Returns:
+            RateLimitResult: The local decision.
+        """
+        retry_after = self.check(key)
+        if retry_after is not None:
+            return RateLimitResult(
+                allowed=False,
+                limit=self.limit,
+                remaining=0,
+                retry_after=retry_after,
+                reset_after=retry_after,
+            )
+        now = self._clock()
+        bucket = self._buckets.get(key) or _LocalBucket(self.limit, now)
+        self._refill(bucket, now)
+        bucket.tokens -= 1
+        self._buckets.set(key, bucket)
+        return RateLimitResult(
+            allowed=True,
+            limit=self.limit,
+            remaining=int(bucket.tokens),
+            retry_after=0,
+            reset_after=(self.limit - bucket.tokens) / self._rate,
+        )
+
+    def clear(self) -> None:
+        """
+        Forgets every tracked key.
+        """
+        self._buckets.clear()
+
+
+def client_ip_key(request: Request) -> str:
+    """
+    Keys a request by the client IP address.
+
+    Args:
+        request (Request): The incoming request.
+
+    Returns:
+        str: The rate limit key.
+    """
+    host = request.client.host if request.client else "unknown"
+    return f"ip:{host}"
+
+
+def user_or_ip_key(request: Request) -> str:
+    """
+    Keys a request by the authenticated user, or by IP if there is none.
+
+    The user is read from the bearer token through the verified-claims cache,
+    so keying costs no database or Redis lookup. Invalid tokens are keyed by IP.
+
+    Args:
+        request (Request): The incoming request.
+
+    Returns:
+        str: The rate limit key.
+    """
+    subject = bearer_subject(request)
+    if subject:
+        return f"user:{subject}"
+    return client_ip_key(request)
+
+
+async def _run_script(name: str, keys: list, args: list):
+    # Перевірки паралельних запитів ідуть на сервер одним конвеєром
+    try:
+        return await batched(
+            redis_client, "evalsha", _SHAS[name], len(keys), *keys, *args
+        )
+    except NoScriptError:
+        # Скрипт ще не завантажено на цей сервер: EVAL кешує його для наступних
+        return await batched(
+            redis_client, "eval", ALGORITHMS[name], len(keys), *keys, *args
+        )
+
+
+class RateLimiter:
+    """
+    A Redis-backed rate limit usable as a FastAPI dependency.
+
+    Attributes:
+        limit (int): Requests allowed per window (bucket capacity for token bucket).
+        window (float): Window length in seconds.
+        algorithm (str): One of `ALGORITHMS`.
+        scope (str): Namespace of the Redis keys, so limiters do not share counters.
+        key_func (Callable[[Request], str]): Maps a request to its rate limit key.
+    """
+
+    def __init__(
+        self,
+        limit: int,
+        window: float,
+        algorithm: str = "sliding_window_counter",
+        scope: str = "default",
+        key_func: Callable[[Request], str] = user_or_ip_key,
+        local: bool = True,
+    ):
+        """
+        Initializes the limiter.
+
+        Args:
+            limit (int): Requests allowed per window.
+            window (float): Window length in seconds.
+            algorithm (str): One of `ALGORITHMS`.
+            scope (str): Namespace of the Redis keys.
+            key_func (Callable[[Request], str]): Maps a request to its key.
+            local (bool): Whether to shed over-limit keys in memory first.
+
+        Raises:
+            ValueError: If the algorithm is unknown or the limits are not positive.
+        """
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"Unknown rate limit algorithm: {algorithm}")
+        if limit <= 0 or window <= 0:
+            raise ValueError("Rate limit and window must be positive")
+        self.limit = limit
+        self.window = window
+        self.algorithm = algorithm
+        self.scope = scope
+        self.key_func = key_func
+        self.local = local
+        self.pre_limiter = LocalPreLimiter(limit, window, config.RATE_LIMIT_LOCAL_KEYS)
+        self.local_rejections = 0
+        self.redis_decisions = 0
+        self.fallback_decisions = 0
+        _limiters.add(self)
+
+    def _keys_and_args(self, key: str, now_ms: int) -> tuple[list, list]:
+        window_ms = int(self.window * 1000)
+        base = f"ratelimit:{self.scope}:{self.algorithm}:{key}"
+        if self.algorithm == "sliding_window_counter":
+            index, elapsed = divmod(now_ms, window_ms)
+            keys = [f"{base}:{index}", f"{base}:{index - 1}"]
+            return keys, [self.limit, window_ms, elapsed]
+        args = [self.limit, window_ms, now_ms]
+        if self.algorithm == "sliding_window_log":
+            args.append(f"{now_ms}-{_worker_id}-{next(_request_ids)}")
+        return [base], args
+
+    async def hit(self, key: str) -> RateLimitResult:
+        """
+        Counts one request against the limit.
+
+        Clearly over-limit keys are rejected in memory; everything else costs
+        a single Redis round trip. If Redis is unavailable the in-process
+        bucket decides instead.
+
+        Args:
+            key (str): The rate limit key, e.g. ``"user:42"``.
+
+        Returns:
+            RateLimitResult: Whether the request is allowed, plus header data.
+        """
+        if self.local:
+            retry_after = self.pre_limiter.check(key)
+            if retry_after is not None:
+                self.local_rejections += 1
+                return RateLimitResult(
+                    allowed=False,
+                    limit=self.limit,
+                    remaining=0,
+                    retry_after=retry_after,
+                    reset_after=retry_after,
+                )
+
+        keys, args = self._keys_and_args(key, int(time.time() * 1000))
+        try:
+            allowed, remaining, retry_ms, reset_ms = await _run_script(
+                self.algorithm, keys, args
+            )
+        except RedisError as e:
+            print(f"Rate limiter falls back to local decisions: {e}")
+            self.fallback_decisions += 1
+            return self.pre_limiter.acquire(key)
+        self.redis_decisions += 1
+        result = RateLimitResult(
+            allowed=bool(allowed),
+            limit=self.limit,
+            remaining=int(remaining),
+            retry_after=int(retry_ms) / 1000,
+            reset_after=int(reset_ms) / 1000,
+        )
+        self.pre_limiter.record(key, result)
+        return result
+
+    def stats(self) -> dict:
+        """
+        Returns decision counters.
+
+        Returns:
+            dict: Local rejections, Redis decisions, local fallback decisions
+            and the share made locally.
+        """
+        total = self.local_rejections + self.redis_decisions + self.fallback_decisions
+        return {
+            "algorithm": self.algorithm,
+            "limit": self.limit,
+            "window": self.window,
+            "local_rejections": self.local_rejections,
+            "redis_decisions": self.redis_decisions,
+            "fallback_decisions": self.fallback_decisions,
+            "local_share": (
+                (self.local_rejections + self.fallback_decisions) / total
+                if total
+                else 0.0
+            ),
+        }
+
+    async def __call__(self, request: Request, response: Response) -> None:
+        """
+        FastAPI dependency: enforces the limit and sets rate limit headers.
+
+        Args:
+            request (Request): The incoming request.
+            response (Response): The response whose headers are set.
+
+        Raises:
+            HTTPException: 429 with ``Retry-After`` if the limit is exceeded.
+        """
+        result = await self.hit(self.key_func(request))
+        headers = result.headers()
+        if not result.allowed:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too Many Requests.",
+                headers=headers,
+            )
+        response.headers.update(headers)
+
+
+def rate_limiter_stats() -> dict:
+    """
+    Collects decision counters of every limiter in this worker.
+
+    Returns:
+        dict: Limiter stats keyed by scope.
+    """
+    return {limiter.scope: limiter.stats() for limiter in _limiters}
+
+
+def clear_local_rate_limits() -> None:
+    """
+    Forgets the in-process state of every limiter in this worker.
+    """
+    for limiter in _limiters:
+        limiter.pre_limiter.clear()
@@ -0,0 +1,87 @@
+"""
+Read-your-writes tracking for read-replica routing.
+
+Replicas lag behind the primary, so a user who has just written must not read
+from a replica until the write has had time to replicate. `RecentWrites`
+remembers who wrote within the last ``window`` seconds, in process memory and
+in Redis (so every worker knows), and `get_read_db` sends those users' reads to
+the primary.
+"""
+
+from redis.exceptions import RedisError
+
+from src.conf.config import config
+from src.core.local_cache import LocalTTLCache
+from src.core.redis_batch import batched
+from src.core.redis_client import redis_client
+
+
+def _redis_key(subject: str) -> str:
+    return f"recent-write:{subject}"
+
+
+class RecentWrites:
+    """
+    Remembers which users wrote recently.
+
+    Attributes:
+        window (float): Seconds a user's reads stick to the primary after a write.
+        local (LocalTTLCache): Writers seen by this worker.
+    """
+
+    def __init__(self, window: float, maxsize: int = 10_000):
+        """
+        Initializes the tracker.
+
+        Args:
+            window (float): Seconds a user's reads stick to the primary.
+            maxsize (int): Maximum number of writers remembered in memory.
+        """
+        self.window = window
+        self.local = LocalTTLCache(maxsize, window)
+
+    async def mark(self, subject: str) -> None:
+        """
+        Records that a user has just written.
+
+        Args:
+            subject (str): The user, as returned by `bearer_subject`.
+        """
+        self.local.set(subject, True)
+        try:
+            await batched(
+                redis_client,
+                "set",
+                _redis_key(subject),
+                1,
+                px=int(self.window * 1000),
+            )
+        except RedisError as e:
+            print(f"Recent write mark failed: {e}")
+
+    async def is_recent(self, subject: str) -> bool:
+        """
+        Tells whether a user wrote within the window, on any worker.
+
+        Args:
+            subject (str): The user, as returned by `bearer_subject`.
+
+        Returns:
+            bool: True if the user's reads must go to the primary. Also True
+            when Redis is unavailable, because other workers cannot be asked.
+        """
+        if self.local.get(subject):
+            return True
+        try:
+            return bool(await batched(redis_client, "exists", _redis_key(subject)))
+        except RedisError:
+            return True
+
+    def clear(self) -> None:
+        """
+        Forgets the writers seen by this worker.
+        """
+        self.local.clear()
+
+
+recent_writes = RecentWrites(window=config.DB_READ_YOUR_WRITES_SECONDS)
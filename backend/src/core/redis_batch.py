@@ -0,0 +1,169 @@
+"""
+Round-trip-aware access to Redis.
+
+1. `pipeline` groups related commands, by default as a ``MULTI``/``EXEC``
+   transaction, and sends them in one network round trip.
+2. `batched` queues independent commands issued in the same event-loop tick and
+   flushes them together as one pipeline, so lookups started concurrently (for
+   example with ``asyncio.gather``, or by concurrent requests) share a single
+   round trip.
+
+Both take the client explicitly, so callers keep using their own module-level
+``redis_client``. Both also go through `redis_breaker`: while Redis is failing
+they raise `CircuitOpenError` right away, so callers can fall back without
+waiting for timeouts.
+
+Example:
+    async with pipeline(redis_client) as pipe:
+        pipe.hset("user:alice", mapping={"id": "1"})
+        pipe.expire("user:alice", 600)
+
+    version, cached = await asyncio.gather(
+        batched(redis_client, "get", "user:1:token_version"),
+        batched(redis_client, "hgetall", "user:alice"),
+    )
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator
+
+from redis.exceptions import ConnectionError as RedisConnectionError
+from redis.exceptions import RedisError
+from redis.exceptions import TimeoutError as RedisTimeoutError
+
+from src.conf.config import config
+from src.core.circuit_breaker import CircuitBreaker, CircuitOpenError
+
+# Помилки, що свідчать про недоступність Redis, а не про помилку команди
+UNAVAILABLE_ERRORS = (RedisConnectionError, RedisTimeoutError, OSError)
+
+redis_breaker = CircuitBreaker(
+    failure_threshold=config.REDIS_BREAKER_FAILURES,
+    reset_timeout=config.REDIS_BREAKER_RESET,
+)
+
+# Черги команд поточного циклу подій, по одній на клієнт
+_pending: dict[int, tuple[Any, list]] = {}
+_flushes: set[asyncio.Task] = set()
+
+_stats = {"round_trips": 0, "commands": 0}
+
+
+@asynccontextmanager
+async def pipeline(client, transaction: bool = True) -> AsyncIterator[Any]:
+    """
+    Collects commands and sends them in one round trip on exit.
+
+    Args:
+        client: The Redis client.
+        transaction (bool): Whether to wrap the commands in ``MULTI``/``EXEC``.
+
+    Yields:
+        Pipeline: The pipeline to queue commands on; executed when the block exits.
+
+    Raises:
+        CircuitOpenError: If the circuit is open; nothing is sent.
+    """
+    async with client.pipeline(transaction=transaction) as pipe:
+        yield pipe
+        commands = len(pipe)
+        if not redis_breaker.allow():
+            raise CircuitOpenError("Redis circuit is open")
+        try:
+            await pipe.execute()
+        except RedisError as e:
+            if isinstance(e, UNAVAILABLE_ERRORS):
+                redis_breaker.record_failure()
+            else:
+                redis_breaker.record_success()
+            raise
+        except BaseException:
+            # Скасована пробна спроба не повинна залишити коло напіввідкритим
+            redis_breaker.record_failure()
+            raise
+        redis_breaker.record_success()
+    _stats["round_trips"] += 1
+    _stats["commands"] += commands
+
+
+async def batched(client, command: str, *args, **kwargs) -> Any:
+    """
+    Runs a command together with every other command queued in this tick.
+
+    Args:
+        client: The Redis client.
+        command (str): The client method name, e.g. ``"hgetall"``.
+        *args: Positional arguments of the command.
+        **kwargs: Keyword arguments of the command.
+
+    Returns:
+        Any: The command's reply.
+
+    Raises:
+        CircuitOpenError: If the circuit is open; nothing is sent.
+        redis.exceptions.RedisError: If this command (or the flush) fails.
+    """
+    loop = asyncio.get_running_loop()
+    entry = _pending.get(id(client))
+    if entry is None:
+        entry = _pending[id(client)] = (client, [])
+        # Задача стартує на наступній ітерації циклу, після інших готових корутин
+        task = loop.create_task(_flush(id(client)))
+        _flushes.add(task)
+        task.add_done_callback(_flushes.discard)
+    future = loop.create_future()
+    entry[1].append((command, args, kwargs, future))
+    return await future
+
+
+async def _flush(key: int) -> None:
+    client, commands = _pending.pop(key)
+    if not redis_breaker.allow():
+        results = [CircuitOpenError("Redis circuit is open")] * len(commands)
+    else:
+        try:
+            if len(commands) == 1:
+                command, args, kwargs, _ = commands[0]
+                try:
+                    results = [await getattr(client, command)(*args, **kwargs)]
+                except Exception as e:
+                    results = [e]
+            else:
+                async with client.pipeline(transaction=False) as pipe:
+                    for command, args, kwargs, _ in commands:
+                        getattr(pipe, command)(*args, **kwargs)
+                    results = await pipe.execute(raise_on_error=False)
+        except Exception as e:
+            results = [e] * len(commands)
+
+        _stats["round_trips"] += 1
+        _stats["commands"] += len(commands)
+        if any(isinstance(result, UNAVAILABLE_ERRORS) for result in results):
+            redis_breaker.record_failure()
+        else:
+            redis_breaker.record_success()
+
+    for (*_, future), result in zip(commands, results):
+        if future.done():
+            continue
+        if isinstance(result, Exception):
+            future.set_exception(result)
+        else:
+            future.set_result(result)
+
+
+def stats() -> dict:
+    """
+    Returns round-trip counters of this worker.
+
+    Returns:
+        dict: Round trips, commands sent and commands per round trip.
+    """
+    round_trips = _stats["round_trips"]
+    return {
+        **_stats,
+        "commands_per_round_trip": (
+            _stats["commands"] / round_trips if round_trips else 0.0
+        ),
+    }
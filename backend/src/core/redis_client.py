@@ -1,15 +1,22 @@
-import os
-import redis.asyncio as redis
-
-REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379")
-redis_client = redis.from_url(REDIS_URL, decode_responses=True)
 """
 This module sets up the connection to a Redis instance using the `redis.asyncio` client.
 
-1. It first attempts to read the Redis URL from the environment variable `REDIS_URL`.
-2. If the environment variable is not set, it defaults to `redis://localhost:6379`.
+1. The Redis URL is read from `config.REDIS_URL` (environment variable `REDIS_URL`,
+   defaults to `redis://localhost:6379`).
+2. Connections come from a bounded blocking pool: when all of them are busy, a
+   caller waits up to `REDIS_POOL_TIMEOUT` seconds instead of opening more.
+3. Every connection has connect and socket timeouts and is health-checked
+   before reuse after being idle, so a slow or dead Redis fails fast instead of
+   hanging the request.
+4. Pub/sub subscribers use the separate `pubsub_client`, whose connections
+   have no socket timeout: a subscription waits indefinitely for the next
+   message, and a read timeout would tear it down whenever the channel is idle.
+   TCP keepalive detects a dead server instead.
+5. `REDIS_URL=memory://` selects the in-process `MemoryRedis` backend instead,
+   for tests, local load tests and single-node development runs.
 
-The `redis_client` object is created using the `from_url` method, which establishes a connection to Redis and configures it to decode responses as strings (using `decode_responses=True`).
+The `redis_client` object is configured to decode responses as strings
+(using `decode_responses=True`).
 
 Usage:
 - You can interact with Redis asynchronously using the `redis_client` object, which provides methods to interact with the Redis server.
@@ -19,5 +26,60 @@ Example:
     value = await redis_client.get("key")
 
 Environment Variables:
-- `REDIS_URL`: The URL of the Redis instance (optional, defaults to `redis://localhost:6379`).
+- `REDIS_URL`: The URL of the Redis instance (optional, defaults to `redis://localhost:6379`),
+  or `memory://` for the in-process backend.
+- `REDIS_MAX_CONNECTIONS`, `REDIS_POOL_TIMEOUT`, `REDIS_SOCKET_TIMEOUT`,
+  `REDIS_CONNECT_TIMEOUT`, `REDIS_HEALTH_CHECK_INTERVAL`: pool tuning.
 """
+
+import redis.asyncio as redis
+
+from src.conf.config import config
+from src.core.memory_redis import MemoryRedis
+
+REDIS_URL = config.REDIS_URL
+
+if REDIS_URL.startswith("memory://"):
+    redis_pool = None
+    redis_client = MemoryRedis()
+    pubsub_client = redis_client
+else:
+    redis_pool = redis.BlockingConnectionPool.from_url(
+        REDIS_URL,
+        max_connections=config.REDIS_MAX_CONNECTIONS,
+        timeout=config.REDIS_POOL_TIMEOUT,
+        socket_timeout=config.REDIS_SOCKET_TIMEOUT,
+        socket_connect_timeout=config.REDIS_CONNECT_TIMEOUT,
+        health_check_interval=config.REDIS_HEALTH_CHECK_INTERVAL,
+        decode_responses=True,
+    )
+    redis_client = redis.Redis(connection_pool=redis_pool)
+    # Окремий пул: підписки тримають з'єднання постійно й не мають тайм-ауту читання
+    pubsub_client = redis.Redis.from_url(
+        REDIS_URL,
+        socket_timeout=None,
+        socket_connect_timeout=config.REDIS_CONNECT_TIMEOUT,
+        socket_keepalive=True,
+        decode_responses=True,
+    )
+
+
+def pool_stats() -> dict:
+    """
+    Returns the connection pool state of this worker.
+
+    Returns:
+        dict: Pool size and the number of open, in-use and idle connections,
+        or the key count for the in-memory backend.
+    """
+    if redis_pool is None:
+        return {"backend": "memory", "keys": redis_client.store.dbsize()}
+    in_use = len(redis_pool._in_use_connections)
+    idle = len(redis_pool._available_connections)
+    return {
+        "backend": "redis",
+        "max_connections": redis_pool.max_connections,
+        "in_use": in_use,
+        "idle": idle,
+        "open": in_use + idle,
+    }
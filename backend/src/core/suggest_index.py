@@ -0,0 +1,372 @@
+"""
+In-process typeahead index of contact names and emails.
+
+Each user's contacts are kept as a sorted array of ``(term, contact_id)`` pairs
+over the normalized first name, last name and email, so a prefix lookup is a
+binary search plus a short scan instead of an ILIKE query per keystroke.
+
+1. A user's index is built lazily from the database on the first suggestion
+   request, then updated in place by the contact write paths of this worker.
+2. Memory is bounded by the total number of terms; whole users are dropped in
+   least recently used order.
+3. Writes publish the user id over Redis pub/sub; every other worker runs
+   `SuggestIndex.listen_for_invalidations` and drops that user's index, which
+   is rebuilt on the next request.
+"""
+
+import asyncio
+import json
+import time
+import unicodedata
+import uuid
+from bisect import bisect_left, insort
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Iterable
+
+from redis.exceptions import RedisError
+
+from src.conf.config import config
+from src.core.redis_batch import batched
+from src.core.redis_client import pubsub_client, redis_client
+
+INVALIDATION_CHANNEL = "contact-suggest:invalidate"
+
+
+def normalize(value: str | None) -> str:
+    """
+    Folds a name or email into the form stored in the index.
+
+    Args:
+        value (str | None): The raw value.
+
+    Returns:
+        str: The NFKC-normalized, case-folded value without surrounding spaces.
+    """
+    return unicodedata.normalize("NFKC", value or "").casefold().strip()
+
+
+def _terms(contact: Any) -> set[tuple[str, int]]:
+    values = (contact.first_name, contact.last_name, contact.email)
+    return {(term, contact.id) for term in map(normalize, values) if term}
+
+
+class UserPrefixIndex:
+    """
+    Prefix index over one user's contacts.
+
+    Attributes:
+        contacts (dict[int, dict]): Suggestion payload by contact id.
+        built_at (float): Clock reading when the index was built.
+    """
+
+    def __init__(self, contacts: Iterable[Any], built_at: float = 0.0):
+        """
+        Builds the index in one sort.
+
+        Args:
+            contacts (Iterable[Any]): Rows exposing ``id``, ``first_name``,
+                ``last_name`` and ``email``.
+            built_at (float): Clock reading when the rows were loaded.
+        """
+        self.contacts: dict[int, dict] = {}
+        self._terms: list[tuple[str, int]] = []
+        self._terms_by_id: dict[int, set[tuple[str, int]]] = {}
+        for contact in contacts:
+            self._remember(contact)
+            self._terms.extend(self._terms_by_id[contact.id])
+        self._terms.sort()
+        self.built_at = built_at
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    def _remember(self, contact: Any) -> None:
+        self.contacts[contact.id] = {
+            "id": contact.id,
+            "first_name": contact.first_name,
+            "last_name": contact.last_name,
+            "email": contact.email,
+        }
+        self._terms_by_id[contact.id] = _terms(contact)
+
+    def upsert(self, contact: Any) -> None:
+        """
+        Adds a contact or replaces its terms.
+
+        Args:
+            contact (Any): The created or updated contact.
+        """
+        self.remove(contact.id)
+        self._remember(contact)
+        for term in self._terms_by_id[contact.id]:
+            insort(self._terms, term)
+
+    def remove(self, contact_id: int) -> None:
+        """
+        Drops a contact if it is indexed.
+
+        Args:
+            contact_id (int): The ID of the contact.
+        """
+        self.contacts.pop(contact_id, None)
+        for term in self._terms_by_id.pop(contact_id, ()):
+            i = bisect_left(self._terms, term)
+            if i < len(self._terms) and self._terms[i] == term:
+                del self._terms[i]
+
+    def _prefixed(self, prefix: str) -> Iterable[int]:
+        # (prefix,) менший за будь-який (prefix..., id), тож пошук стає на перший збіг
+        i = bisect_left(self._terms, (prefix,))
+        while i < len(self._terms) and self._terms[i][0].startswith(prefix):
+            yield self._terms[i][1]
+            i += 1
+
+    def lookup(self, query: str, limit: int) -> list[dict]:
+        """
+        Finds contacts where every word of the query starts some indexed term.
+
+        Args:
+            query (str): What the user has typed so far.
+            limit (int): Maximum number of suggestions.
+
+        Returns:
+            list[dict]: Suggestions ordered by the term matching the first word.
+        """
+        words = normalize(query).split()
+        if not words:
+            return []
+        # Решта слів звужує множину; перше дає порядок і дозволяє зупинитися рано
+        required = [set(self._prefixed(word)) for word in words[1:]]
+        found: list[dict] = []
+        seen: set[int] = set()
+        for contact_id in self._prefixed(words[0]):
+            if contact_id in seen or not all(contact_id in ids for ids in required):
+                continue
+            seen.add(contact_id)
+            found.append(self.contacts[contact_id])
+            if len(found) == limit:
+                break
+        return found
+
+
+class SuggestIndex:
+    """
+    Per-user prefix indexes with whole-user LRU eviction.
+
+    Attributes:
+        max_terms (int): Terms kept across all users before eviction.
+        ttl (float): Seconds after which a user's index is rebuilt.
+        worker_id (str): Identifies this worker's own invalidation messages.
+        hits (int): Lookups served from a built index.
+        misses (int): Lookups that had to build the index first.
+        evictions (int): User indexes dropped to respect ``max_terms``.
+        invalidations_received (int): Pub/sub messages from other workers processed.
+        redis_errors (int): Invalidations that could not be published.
+    """
+
+    def __init__(
+        self,
+        max_terms: int,
+        ttl: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initializes an empty index.
+
+        Args:
+            max_terms (int): Terms kept across all users before eviction.
+            ttl (float): Seconds after which a user's index is rebuilt.
+            clock (Callable[[], float]): Monotonic time source.
+        """
+        self.max_terms = max_terms
+        self.ttl = ttl
+        self._clock = clock
+        self.worker_id = uuid.uuid4().hex
+        self._users: OrderedDict[int, UserPrefixIndex] = OrderedDict()
+        self._terms = 0
+        # Побудови в процесі: запис під час завантаження робить результат застарілим
+        self._building: dict[int, object] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations_received = 0
+        self.redis_errors = 0
+
+    def _cached(self, user_id: int) -> UserPrefixIndex | None:
+        index = self._users.get(user_id)
+        if index is not None and index.built_at + self.ttl <= self._clock():
+            self.drop(user_id)
+            return None
+        return index
+
+    async def lookup(
+        self,
+        user_id: int,
+        query: str,
+        limit: int,
+        load: Callable[[], Awaitable[Iterable[Any]]],
+    ) -> list[dict]:
+        """
+        Returns suggestions, building the user's index on first use.
+
+        Args:
+            user_id (int): The owner of the contacts.
+            query (str): What the user has typed so far.
+            limit (int): Maximum number of suggestions.
+            load (Callable[[], Awaitable[Iterable[Any]]]): Loads the user's
+                contacts when the index is not built yet.
+
+        Returns:
+            list[dict]: Suggestions with id, first name, last name and email.
+        """
+        index = self._cached(user_id)
+        if index is not None:
+            self.hits += 1
+            self._users.move_to_end(user_id)
+            return index.lookup(query, limit)
+
+        self.misses += 1
+        token = self._building[user_id] = object()
+        built_at = self._clock()
+        try:
+            contacts = await load()
+        finally:
+            fresh = self._building.get(user_id) is token
+            if fresh:
+                del self._building[user_id]
+        index = UserPrefixIndex(contacts, built_at)
+        # Застарілий результат віддаємо один раз, але не кешуємо
+        if fresh:
+            self._install(user_id, index)
+        return index.lookup(query, limit)
+
+    def _install(self, user_id: int, index: UserPrefixIndex) -> None:
+        if len(index) > self.max_terms:
+            return
+        self.drop(user_id)
+        self._users[user_id] = index
+        self._terms += len(index)
+        while self._terms > self.max_terms:
+            _, evicted = self._users.popitem(last=False)
+            self._terms -= len(evicted)
+            self.evictions += 1
+
+    def drop(self, user_id: int) -> None:
+        """
+        Forgets a user's index on this worker, including a build in progress.
+
+        Args:
+            user_id (int): The owner of the contacts.
+        """
+        self._building.pop(user_id, None)
+        index = self._users.pop(user_id, None)
+        if index is not None:
+            self._terms -= len(index)
+
+    def _apply(self, user_id: int, change: Callable[[UserPrefixIndex], None]) -> None:
+        self._building.pop(user_id, None)
+        index = self._users.get(user_id)
+        if index is not None:
+            before = len(index)
+            change(index)
+            self._terms += len(index) - before
+
+    async def contact_saved(self, user_id: int, contact: Any) -> None:
+        """
+        Indexes a created or updated contact and notifies other workers.
+
+        Args:
+            user_id (int): The owner of the contact.
+            contact (Any): The saved contact.
+        """
+        self._apply(user_id, lambda index: index.upsert(contact))
+        await self._publish(user_id)
+
+    async def contact_removed(self, user_id: int, contact_id: int) -> None:
+        """
+        Unindexes a deleted contact and notifies other workers.
+
+        Args:
+            user_id (int): The owner of the contact.
+            contact_id (int): The ID of the deleted contact.
+        """
+        self._apply(user_id, lambda index: index.remove(contact_id))
+        await self._publish(user_id)
+
+    async def invalidate(self, user_id: int) -> None:
+        """
+        Drops a user's index everywhere, for writes that touch many contacts.
+
+        Args:
+            user_id (int): The owner of the contacts.
+        """
+        self.drop(user_id)
+        await self._publish(user_id)
+
+    async def _publish(self, user_id: int) -> None:
+        message = json.dumps({"worker": self.worker_id, "user_id": user_id})
+        try:
+            await batched(redis_client, "publish", INVALIDATION_CHANNEL, message)
+        except RedisError as e:
+            # Інші воркери перебудують індекс після закінчення TTL
+            self.redis_errors += 1
+            print(f"Suggest index invalidation failed: {e}")
+
+    async def listen_for_invalidations(self) -> None:
+        """
+        Consumes invalidation messages and drops the matching user indexes.
+
+        Runs until cancelled. After a (re)subscription every index is dropped,
+        because messages published while disconnected are lost.
+        """
+        while True:
+            pubsub = pubsub_client.pubsub()
+            try:
+                await pubsub.subscribe(INVALIDATION_CHANNEL)
+                self.clear()
+                async for message in pubsub.listen():
+                    if message["type"] != "message":
+                        continue
+                    payload = json.loads(message["data"])
+                    if payload["worker"] == self.worker_id:
+                        continue
+                    self.invalidations_received += 1
+                    self.drop(payload["user_id"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Suggest index invalidation listener error: {e}")
+                await asyncio.sleep(1)
+            finally:
+                await pubsub.aclose()
+
+    def clear(self) -> None:
+        """
+        Drops every user index of this worker, keeping the counters.
+        """
+        self._users.clear()
+        self._building.clear()
+        self._terms = 0
+
+    def stats(self) -> dict:
+        """
+        Returns the index counters.
+
+        Returns:
+            dict: Users and terms held, capacity and hit/miss/eviction counters.
+        """
+        return {
+            "users": len(self._users),
+            "terms": self._terms,
+            "max_terms": self.max_terms,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations_received": self.invalidations_received,
+            "redis_errors": self.redis_errors,
+        }
+
+
+suggest_index = SuggestIndex(
+    max_terms=config.SUGGEST_INDEX_MAX_TERMS, ttl=config.SUGGEST_INDEX_TTL
+)
@@ -0,0 +1,79 @@
+"""
+Redis mirror of per-user token versions.
+
+Claims-based access tokens carry the user's ``token_version`` in the ``ver``
+claim. Checking it against this mirror is a single ``GET``; bumping the version
+in the database and here revokes every token issued before. The database column
+stays the source of truth: a missing key means "unknown", never "version 0",
+and so does an unreachable Redis.
+"""
+
+from redis.exceptions import RedisError
+
+from src.conf.config import config
+from src.core.redis_batch import batched
+from src.core.redis_client import redis_client
+
+
+def _redis_key(user_id: int) -> str:
+    return f"user:{user_id}:token_version"
+
+
+async def get_token_version(user_id: int) -> int | None:
+    """
+    Reads the current token version of a user.
+
+    Args:
+        user_id (int): The ID of the user.
+
+    Returns:
+        int | None: The version, or None if it is not mirrored in Redis or
+        Redis is unavailable.
+    """
+    try:
+        version = await batched(redis_client, "get", _redis_key(user_id))
+    except RedisError as e:
+        print(f"Token version lookup failed: {e}")
+        return None
+    return int(version) if version is not None else None
+
+
+async def set_token_version(user_id: int, version: int) -> None:
+    """
+    Mirrors a user's token version into Redis.
+
+    The key lives as long as a refresh token, so every token that can still be
+    used has its version mirrored or is re-checked against the database.
+
+    Args:
+        user_id (int): The ID of the user.
+        version (int): The current version from the database.
+
+    Raises:
+        redis.exceptions.RedisError: If Redis is unavailable. A revocation must
+            not be silently lost, see `mirror_token_version` for read paths.
+    """
+    await batched(
+        redis_client,
+        "set",
+        _redis_key(user_id),
+        version,
+        ex=config.JWT_REFRESH_EXPIRATION_SECONDS,
+    )
+
+
+async def mirror_token_version(user_id: int, version: int) -> None:
+    """
+    Mirrors a version that did not change, ignoring Redis failures.
+
+    Used on read paths (login, DB fallback of a version check), where a
+    missing mirror only costs another database lookup later.
+
+    Args:
+        user_id (int): The ID of the user.
+        version (int): The current version from the database.
+    """
+    try:
+        await set_token_version(user_id, version)
+    except RedisError as e:
+        print(f"Token version mirror failed: {e}")
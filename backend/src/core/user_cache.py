@@ -0,0 +1,261 @@
+"""
+Two-tier cache of authenticated user principals.
+
+1. The first tier is a bounded in-process LRU with a short TTL, so hot users are
+   served from local memory without a Redis round trip.
+2. The second tier is the shared Redis hash ``user:{subject}``.
+
+Writes that change cached user fields publish an invalidation message over Redis
+pub/sub; every worker runs `UserCache.listen_for_invalidations` and evicts its
+local entries when the message arrives.
+
+Redis failures never fail a request: a lookup that cannot reach Redis is a
+miss (the caller falls back to the database) and a fill only updates the
+local tier.
+"""
+
+import asyncio
+import json
+from typing import Iterable
+
+from redis.exceptions import RedisError
+
+from src.conf.config import config
+from src.core.local_cache import LocalTTLCache
+from src.core.redis_batch import batched, pipeline
+from src.core.redis_client import pubsub_client, redis_client
+from src.database.models import UserRole
+from src.schemas import UserPrincipal
+
+
+INVALIDATION_CHANNEL = "user-cache:invalidate"
+
+
+def _redis_key(subject: str) -> str:
+    """
+    Builds the Redis key under which a user principal is cached.
+
+    Args:
+        subject (str): The token subject (username or email).
+
+    Returns:
+        str: The Redis hash key.
+    """
+    return f"user:{subject}"
+
+
+def principal_to_cache(user: UserPrincipal) -> dict:
+    """
+    Serializes a user principal into a flat Redis hash mapping.
+
+    Args:
+        user (UserPrincipal): The principal to serialize.
+
+    Returns:
+        dict: String-only mapping suitable for ``HSET``.
+    """
+    return {
+        "id": str(user.id),
+        "username": user.username,
+        "email": user.email,
+        "role": user.role.value,
+        "avatar": user.avatar or "",
+        "is_verified": "1" if user.is_verified else "0",
+    }
+
+
+def principal_from_cache(cached_user: dict) -> UserPrincipal:
+    """
+    Rebuilds a user principal from a Redis hash without touching the database.
+
+    Args:
+        cached_user (dict): The mapping returned by ``HGETALL``.
+
+    Returns:
+        UserPrincipal: The detached user principal.
+
+    Raises:
+        KeyError: If a required field is missing from the cached hash.
+        ValueError: If a cached field cannot be parsed.
+    """
+    return UserPrincipal(
+        id=int(cached_user["id"]),
+        username=cached_user["username"],
+        email=cached_user["email"],
+        role=UserRole(cached_user["role"]),
+        avatar=cached_user["avatar"] or None,
+        is_verified=cached_user["is_verified"] == "1",
+    )
+
+
+class UserCache:
+    """
+    Two-tier (in-process LRU + Redis) cache of user principals keyed by token subject.
+
+    Attributes:
+        local (LocalTTLCache): The in-process tier.
+        redis_ttl (int): Lifetime of the Redis hash in seconds.
+        redis_hits (int): Local misses served from Redis.
+        redis_misses (int): Lookups that missed both tiers.
+        invalidations_received (int): Pub/sub invalidation messages processed.
+        redis_errors (int): Redis calls that failed or were refused by the breaker.
+    """
+
+    def __init__(self, local_size: int, local_ttl: float, redis_ttl: int):
+        """
+        Initializes the cache.
+
+        Args:
+            local_size (int): Capacity of the in-process tier.
+            local_ttl (float): Lifetime of in-process entries in seconds.
+            redis_ttl (int): Lifetime of Redis entries in seconds.
+        """
+        self.local = LocalTTLCache(local_size, local_ttl)
+        self.redis_ttl = redis_ttl
+        self.redis_hits = 0
+        self.redis_misses = 0
+        self.invalidations_received = 0
+        self.redis_errors = 0
+
+    async def get(self, subject: str) -> UserPrincipal | None:
+        """
+        Looks up a principal in local memory first, then in Redis.
+
+        Args:
+            subject (str): The token subject (username or email).
+
+        Returns:
+            UserPrincipal | None: The cached principal, or None on a miss.
+        """
+        principal = self.local.get(subject)
+        if principal is not None:
+            return principal
+
+        redis_key = _redis_key(subject)
+        try:
+            cached_user = await batched(redis_client, "hgetall", redis_key)
+        except RedisError as e:
+            self.redis_errors += 1
+            print(f"Redis cache unavailable: {e}")
+            return None
+        if cached_user:
+            try:
+                principal = principal_from_cache(cached_user)
+            except (KeyError, ValueError) as e:
+                print(f"Redis cache parse error: {e}")
+                try:
+                    await batched(redis_client, "delete", redis_key)
+                except RedisError:
+                    self.redis_errors += 1
+            else:
+                self.redis_hits += 1
+                self.local.set(subject, principal)
+                return principal
+
+        self.redis_misses += 1
+        return None
+
+    async def set(self, subject: str, principal: UserPrincipal) -> None:
+        """
+        Stores a principal in both tiers.
+
+        The Redis hash and its expiry are written in one transaction, so a
+        cache fill costs a single round trip and never leaves a key without TTL.
+
+        Args:
+            subject (str): The token subject (username or email).
+            principal (UserPrincipal): The principal to cache.
+        """
+        redis_key = _redis_key(subject)
+        try:
+            async with pipeline(redis_client) as pipe:
+                pipe.hset(redis_key, mapping=principal_to_cache(principal))
+                pipe.expire(redis_key, self.redis_ttl)
+        except RedisError as e:
+            self.redis_errors += 1
+            print(f"Redis cache unavailable: {e}")
+        self.local.set(subject, principal)
+
+    def evict_local(self, subjects: Iterable[str]) -> None:
+        """
+        Drops local entries for the given subjects.
+
+        Args:
+            subjects (Iterable[str]): Token subjects to evict.
+        """
+        for subject in subjects:
+            self.local.pop(subject)
+
+    async def invalidate(self, user) -> None:
+        """
+        Drops a user's cached principal everywhere and notifies other workers.
+
+        Must be called after any write that changes cached user fields
+        (role, avatar, verification flag).
+
+        Args:
+            user: Any object exposing ``username`` and ``email`` attributes.
+        """
+        subjects = [user.username, user.email]
+        self.evict_local(subjects)
+        try:
+            async with pipeline(redis_client) as pipe:
+                pipe.delete(*(_redis_key(subject) for subject in subjects))
+                pipe.publish(INVALIDATION_CHANNEL, json.dumps(subjects))
+        except RedisError as e:
+            # Інші воркери побачать зміну після закінчення локального TTL
+            self.redis_errors += 1
+            print(f"User cache invalidation failed: {e}")
+
+    async def listen_for_invalidations(self) -> None:
+        """
+        Consumes invalidation messages and evicts matching local entries.
+
+        Runs until cancelled. After a (re)subscription the whole local tier is
+        cleared, because messages published while disconnected are lost.
+        """
+        while True:
+            pubsub = pubsub_client.pubsub()
+            try:
+                await pubsub.subscribe(INVALIDATION_CHANNEL)
+                self.local.clear()
+                async for message in pubsub.listen():
+                    if message["type"] != "message":
+                        continue
+                    self.invalidations_received += 1
+                    self.evict_local(json.loads(message["data"]))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"User cache invalidation listener error: {e}")
+                await asyncio.sleep(1)
+            finally:
+                await pubsub.aclose()
+
+    def clear(self) -> None:
+        """
+        Drops every entry of the local tier.
+        """
+        self.local.clear()
+
+    def stats(self) -> dict:
+        """
+        Returns counters for both tiers.
+
+        Returns:
+            dict: Local tier stats plus Redis hit/miss and invalidation counters.
+        """
+        return {
+            "local": self.local.stats(),
+            "redis_hits": self.redis_hits,
+            "redis_misses": self.redis_misses,
+            "invalidations_received": self.invalidations_received,
+            "redis_errors": self.redis_errors,
+        }
+
+
+user_cache = UserCache(
+    local_size=config.USER_CACHE_LOCAL_SIZE,
+    local_ttl=config.USER_CACHE_LOCAL_TTL,
+    redis_ttl=config.USER_CACHE_TTL,
+)
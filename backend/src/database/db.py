@@ -1,13 +1,102 @@
 import contextlib
+import itertools
+import time
+from collections import deque
+from typing import Iterable
 
-from sqlalchemy.exc import SQLAlchemyError
+from fastapi import Request
+from sqlalchemy import event, make_url
+from sqlalchemy.exc import SQLAlchemyError, TimeoutError as PoolTimeoutError
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
+    AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from src.conf.config import config
+from src.core.jwt_cache import bearer_subject
+from src.core.metrics import percentiles_ms
+from src.core.recent_writes import recent_writes
+
+
+class PoolMetrics:
+    """
+    Checkout counters of a connection pool.
+
+    Attributes:
+        acquired (int): Connections handed out.
+        timeouts (int): Checkouts that gave up after ``pool_timeout``.
+    """
+
+    def __init__(self, latency_window: int = 1024):
+        """
+        Initializes empty counters.
+
+        Args:
+            latency_window (int): Number of recent checkouts kept for percentiles.
+        """
+        self.acquired = 0
+        self.timeouts = 0
+        self.wait_times: deque[float] = deque(maxlen=latency_window)
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """
+    The default async queue pool, plus checkout wait time and timeout counters.
+
+    Attributes:
+        metrics (PoolMetrics): Counters that survive pool recreation.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except PoolTimeoutError:
+            self.metrics.timeouts += 1
+            raise
+        finally:
+            self.metrics.wait_times.append(time.perf_counter() - start)
+        self.metrics.acquired += 1
+        return connection
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+class _TrackedSession(Session):
+    # Позначає сесії, що взяли з'єднання або щось записали
+    pass
+
+
+@event.listens_for(_TrackedSession, "after_begin")
+def _flag_checkout(session, transaction, connection):
+    session.info["checked_out"] = True
+
+
+@event.listens_for(_TrackedSession, "after_flush")
+def _flag_flush(session, flush_context):
+    session.info["wrote"] = True
+
+
+@event.listens_for(_TrackedSession, "do_orm_execute")
+def _flag_dml(orm_execute_state):
+    if (
+        orm_execute_state.is_insert
+        or orm_execute_state.is_update
+        or orm_execute_state.is_delete
+    ):
+        orm_execute_state.session.info["wrote"] = True
+
 
 class DatabaseSessionManager:
     """
@@ -15,32 +104,107 @@ class DatabaseSessionManager:
 
     This class creates an async engine and session factory, and provides an
     asynchronous context manager to handle sessions with proper commit/rollback/close logic.
+    Optional read replicas get their own engines; read-only sessions are spread
+    over them round-robin or to the replica with the fewest busy connections.
 
     Attributes:
         _engine (AsyncEngine | None): SQLAlchemy asynchronous engine instance.
         _session_maker (async_sessionmaker): Factory for creating async database sessions.
+        _replicas (list[tuple[AsyncEngine, async_sessionmaker]]): Read replica
+            engines and their session factories.
+        replica_selection (str): ``"round_robin"`` or ``"least_busy"``.
     """
 
-    def __init__(self, url: str):
+    def __init__(
+        self,
+        url: str,
+        pool_size: int = 5,
+        max_overflow: int = 10,
+        pool_timeout: float = 30,
+        pool_recycle: int = -1,
+        pool_pre_ping: bool = False,
+        statement_cache_size: int = 100,
+        replica_urls: Iterable[str] = (),
+        replica_selection: str = "round_robin",
+    ):
         """
         Initializes the database session manager.
 
         Args:
             url (str): The database connection URL.
+            pool_size (int): Connections kept open in the pool.
+            max_overflow (int): Extra connections allowed above ``pool_size``.
+            pool_timeout (float): Seconds to wait for a free connection.
+            pool_recycle (int): Seconds after which a connection is replaced; -1 never.
+            pool_pre_ping (bool): Whether to test connections on checkout.
+            statement_cache_size (int): Prepared statements cached per asyncpg
+                connection; 0 disables them (needed behind pgbouncer).
+            replica_urls (Iterable[str]): Connection URLs of read replicas.
+            replica_selection (str): ``"round_robin"`` or ``"least_busy"``.
+
+        Raises:
+            ValueError: If ``replica_selection`` is not supported.
         """
-        self._engine: AsyncEngine | None = create_async_engine(url)
-        self._session_maker: async_sessionmaker = async_sessionmaker(
-            autoflush=False, autocommit=False, bind=self._engine
-        )
+        if replica_selection not in ("round_robin", "least_busy"):
+            raise ValueError(f"Unsupported replica selection: {replica_selection}")
+        engine_options = {
+            "poolclass": InstrumentedQueuePool,
+            "pool_size": pool_size,
+            "max_overflow": max_overflow,
+            "pool_timeout": pool_timeout,
+            "pool_recycle": pool_recycle,
+            "pool_pre_ping": pool_pre_ping,
+        }
+
+        def build(url: str) -> tuple[AsyncEngine, async_sessionmaker]:
+            connect_args = {}
+            if make_url(url).get_driver_name() == "asyncpg":
+                connect_args["prepared_statement_cache_size"] = statement_cache_size
+            engine = create_async_engine(
+                url, connect_args=connect_args, **engine_options
+            )
+            # Об'єкти лишаються придатними після commit без повторного SELECT
+            return engine, async_sessionmaker(
+                autoflush=False,
+                autocommit=False,
+                expire_on_commit=False,
+                bind=engine,
+                sync_session_class=_TrackedSession,
+            )
+
+        self._engine, self._session_maker = build(url)
+        self._replicas = [build(replica_url) for replica_url in replica_urls]
+        self.replica_selection = replica_selection
+        self._round_robin = itertools.count()
+
+    @property
+    def has_replicas(self) -> bool:
+        """
+        bool: Whether read replicas are configured.
+        """
+        return bool(self._replicas)
+
+    def _pick_replica(self) -> async_sessionmaker:
+        if self.replica_selection == "least_busy":
+            _, session_maker = min(
+                self._replicas, key=lambda replica: replica[0].pool.checkedout()
+            )
+            return session_maker
+        index = next(self._round_robin) % len(self._replicas)
+        return self._replicas[index][1]
 
     @contextlib.asynccontextmanager
-    async def session(self):
+    async def session(self, read_only: bool = False):
         """
         Provides an asynchronous context-managed session.
 
         Ensures that the session is properly committed or rolled back depending
         on whether an exception is raised during use.
 
+        Args:
+            read_only (bool): Use a read replica if any is configured. The
+                session must not write; replicas may lag behind the primary.
+
         Yields:
             AsyncSession: A SQLAlchemy asynchronous session.
 
@@ -49,7 +213,10 @@ class DatabaseSessionManager:
         """
         if self._session_maker is None:
             raise Exception("Database session is not initialized")
-        session = self._session_maker()
+        if read_only and self._replicas:
+            session = self._pick_replica()()
+        else:
+            session = self._session_maker()
         try:
             yield session
         except SQLAlchemyError:
@@ -58,16 +225,169 @@ class DatabaseSessionManager:
         finally:
             await session.close()
 
+    def pool_stats(self) -> dict:
+        """
+        Returns the live state of the connection pools.
+
+        Returns:
+            dict: Primary pool stats plus a list of replica pool stats: pool
+            size, checked-out connections, overflow in use, checkout counters
+            and p50/p99 wait time to acquire in ms.
+        """
+        return {
+            **_pool_stats(self._engine.pool),
+            "replicas": [_pool_stats(engine.pool) for engine, _ in self._replicas],
+        }
+
 
-sessionmanager = DatabaseSessionManager(config.DB_URL)
+class RequestSessionMetrics:
+    """
+    Counts how requests used their database sessions.
 
+    Sessions take a pooled connection lazily, on the first statement, so a
+    request that is answered from caches or rejected early never holds one.
 
-async def get_db():
+    Attributes:
+        requests (int): Finished requests that had a database session.
+        without_connection (int): Of those, requests that never checked out
+            a connection.
+    """
+
+    def __init__(self):
+        self.requests = 0
+        self.without_connection = 0
+
+    def record(self, checked_out: bool) -> None:
+        """
+        Counts one finished request.
+
+        Args:
+            checked_out (bool): Whether any of its sessions took a connection.
+        """
+        self.requests += 1
+        if not checked_out:
+            self.without_connection += 1
+
+    def stats(self) -> dict:
+        """
+        Returns the counters.
+
+        Returns:
+            dict: Requests, requests without a checkout and their share.
+        """
+        return {
+            "requests": self.requests,
+            "without_connection": self.without_connection,
+            "without_connection_share": (
+                self.without_connection / self.requests if self.requests else 0.0
+            ),
+        }
+
+
+request_metrics = RequestSessionMetrics()
+
+
+def _pool_stats(pool) -> dict:
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow_in_use": max(pool.overflow(), 0),
+        "max_overflow": pool._max_overflow,
+        "acquired": pool.metrics.acquired,
+        "timeouts": pool.metrics.timeouts,
+        "wait_ms": percentiles_ms(pool.metrics.wait_times),
+    }
+
+
+sessionmanager = DatabaseSessionManager(
+    config.DB_URL,
+    pool_size=config.DB_POOL_SIZE,
+    max_overflow=config.DB_MAX_OVERFLOW,
+    pool_timeout=config.DB_POOL_TIMEOUT,
+    pool_recycle=config.DB_POOL_RECYCLE,
+    pool_pre_ping=config.DB_POOL_PRE_PING,
+    statement_cache_size=config.DB_STATEMENT_CACHE_SIZE,
+    replica_urls=config.DB_REPLICA_URLS,
+    replica_selection=config.DB_REPLICA_SELECTION,
+)
+
+
+async def release_connection(session: AsyncSession) -> None:
+    """
+    Returns the session's connection to the pool if it holds only reads.
+
+    Ends the read transaction; the session takes a connection again on the next
+    statement. Loaded objects are expired, so call this only once they are no
+    longer needed. Sessions with pending changes are left untouched.
+
+    Args:
+        session (AsyncSession): The session to release.
+    """
+    if session.in_transaction() and not (
+        session.new or session.dirty or session.deleted
+    ):
+        await session.rollback()
+
+
+@contextlib.asynccontextmanager
+async def _request_session(request: Request, read_only: bool = False):
+    # Кілька сесій одного запиту рахуються як один запит
+    state = request.state
+    state.db_sessions = getattr(state, "db_sessions", 0) + 1
+    session = None
+    try:
+        async with sessionmanager.session(read_only=read_only) as session:
+            yield session
+    finally:
+        state.db_checked_out = getattr(state, "db_checked_out", False) or bool(
+            session is not None and session.info.get("checked_out")
+        )
+        state.db_sessions -= 1
+        if state.db_sessions == 0:
+            request_metrics.record(state.db_checked_out)
+
+
+async def get_db(request: Request):
     """
     Dependency function that provides an asynchronous database session.
 
+    The session checks out a pooled connection only when its first statement
+    runs. If the session wrote anything, the user is marked as a recent writer,
+    so their reads stick to the primary for the read-your-writes window.
+
+    Args:
+        request (Request): The incoming request, used to identify the writer.
+
     Yields:
         AsyncSession: A SQLAlchemy asynchronous session for use in route handlers.
     """
-    async with sessionmanager.session() as session:
+    async with _request_session(request) as session:
+        yield session
+        wrote = session.info.get("wrote", False)
+    if wrote and sessionmanager.has_replicas:
+        subject = bearer_subject(request)
+        if subject:
+            await recent_writes.mark(subject)
+
+
+async def get_read_db(request: Request):
+    """
+    Dependency function that provides a session for read-only handlers.
+
+    Reads go to a replica, unless the user wrote within the read-your-writes
+    window; then they go to the primary, so the user sees their own writes.
+
+    Args:
+        request (Request): The incoming request, used to identify the reader.
+
+    Yields:
+        AsyncSession: A read-only SQLAlchemy asynchronous session.
+    """
+    read_only = sessionmanager.has_replicas
+    if read_only:
+        subject = bearer_subject(request)
+        if subject and await recent_writes.is_recent(subject):
+            read_only = False
+    async with _request_session(request, read_only=read_only) as session:
         yield session
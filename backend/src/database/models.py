@@ -1,6 +1,15 @@
+from datetime import date
 from enum import Enum
-from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
+from sqlalchemy.orm import (
+    DeclarativeBase,
+    Mapped,
+    mapped_column,
+    relationship,
+    validates,
+)
 from sqlalchemy import (
+    Computed,
+    SmallInteger,
     String,
     Date,
     Text,
@@ -8,8 +17,42 @@ from sqlalchemy import (
     func,
     ForeignKey,
     Boolean,
+    Index,
+    Integer,
     Enum as SqlEnum,
 )
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.schema import CreateColumn
+
+# Згенерована колонка не може посилатися на іншу, тож вираз повторюється
+SEARCH_TEXT = (
+    "lower(coalesce(first_name, '') || ' ' || coalesce(last_name, '') || ' ' || "
+    "coalesce(email, '') || ' ' || coalesce(phone_number, '') || ' ' || "
+    "coalesce(note, ''))"
+)
+
+
+def month_day(value: date) -> int:
+    """
+    Encodes the month and day of a date as ``month * 100 + day``.
+
+    Args:
+        value (date): The date.
+
+    Returns:
+        int: E.g. 1231 for December 31st; orders like the calendar within a year.
+    """
+    return value.month * 100 + value.day
+
+
+@compiles(CreateColumn)
+def _create_column(element, compiler, **kw):
+    column = element.element
+    # Інші СУБД (SQLite у тестах) не мають tsvector: там це звичайна колонка з NULL
+    if column.info.get("postgresql_computed") and compiler.dialect.name != "postgresql":
+        return f"{compiler.preparer.format_column(column)} TEXT"
+    return compiler.visit_create_column(element, **kw)
 
 
 class Base(DeclarativeBase):
@@ -46,7 +89,13 @@ class Contact(Base):
         email (str): Email address of the contact.
         phone_number (str): Phone number of the contact.
         birth_date (Date): Birth date of the contact.
+        birthday_md (int): Month and day of the birth date, see `month_day`; kept
+            in sync with ``birth_date`` so upcoming birthdays are index range scans.
         note (str): Optional notes about the contact.
+        search_text (str): Lower-cased names, email, phone and note, generated by
+            PostgreSQL for trigram search; deferred, and NULL in other databases.
+        search_vector (TSVECTOR): Full-text vector of ``search_text``, generated by
+            PostgreSQL; deferred, and NULL in other databases.
         created_at (DateTime): Timestamp when the contact was created.
         updated_at (DateTime): Timestamp when the contact was last updated.
         user_id (int): Foreign key to the associated user (nullable).
@@ -61,16 +110,77 @@ class Contact(Base):
     email: Mapped[str] = mapped_column(String(255), unique=True)
     phone_number: Mapped[str] = mapped_column(String(20), nullable=False)
     birth_date: Mapped[Date] = mapped_column(Date, nullable=False)
+    birthday_md: Mapped[int] = mapped_column(SmallInteger, nullable=False)
     note: Mapped[str] = mapped_column(Text, nullable=True)
-    created_at: Mapped[DateTime] = mapped_column(DateTime, default=func.now())
+    # Відкладені: звичайні SELECT не тягнуть tsvector
+    search_text: Mapped[str] = mapped_column(
+        Text,
+        Computed(SEARCH_TEXT, persisted=True),
+        nullable=True,
+        deferred=True,
+        info={"postgresql_computed": True},
+    )
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR,
+        Computed(f"to_tsvector('simple'::regconfig, {SEARCH_TEXT})", persisted=True),
+        nullable=True,
+        deferred=True,
+        info={"postgresql_computed": True},
+    )
+    created_at: Mapped[DateTime] = mapped_column(
+        DateTime, default=func.now(), nullable=False
+    )
     updated_at: Mapped[DateTime] = mapped_column(
-        DateTime, default=func.now(), onupdate=func.now()
+        DateTime, default=func.now(), onupdate=func.now(), nullable=False
     )
     user_id: Mapped[int] = mapped_column(
         ForeignKey("users.id", ondelete="CASCADE"), nullable=True
     )
     user = relationship("User", backref="contacts")
 
+    # Кожне сортування списку контактів читається одним проходом індексу
+    __table_args__ = (
+        Index("ix_contacts_user_id_id", "user_id", "id"),
+        Index("ix_contacts_user_last_name", "user_id", "last_name", "id"),
+        Index("ix_contacts_user_first_name", "user_id", "first_name", "id"),
+        Index("ix_contacts_user_created_at", "user_id", "created_at", "id"),
+        Index("ix_contacts_user_updated_at", "user_id", "updated_at", "id"),
+        Index("ix_contacts_user_birth_date", "user_id", "birth_date", "id"),
+        Index("ix_contacts_user_birthday_md", "user_id", "birthday_md", "id"),
+        # Пошук за підрядком (ILIKE '%term%') у PostgreSQL
+        *(
+            Index(
+                f"ix_contacts_{column}_trgm",
+                column,
+                postgresql_using="gin",
+                postgresql_ops={column: "gin_trgm_ops"},
+            )
+            for column in ("first_name", "last_name", "email")
+        ),
+        # Ранжований пошук (q=) за згенерованими колонками; user_id у тому ж
+        # GIN-індексі (btree_gin), тож чужі контакти не читаються з таблиці
+        Index(
+            "ix_contacts_user_search_vector",
+            "user_id",
+            "search_vector",
+            postgresql_using="gin",
+        ).ddl_if(dialect="postgresql"),
+        Index(
+            "ix_contacts_user_search_text_trgm",
+            "user_id",
+            "search_text",
+            postgresql_using="gin",
+            postgresql_ops={"search_text": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+    )
+
+    @validates("birth_date")
+    def _sync_birthday_md(self, key, value):
+        # ORM-записи; Core INSERT/UPDATE у репозиторії рахують колонку самі
+        if value is not None:
+            self.birthday_md = month_day(value)
+        return value
+
 
 class User(Base):
     """
@@ -85,6 +195,8 @@ class User(Base):
         avatar (str): URL to the user's avatar image (optional).
         is_verified (bool): Flag indicating if the user's email is verified.
         role (UserRole): Role of the user (either "user" or "admin").
+        token_version (int): Version embedded in claims-based access tokens;
+            bumping it revokes every token issued before.
     """
 
     __tablename__ = "users"
@@ -99,3 +211,6 @@ class User(Base):
     role: Mapped[UserRole] = mapped_column(
         SqlEnum(UserRole), default=UserRole.USER, nullable=False
     )
+    token_version: Mapped[int] = mapped_column(
+        Integer, default=0, server_default="0", nullable=False
+    )
@@ -1,12 +1,303 @@
+import calendar
+from functools import lru_cache
 from typing import List, Optional
-from sqlalchemy.sql import or_, and_, extract
+from sqlalchemy.sql import or_, and_, case, func
 
-from sqlalchemy import select
+from sqlalchemy import Float, String, bindparam, delete, insert, select, tuple_, update
+from sqlalchemy.dialects import postgresql as pg_dialect, sqlite as sqlite_dialect
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.database.models import Contact, User
-from src.schemas import ContactCreate
-from datetime import date
+from src.database.models import Contact, User, month_day
+from src.schemas import ContactCreate, ContactUpdate
+from datetime import date, datetime
+
+# Запити будуються один раз: SQLAlchemy запам'ятовує ключ кешу на об'єкті,
+# тож на виклик лишається тільки підстановка параметрів
+_OWNED = Contact.user_id == bindparam("user_id")
+
+# Стабільні ключі сортування для пагінації; id робить ключ унікальним
+_BY_ID = (Contact.id,)
+_BY_BIRTHDAY = (Contact.birthday_md, Contact.id)
+# Якщо вікно переходить через Новий рік, січневі дні народження йдуть після грудневих
+_BIRTHDAY_NEXT_YEAR = case((Contact.birthday_md < bindparam("start_md"), 1), else_=0)
+_BY_WRAPPED_BIRTHDAY = (_BIRTHDAY_NEXT_YEAR, *_BY_BIRTHDAY)
+
+# Сортування списку контактів; кожне має індекс (user_id, колонка, id)
+CONTACT_SORTS = {
+    "id": None,
+    "last_name": Contact.last_name,
+    "first_name": Contact.first_name,
+    "created_at": Contact.created_at,
+    "updated_at": Contact.updated_at,
+    "birth_date": Contact.birth_date,
+}
+
+
+def _paginate(stmt, order: tuple, keyset: bool, descending: bool = False):
+    # Keyset: сторінка починається строго після ключа останнього рядка
+    # попередньої, тож глибокі сторінки не сканують пропущені рядки
+    if descending:
+        stmt = stmt.order_by(*(column.desc() for column in order))
+    else:
+        stmt = stmt.order_by(*order)
+    if keyset:
+        after = [bindparam(f"after_{i}") for i in range(len(order))]
+        if len(order) == 1:
+            left, right = order[0], after[0]
+        else:
+            left, right = tuple_(*order), tuple_(*after)
+        stmt = stmt.where(left < right if descending else left > right)
+    else:
+        stmt = stmt.offset(bindparam("skip"))
+    return stmt.limit(bindparam("limit"))
+
+
+def _page_params(skip: int, limit: int, after: list | None) -> dict:
+    if after is None:
+        return {"skip": skip, "limit": limit}
+    return {"limit": limit, **{f"after_{i}": value for i, value in enumerate(after)}}
+
+
+def contact_sort_key(contact: Contact, sort: str = "id") -> list:
+    """
+    Returns the keyset pagination key of a contact in listings and search.
+
+    Args:
+        contact (Contact): A row of the page.
+        sort (str): One of `CONTACT_SORTS`.
+
+    Returns:
+        list: JSON-serializable values a cursor stores to resume after this row.
+    """
+    if CONTACT_SORTS[sort] is None:
+        return [contact.id]
+    value = getattr(contact, sort)
+    if isinstance(value, (date, datetime)):
+        value = value.isoformat()
+    return [value, contact.id]
+
+
+def parse_contact_sort_key(key: list, sort: str = "id") -> list:
+    """
+    Restores the typed sort key stored by `contact_sort_key`.
+
+    Args:
+        key (list): The key decoded from a cursor.
+        sort (str): One of `CONTACT_SORTS`.
+
+    Returns:
+        list: Values to bind in the keyset condition.
+
+    Raises:
+        ValueError: If the key does not match the sort.
+    """
+    column = CONTACT_SORTS[sort]
+    if column is None:
+        if len(key) != 1 or type(key[0]) is not int:
+            raise ValueError("Invalid sort key")
+        return key
+    if len(key) != 2 or type(key[1]) is not int or not isinstance(key[0], str):
+        raise ValueError("Invalid sort key")
+    value = key[0]
+    if sort == "birth_date":
+        value = date.fromisoformat(value)
+    elif sort in ("created_at", "updated_at"):
+        value = datetime.fromisoformat(value)
+    return [value, key[1]]
+
+
+def parse_ranked_sort_key(key: list) -> list:
+    """
+    Validates the ``[score, id]`` key of a ranked search page.
+
+    Args:
+        key (list): The key decoded from a cursor.
+
+    Returns:
+        list: Values to bind in the keyset condition.
+
+    Raises:
+        ValueError: If the key is not a (score, id) pair.
+    """
+    if (
+        len(key) != 2
+        or type(key[0]) not in (int, float)
+        or type(key[1]) is not int
+    ):
+        raise ValueError("Invalid sort key")
+    return [float(key[0]), key[1]]
+
+
+def birthday_sort_key(contact: Contact) -> list:
+    """
+    Returns the keyset pagination key of a contact in upcoming birthdays.
+
+    Args:
+        contact (Contact): A row of the page.
+
+    Returns:
+        list: Month and day of the birth date (``birthday_md``) and the contact ID.
+    """
+    return [contact.birthday_md, contact.id]
+
+
+def parse_birthday_sort_key(key: list) -> list:
+    """
+    Validates the sort key stored by `birthday_sort_key`.
+
+    Args:
+        key (list): The key decoded from a cursor.
+
+    Returns:
+        list: Values to bind in the keyset condition.
+
+    Raises:
+        ValueError: If the key is not a (month and day, id) pair.
+    """
+    if (
+        len(key) != 2
+        or not all(type(value) is int for value in key)
+        or not 101 <= key[0] <= 1231
+    ):
+        raise ValueError("Invalid sort key")
+    return key
+
+
+@lru_cache(maxsize=None)
+def _contacts_page_stmt(sort: str, descending: bool, keyset: bool):
+    column = CONTACT_SORTS[sort]
+    order = _BY_ID if column is None else (column, Contact.id)
+    return _paginate(select(Contact).where(_OWNED), order, keyset, descending)
+
+
+_CONTACT_BY_ID = select(Contact).where(Contact.id == bindparam("contact_id"), _OWNED)
+
+_CONTACTS_BY_IDS = select(Contact).where(
+    Contact.id.in_(bindparam("contact_ids", expanding=True)), _OWNED
+)
+
+# Лише поля підказок: індекс не тримає телефонів і нотаток
+_SUGGEST_ENTRIES = select(
+    Contact.id, Contact.first_name, Contact.last_name, Contact.email
+).where(_OWNED)
+
+
+def _with_birthday_md(values: dict) -> dict:
+    # Core INSERT/UPDATE оминає валідатор моделі, тож колонку рахуємо тут
+    if values.get("birth_date") is not None:
+        values = {**values, "birthday_md": month_day(values["birth_date"])}
+    return values
+
+
+@lru_cache(maxsize=None)
+def _import_stmt(postgresql: bool):
+    # Рядок із зайнятим email пропускається, а не обриває всю пачку
+    dialect = pg_dialect if postgresql else sqlite_dialect
+    return (
+        dialect.insert(Contact.__table__)
+        .on_conflict_do_nothing(index_elements=[Contact.email])
+        .returning(Contact.id, Contact.email, Contact.birth_date)
+    )
+
+
+def _contains_pattern(value: str) -> str:
+    # Символи шаблону з пошукового рядка шукаються буквально
+    escaped = value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+@lru_cache(maxsize=None)
+def _search_stmt(first_name: bool, last_name: bool, email: bool, keyset: bool):
+    # Один запит на кожну комбінацію заданих фільтрів
+    # ILIKE '%term%' обслуговують trigram GIN-індекси
+    stmt = select(Contact)
+    if first_name:
+        stmt = stmt.filter(
+            Contact.first_name.ilike(bindparam("first_name"), escape="\\")
+        )
+    if last_name:
+        stmt = stmt.filter(
+            Contact.last_name.ilike(bindparam("last_name"), escape="\\")
+        )
+    if email:
+        stmt = stmt.filter(Contact.email.ilike(bindparam("email"), escape="\\"))
+    return _paginate(stmt.filter(_OWNED), _BY_ID, keyset)
+
+
+def _birthday_window(today: date, next_date: date) -> tuple[int, int]:
+    start_md, end_md = month_day(today), month_day(next_date)
+    # У невисокосний рік 29 лютого святкують 28-го
+    if end_md == 228 and not calendar.isleap(next_date.year):
+        end_md = 229
+    return start_md, end_md
+
+
+def _birthday_in_range(wraps_year: bool):
+    # Діапазони по індексу (user_id, birthday_md, id): один у межах року,
+    # два (до кінця року і з його початку), коли вікно переходить через Новий рік
+    after_start = Contact.birthday_md >= bindparam("start_md")
+    before_end = Contact.birthday_md <= bindparam("end_md")
+    if wraps_year:
+        return or_(after_start, before_end)
+    return and_(after_start, before_end)
+
+
+@lru_cache(maxsize=None)
+def _birthdays_stmt(wraps_year: bool, keyset: bool):
+    order = _BY_WRAPPED_BIRTHDAY if wraps_year else _BY_BIRTHDAY
+    stmt = select(Contact).filter(_OWNED, _birthday_in_range(wraps_year))
+    return _paginate(stmt, order, keyset)
+
+
+@lru_cache(maxsize=None)
+def _birthdays_batch_stmt(wraps_year: bool):
+    # Усі користувачі разом, пачками за id
+    return (
+        select(Contact.id, Contact.user_id, Contact.birth_date)
+        .where(
+            Contact.user_id.is_not(None),
+            _birthday_in_range(wraps_year),
+            Contact.id > bindparam("after_id"),
+        )
+        .order_by(Contact.id)
+        .limit(bindparam("limit"))
+    )
+
+
+_SEARCH_FIELDS = (
+    Contact.first_name,
+    Contact.last_name,
+    Contact.email,
+    Contact.phone_number,
+    Contact.note,
+)
+
+
+@lru_cache(maxsize=None)
+def _ranked_search_stmt(postgresql: bool, keyset: bool):
+    if postgresql:
+        # Повнотекстовий збіг або схожість слова за триграмами (друкарські помилки)
+        query = func.websearch_to_tsquery("simple", bindparam("q", type_=String))
+        matches = or_(
+            Contact.search_vector.op("@@")(query),
+            bindparam("q", type_=String).op("<%")(Contact.search_text),
+        )
+        score = func.greatest(
+            func.ts_rank_cd(Contact.search_vector, query),
+            func.word_similarity(bindparam("q", type_=String), Contact.search_text),
+        )
+    else:
+        # Інші СУБД (SQLite у тестах): підрядок у будь-якому полі,
+        # ранг — кількість полів зі збігом
+        found = [
+            field.ilike(bindparam("pattern"), escape="\\") for field in _SEARCH_FIELDS
+        ]
+        matches = or_(*found)
+        score = sum(case((condition, 1), else_=0) for condition in found)
+    score = score.cast(Float).label("score")
+    stmt = select(Contact, score).where(_OWNED, matches)
+    return _paginate(stmt, (score, Contact.id), keyset, descending=True)
 
 
 class ContactRepository:
@@ -19,20 +310,36 @@ class ContactRepository:
         """
         self.db = session
 
-    async def get_contacts(self, skip: int, limit: int, user: User) -> List[Contact]:
+    async def get_contacts(
+        self,
+        skip: int,
+        limit: int,
+        user: User,
+        after: list | None = None,
+        sort: str = "id",
+        descending: bool = False,
+    ) -> List[Contact]:
         """
-        Retrieves a paginated list of contacts for the given user.
+        Retrieves a paginated, sorted list of contacts for the given user.
+
+        Ties are broken by ID, so the order is stable across pages.
 
         Args:
-            skip (int): Number of records to skip.
+            skip (int): Number of records to skip; ignored when ``after`` is set.
             limit (int): Maximum number of contacts to return.
             user (User): The user whose contacts are being queried.
+            after (list | None): Typed sort key of the last row of the previous
+                page, see `parse_contact_sort_key`.
+            sort (str): One of `CONTACT_SORTS`.
+            descending (bool): Sort in descending order.
 
         Returns:
             List[Contact]: A list of Contact objects.
         """
-        stmt = select(Contact).filter_by(user=user).offset(skip).limit(limit)
-        contacts = await self.db.execute(stmt)
+        contacts = await self.db.execute(
+            _contacts_page_stmt(sort, descending, after is not None),
+            {"user_id": user.id, **_page_params(skip, limit, after)},
+        )
         return contacts.scalars().all()
 
     async def get_contact_by_id(self, contact_id: int, user: User) -> Contact | None:
@@ -46,14 +353,17 @@ class ContactRepository:
         Returns:
             Contact | None: A Contact object if found, or None if not found.
         """
-        stmt = select(Contact).filter_by(id=contact_id, user=user)
-        contact = await self.db.execute(stmt)
+        contact = await self.db.execute(
+            _CONTACT_BY_ID, {"contact_id": contact_id, "user_id": user.id}
+        )
         return contact.scalar_one_or_none()
 
     async def create_contact(self, body: ContactCreate, user: User) -> Contact:
         """
         Creates a new contact for the given user.
 
+        The row comes back from ``INSERT ... RETURNING``, so no reload is needed.
+
         Args:
             body (ContactCreate): Data for the new contact.
             user (User): The user who owns the new contact.
@@ -61,12 +371,41 @@ class ContactRepository:
         Returns:
             Contact: The created Contact object.
         """
-        contact = Contact(**body.model_dump(exclude_unset=True), user=user)
-        # await
-        self.db.add(contact)
+        values = _with_birthday_md(body.model_dump(exclude_unset=True))
+        stmt = insert(Contact).values(**values, user_id=user.id).returning(Contact)
+        contact = (await self.db.execute(stmt)).scalar_one()
         await self.db.commit()
-        await self.db.refresh(contact)
-        return await self.get_contact_by_id(contact.id, user)
+        return contact
+
+    async def import_contacts(self, rows: list[dict], user: User) -> list:
+        """
+        Inserts a batch of contacts for the given user in one round trip.
+
+        The rows go out as a multi-row ``INSERT ... ON CONFLICT DO NOTHING
+        RETURNING``; a row whose email already exists is skipped, so the rest
+        of the batch is still written.
+
+        Args:
+            rows (list[dict]): Validated `ContactCreate` fields of each contact.
+            user (User): The user who owns the new contacts.
+
+        Returns:
+            list: ``(id, email, birth_date)`` rows of the inserted contacts.
+
+        Raises:
+            SQLAlchemyError: If the batch cannot be written; it is rolled back,
+                earlier batches stay committed.
+        """
+        postgresql = self.db.bind.dialect.name == "postgresql"
+        values = [{**_with_birthday_md(row), "user_id": user.id} for row in rows]
+        try:
+            result = await self.db.execute(_import_stmt(postgresql), values)
+            inserted = result.all()
+            await self.db.commit()
+        except SQLAlchemyError:
+            await self.db.rollback()
+            raise
+        return inserted
 
     async def update_contact(
         self, contact_id: int, body: ContactCreate, user: User
@@ -74,6 +413,8 @@ class ContactRepository:
         """
         Updates an existing contact by ID for the given user.
 
+        A single ``UPDATE ... RETURNING`` checks ownership and returns the row.
+
         Args:
             contact_id (int): ID of the contact to update.
             body (ContactCreate): Updated contact data.
@@ -82,22 +423,51 @@ class ContactRepository:
         Returns:
             Contact | None: The updated Contact object if found, or None if not found.
         """
-        contact = await self.get_contact_by_id(contact_id, user)
+        return await self._update(contact_id, body.model_dump(), user)
+
+    async def patch_contact(
+        self, contact_id: int, body: ContactUpdate, user: User
+    ) -> Contact | None:
+        """
+        Partially updates a contact by ID for the given user.
+
+        The UPDATE covers only the fields present in ``body``; with no fields
+        the contact is just read.
+
+        Args:
+            contact_id (int): ID of the contact to update.
+            body (ContactUpdate): The fields to change.
+            user (User): The user who owns the contact.
+
+        Returns:
+            Contact | None: The updated Contact object if found, or None if not found.
+        """
+        values = body.model_dump(exclude_unset=True)
+        if not values:
+            return await self.get_contact_by_id(contact_id, user)
+        return await self._update(contact_id, values, user)
+
+    async def _update(
+        self, contact_id: int, values: dict, user: User
+    ) -> Contact | None:
+        stmt = (
+            update(Contact)
+            .where(Contact.id == contact_id, Contact.user_id == user.id)
+            .values(**_with_birthday_md(values))
+            .returning(Contact)
+            .execution_options(populate_existing=True)
+        )
+        contact = (await self.db.execute(stmt)).scalar_one_or_none()
         if contact:
-            contact.first_name = body.first_name
-            contact.last_name = body.last_name
-            contact.email = body.email
-            contact.phone_number = body.phone_number
-            contact.birth_date = body.birth_date
-            contact.note = body.note
             await self.db.commit()
-            await self.db.refresh(contact)
         return contact
 
     async def remove_contact(self, contact_id: int, user: User) -> Contact | None:
         """
         Deletes a contact by ID for the given user.
 
+        A single ``DELETE ... RETURNING`` checks ownership and returns the row.
+
         Args:
             contact_id (int): ID of the contact to delete.
             user (User): The user who owns the contact.
@@ -105,9 +475,13 @@ class ContactRepository:
         Returns:
             Contact | None: The deleted Contact object if found, or None if not found.
         """
-        contact = await self.get_contact_by_id(contact_id, user)
+        stmt = (
+            delete(Contact)
+            .where(Contact.id == contact_id, Contact.user_id == user.id)
+            .returning(Contact)
+        )
+        contact = (await self.db.execute(stmt)).scalar_one_or_none()
         if contact:
-            await self.db.delete(contact)
             await self.db.commit()
         return contact
 
@@ -124,10 +498,24 @@ class ContactRepository:
         Returns:
             list[Contact]: A list of Contact objects.
         """
-        stmt = select(Contact).where(Contact.id.in_(contact_ids), Contact.user == user)
-        result = await self.db.execute(stmt)
+        result = await self.db.execute(
+            _CONTACTS_BY_IDS, {"contact_ids": list(contact_ids), "user_id": user.id}
+        )
         return result.scalars().all()
 
+    async def get_suggest_entries(self, user: User) -> list:
+        """
+        Loads the fields the typeahead index is built from.
+
+        Args:
+            user (User): The user who owns the contacts.
+
+        Returns:
+            list[Row]: Rows with ``id``, ``first_name``, ``last_name`` and ``email``.
+        """
+        result = await self.db.execute(_SUGGEST_ENTRIES, {"user_id": user.id})
+        return result.all()
+
     async def search_contacts(
         self,
         skip: int,
@@ -136,84 +524,147 @@ class ContactRepository:
         last_name: Optional[str],
         email: Optional[str],
         user: User,
+        after: list | None = None,
     ) -> List[Contact]:
         """
         Search for contacts by first name, last name, or email for a specific user.
 
         Args:
-            skip (int): The number of records to skip.
+            skip (int): The number of records to skip; ignored when ``after`` is set.
             limit (int): The maximum number of records to retrieve.
             first_name (Optional[str]): The first name to search for.
             last_name (Optional[str]): The last name to search for.
             email (Optional[str]): The email to search for.
             user (User): The user whose contacts are being searched.
+            after (list | None): Sort key of the last row of the previous page,
+                from `contact_sort_key`.
 
         Returns:
             List[Contact]: A list of contacts matching the search criteria.
         """
-        stmt = select(Contact)
-
-        if first_name:
-            stmt = stmt.filter(Contact.first_name.ilike(f"%{first_name}%"))
-        if last_name:
-            stmt = stmt.filter(Contact.last_name.ilike(f"%{last_name}%"))
-        if email:
-            stmt = stmt.filter(Contact.email.ilike(f"%{email}%"))
-        stmt = stmt.filter_by(user=user).offset(skip).limit(limit)
-        result = await self.db.execute(stmt)
+        params = {"user_id": user.id, **_page_params(skip, limit, after)}
+        for name, value in (
+            ("first_name", first_name),
+            ("last_name", last_name),
+            ("email", email),
+        ):
+            if value:
+                params[name] = _contains_pattern(value)
+        stmt = _search_stmt(
+            bool(first_name), bool(last_name), bool(email), after is not None
+        )
+        result = await self.db.execute(stmt, params)
         return result.scalars().all()
 
+    async def ranked_search(
+        self,
+        q: str,
+        skip: int,
+        limit: int,
+        user: User,
+        after: list | None = None,
+    ) -> list[tuple[Contact, float]]:
+        """
+        Searches names, email, phone and note of the user's contacts by relevance.
+
+        On PostgreSQL this matches the ``search_vector`` full-text column and,
+        for typos, trigram word similarity on ``search_text``; both have GIN
+        indexes. Other databases fall back to a substring match in any field,
+        ranked by the number of matching fields.
+
+        Args:
+            q (str): The search query, in web search syntax on PostgreSQL.
+            skip (int): The number of records to skip; ignored when ``after`` is set.
+            limit (int): The maximum number of records to retrieve.
+            user (User): The user whose contacts are being searched.
+            after (list | None): ``[score, id]`` of the last row of the
+                previous page.
+
+        Returns:
+            list[tuple[Contact, float]]: Contacts with their relevance score,
+            best first.
+        """
+        postgresql = self.db.bind.dialect.name == "postgresql"
+        params = {"user_id": user.id, **_page_params(skip, limit, after)}
+        if postgresql:
+            params["q"] = q
+        else:
+            params["pattern"] = _contains_pattern(q)
+        result = await self.db.execute(
+            _ranked_search_stmt(postgresql, after is not None), params
+        )
+        return [(contact, score) for contact, score in result.all()]
+
+    async def get_birthdays_batch(
+        self, today: date, next_date: date, after_id: int, limit: int
+    ) -> list:
+        """
+        Loads one batch of upcoming birthdays across all users.
+
+        Used by the daily birthday materialization; batches follow the
+        contact id, so each one starts where the previous one ended.
+
+        Args:
+            today (date): The start date of the range.
+            next_date (date): The end date of the range.
+            after_id (int): The last contact ID of the previous batch, or 0.
+            limit (int): The maximum number of rows in the batch.
+
+        Returns:
+            list[Row]: Rows with ``id``, ``user_id`` and ``birth_date``.
+        """
+        start_md, end_md = _birthday_window(today, next_date)
+        result = await self.db.execute(
+            _birthdays_batch_stmt(start_md > end_md),
+            {
+                "start_md": start_md,
+                "end_md": end_md,
+                "after_id": after_id,
+                "limit": limit,
+            },
+        )
+        return result.all()
+
     async def get_upcoming_birthdays(
-        self, today: date, next_date: date, skip: int, limit: int, user: User
+        self,
+        today: date,
+        next_date: date,
+        skip: int,
+        limit: int,
+        user: User,
+        after: list | None = None,
     ) -> List[Contact]:
         """
         Retrieve contacts with upcoming birthdays within a specified date range.
 
+        Matches on the indexed ``birthday_md`` column, so leap years do not shift
+        the window; in other years February 29th birthdays fall on February 28th.
+
         Args:
             today (date): The start date of the range.
             next_date (date): The end date of the range.
-            skip (int): The number of records to skip.
+            skip (int): The number of records to skip; ignored when ``after`` is set.
             limit (int): The maximum number of records to retrieve.
             user (User): The user whose contacts are being retrieved.
+            after (list | None): Sort key of the last row of the previous page,
+                from `birthday_sort_key`.
 
         Returns:
             List[Contact]: A list of contacts with upcoming birthdays.
         """
-
-        start_day_of_year = today.timetuple().tm_yday
-        end_day_of_year = next_date.timetuple().tm_yday
-
-        if start_day_of_year <= end_day_of_year:
-            stmt = (
-                select(Contact)
-                .filter_by(user=user)
-                .filter(
-                    or_(
-                        and_(
-                            extract("doy", Contact.birth_date) >= start_day_of_year,
-                            extract("doy", Contact.birth_date) <= end_day_of_year,
-                        )
-                    )
-                )
-                .order_by(extract("doy", Contact.birth_date))
-                .offset(skip)
-                .limit(limit)
-            )
-        else:
-            stmt = (
-                select(Contact)
-                .filter_by(user=user)
-                .filter(
-                    or_(
-                        extract("doy", Contact.birth_date) >= start_day_of_year,
-                        extract("doy", Contact.birth_date) <= end_day_of_year,
-                    )
-                )
-                .order_by(extract("doy", Contact.birth_date))
-                .offset(skip)
-                .limit(limit)
-            )
-
-        result = await self.db.execute(stmt)
+        start_md, end_md = _birthday_window(today, next_date)
+        wraps_year = start_md > end_md
+        if after is not None and wraps_year:
+            after = [int(after[0] < start_md), *after]
+
+        result = await self.db.execute(
+            _birthdays_stmt(wraps_year, after is not None),
+            {
+                "user_id": user.id,
+                "start_md": start_md,
+                "end_md": end_md,
+                **_page_params(skip, limit, after),
+            },
+        )
         return result.scalars().all()
 
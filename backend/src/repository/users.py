@@ -1,9 +1,15 @@
-from sqlalchemy import select
+from sqlalchemy import bindparam, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.core.user_cache import user_cache
 from src.database.models import User, UserRole
 from src.schemas import UserCreate
 
+# Запити будуються один раз, див. src.repository.contacts
+_USER_BY_ID = select(User).where(User.id == bindparam("user_id"))
+_USER_BY_USERNAME = select(User).where(User.username == bindparam("username"))
+_USER_BY_EMAIL = select(User).where(User.email == bindparam("email"))
+
 
 class UserRepository:
     def __init__(self, session: AsyncSession):
@@ -25,8 +31,7 @@ class UserRepository:
         Returns:
             User | None: A User object if found, or None if not found.
         """
-        stmt = select(User).filter_by(id=user_id)
-        user = await self.db.execute(stmt)
+        user = await self.db.execute(_USER_BY_ID, {"user_id": user_id})
         return user.scalar_one_or_none()
 
     async def get_user_by_username(self, username: str) -> User | None:
@@ -39,8 +44,7 @@ class UserRepository:
         Returns:
             User | None: A User object if found, or None if not found.
         """
-        stmt = select(User).filter_by(username=username)
-        user = await self.db.execute(stmt)
+        user = await self.db.execute(_USER_BY_USERNAME, {"username": username})
         return user.scalar_one_or_none()
 
     async def get_user_by_email(self, email: str) -> User | None:
@@ -53,8 +57,7 @@ class UserRepository:
         Returns:
             User | None: A User object if found, or None if not found.
         """
-        stmt = select(User).filter_by(email=email)
-        user = await self.db.execute(stmt)
+        user = await self.db.execute(_USER_BY_EMAIL, {"email": email})
         return user.scalar_one_or_none()
 
     async def create_user(self, body: UserCreate, avatar: str, role: UserRole) -> User:
@@ -82,7 +85,8 @@ class UserRepository:
 
     async def update_avatar(self, user_id: int, new_avatar: str) -> User | None:
         """
-        Updates the avatar of a user by their ID.
+        Updates the avatar of a user by their ID and invalidates the user's
+        cached principal on every worker.
 
         Args:
             user_id (int): The ID of the user whose avatar is being updated.
@@ -96,4 +100,5 @@ class UserRepository:
             user.avatar = new_avatar
             await self.db.commit()
             await self.db.refresh(user)
+            await user_cache.invalidate(user)
         return user
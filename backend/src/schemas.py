@@ -1,6 +1,6 @@
 from datetime import date, datetime
 from typing import  Optional
-from pydantic import BaseModel, Field, ConfigDict, EmailStr, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict, EmailStr, ConfigDict, field_validator
 from src.database.models import UserRole
 
 
@@ -28,6 +28,39 @@ class ContactCreate(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+# Модель для часткового оновлення контакту
+class ContactUpdate(BaseModel):
+    """
+    A model for partially updating a contact.
+
+    Only the fields present in the request are written; omitted fields keep
+    their current values. Only ``note`` may be set to null.
+
+    Attributes:
+        first_name (Optional[str]): The first name of the contact (max length 50).
+        last_name (Optional[str]): The last name of the contact (max length 50).
+        email (Optional[str]): The email of the contact (max length 255).
+        phone_number (Optional[str]): The phone number of the contact (max length 20).
+        birth_date (Optional[date]): The birth date of the contact.
+        note (Optional[str]): A note for the contact (max length 250).
+    """
+
+    first_name: Optional[str] = Field(default=None, max_length=50)
+    last_name: Optional[str] = Field(default=None, max_length=50)
+    email: Optional[str] = Field(default=None, max_length=255)
+    phone_number: Optional[str] = Field(default=None, max_length=20)
+    birth_date: Optional[date] = None
+    note: Optional[str] = Field(default=None, max_length=250)
+
+    @field_validator("first_name", "last_name", "email", "phone_number", "birth_date")
+    @classmethod
+    def _not_null(cls, value):
+        # Валідатор бачить лише передані поля, тож null тут — явний
+        if value is None:
+            raise ValueError("Field cannot be null")
+        return value
+
+
 # Модель для відповіді, що містить дані про контакт
 class ContactResponse(ContactCreate):
     """
@@ -57,6 +90,55 @@ class ContactResponse(ContactCreate):
     model_config = ConfigDict(from_attributes=True)
 
 
+# Підказка для автодоповнення пошуку
+class ContactSuggestion(BaseModel):
+    """
+    A model for a typeahead suggestion.
+
+    Attributes:
+        id (int): The ID of the contact.
+        first_name (str): The first name of the contact.
+        last_name (str): The last name of the contact.
+        email (str): The email of the contact.
+    """
+
+    id: int
+    first_name: str
+    last_name: str
+    email: str
+
+
+# Помилки одного запису файлу імпорту
+class ContactImportError(BaseModel):
+    """
+    A model for a record that could not be imported.
+
+    Attributes:
+        line (int): The line of the file the record starts on.
+        errors (list[str]): Why the record was rejected.
+    """
+
+    line: int
+    errors: list[str]
+
+
+# Підсумок імпорту контактів
+class ContactImportResult(BaseModel):
+    """
+    A model for the outcome of a contact import.
+
+    Attributes:
+        imported (int): The number of contacts created.
+        failed (int): The number of records rejected.
+        errors (list[ContactImportError]): The rejected records, in file order;
+            capped, so ``failed`` may be larger.
+    """
+
+    imported: int
+    failed: int
+    errors: list[ContactImportError]
+
+
 # Схема користувача
 class User(BaseModel):
     """
@@ -79,6 +161,54 @@ class User(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+# Автентифікований користувач без прив'язки до сесії БД
+class UserPrincipal(User):
+    """
+    A detached, read-only representation of the authenticated user.
+
+    Built either from the Redis user cache or from the ORM ``User`` row, so the
+    request path never has to hold an ORM object bound to a database session.
+
+    Attributes:
+        avatar (Optional[str]): The avatar URL of the user, if any.
+        is_verified (bool): Whether the user's email has been verified.
+    """
+
+    avatar: Optional[str] = None
+    is_verified: bool = False
+
+    model_config = ConfigDict(from_attributes=True, frozen=True)
+
+    @field_validator("is_verified", mode="before")
+    @classmethod
+    def _none_is_unverified(cls, value):
+        # Колонка is_verified nullable для старих записів
+        return bool(value)
+
+
+# Принципал, відновлений лише з клеймів access-токена
+class ClaimsPrincipal(BaseModel):
+    """
+    An authenticated user built from the claims of an access token alone.
+
+    Carries just what authorization needs, so the contacts and admin routes
+    never have to resolve the user.
+
+    Attributes:
+        id (int): The ID of the user.
+        username (str): The username of the user.
+        role (UserRole): The role of the user.
+        is_verified (bool): Whether the user's email has been verified.
+    """
+
+    id: int
+    username: str
+    role: UserRole
+    is_verified: bool = False
+
+    model_config = ConfigDict(frozen=True)
+
+
 # Схема для запиту реєстрації
 class UserCreate(BaseModel):
     """
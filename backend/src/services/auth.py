@@ -1,23 +1,37 @@
+import asyncio
+
 from fastapi import Depends, HTTPException, status
-from passlib.context import CryptContext
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
-from jose import JWTError, jwt
+from jose import JWTError
 
-from src.database.db import get_db
+from src.database.db import get_db, release_connection
 from src.conf.config import config
 from src.services.users import UserService
 from src.database.models import User, UserRole
-from src.core.redis_client import redis_client
-from src.schemas import User as UserSchema
+from src.core.hashing import (
+    HashQueueFull,
+    hash_executor,
+    hash_password,
+    pwd_context,
+    verify_and_update,
+    verify_password,
+)
+from src.core.jwt_cache import jwt_cache
+from src.core.token_versions import get_token_version, mirror_token_version
+from src.core.user_cache import user_cache
+from src.schemas import ClaimsPrincipal, UserPrincipal
 
 
 class Hash:
     """
     A utility class for handling password hashing and verification.
+
+    The async methods run bcrypt in the dedicated hashing executor so that a
+    login storm does not block the event loop.
     """
 
-    pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+    pwd_context = pwd_context
 
     def verify_password(self, plain_password: str, hashed_password: str) -> bool:
         """
@@ -30,7 +44,7 @@ class Hash:
         Returns:
             bool: True if the passwords match, False otherwise.
         """
-        return self.pwd_context.verify(plain_password, hashed_password)
+        return verify_password(plain_password, hashed_password)
 
     def get_password_hash(self, password: str) -> str:
         """
@@ -42,58 +56,167 @@ class Hash:
         Returns:
             str: The hashed password.
         """
-        return self.pwd_context.hash(password)
+        return hash_password(password)
+
+    async def verify_password_async(
+        self, plain_password: str, hashed_password: str
+    ) -> bool:
+        """
+        Verifies a plain password in the hashing executor.
+
+        Args:
+            plain_password (str): The plain password to verify.
+            hashed_password (str): The hashed password to compare against.
+
+        Returns:
+            bool: True if the passwords match, False otherwise.
+
+        Raises:
+            HTTPException: 503 if the hashing queue is full.
+        """
+        return await self._run(verify_password, plain_password, hashed_password)
+
+    async def verify_and_update_async(
+        self, plain_password: str, hashed_password: str
+    ) -> tuple[bool, str | None]:
+        """
+        Verifies a plain password and rehashes it if the stored hash is outdated.
+
+        Args:
+            plain_password (str): The plain password to verify.
+            hashed_password (str): The hashed password to compare against.
+
+        Returns:
+            tuple[bool, str | None]: Whether the password matches, and a new
+            hash if the stored one uses outdated parameters.
+
+        Raises:
+            HTTPException: 503 if the hashing queue is full.
+        """
+        return await self._run(verify_and_update, plain_password, hashed_password)
+
+    async def get_password_hash_async(self, password: str) -> str:
+        """
+        Hashes a plain password in the hashing executor.
+
+        Args:
+            password (str): The plain password to hash.
+
+        Returns:
+            str: The hashed password.
+
+        Raises:
+            HTTPException: 503 if the hashing queue is full.
+        """
+        return await self._run(hash_password, password)
+
+    async def _run(self, fn, *args):
+        try:
+            return await hash_executor.run(fn, *args)
+        except HashQueueFull:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Сервер перевантажений, спробуйте пізніше",
+                headers={"Retry-After": "1"},
+            )
 
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
 
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+def _decode_access_token(token: str) -> dict:
+    """
+    Verifies an access token and returns its claims.
+
+    Args:
+        token (str): The encoded access token.
+
+    Returns:
+        dict: The verified claims.
+
+    Raises:
+        HTTPException: 401 if the token is invalid or expired.
+    """
+    try:
+        return jwt_cache.decode(token, config.JWT_SECRET, config.JWT_ALGORITHM)
+    except JWTError as e:
+        print(f"JWT decode error: {e}")
+        raise _credentials_exception()
+
+
+async def _check_token_version(payload: dict, db: Session) -> None:
+    """
+    Rejects a claims-based token whose version has been revoked.
+
+    The current version is read from Redis; on a miss it is loaded from the
+    database and mirrored back.
+
+    Args:
+        payload (dict): Verified claims carrying ``uid`` and ``ver``.
+        db (Session): The database session, used only on a Redis miss.
+
+    Raises:
+        HTTPException: 401 if the token is revoked or malformed, or the user is gone.
+    """
+    try:
+        user_id = int(payload["uid"])
+        token_version = int(payload["ver"])
+    except (KeyError, TypeError, ValueError):
+        raise _credentials_exception()
+
+    current_version = await get_token_version(user_id)
+    if current_version is None:
+        user = await UserService(db).get_user_by_id(user_id)
+        if not user:
+            raise _credentials_exception()
+        current_version = user.token_version
+        await release_connection(db)
+        await mirror_token_version(user_id, current_version)
+
+    if token_version != current_version:
+        raise _credentials_exception()
+
+
 async def get_current_user(
     token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)
-) -> User:
+) -> UserPrincipal:
     """
     Retrieves the current user from the OAuth2 token.
 
+    A hit in the in-process or Redis user cache is served without any database
+    round trip; the ORM ``User`` is loaded only on a miss in both tiers.
+
     Args:
         token (str): The OAuth2 token to verify and decode.
         db (Session): The database session for querying user data.
 
     Returns:
-        User: The ORM object representing the authenticated user.
+        UserPrincipal: A detached, read-only principal of the authenticated user.
 
     Raises:
         HTTPException: If the credentials are invalid or expired.
     """
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-
-    try:
-        payload = jwt.decode(
-            token, config.JWT_SECRET, algorithms=[config.JWT_ALGORITHM]
-        )
-        username_or_email: str = payload.get("sub")
-        if not username_or_email:
-            raise credentials_exception
-    except JWTError as e:
-        print(f"JWT decode error: {e}")
+    credentials_exception = _credentials_exception()
+    payload = _decode_access_token(token)
+    username_or_email: str = payload.get("sub")
+    if not username_or_email:
         raise credentials_exception
 
-    redis_key = f"user:{username_or_email}"
-
-    # Try to get from Redis
-    cached_user = await redis_client.hgetall(redis_key)
-    if cached_user:
-        try:
-            user_id = int(cached_user["id"])
-            user = db.query(User).get(user_id)
-            if user:
-                return user
-        except Exception as e:
-            print(f"Redis cache parse error: {e}")
-            await redis_client.delete(redis_key)
+    # Незалежні звернення до Redis ідуть одним конвеєром
+    lookups = [user_cache.get(username_or_email)]
+    if "uid" in payload:
+        lookups.append(_check_token_version(payload, db))
+    cached_user, *_ = await asyncio.gather(*lookups)
+    if cached_user is not None:
+        return cached_user
 
     # Fallback to DB, check if it's username or email
     user_service = UserService(db)
@@ -104,31 +227,61 @@ async def get_current_user(
     if not user:
         raise credentials_exception
 
-    # Cache in Redis
-    await redis_client.hset(
-        redis_key,
-        mapping={
-            "id": str(user.id),
-            "username": user.username,
-            "email": user.email,
-            "role": user.role.value,
-            "avatar": user.avatar or "",
-        },
-    )
-    await redis_client.expire(redis_key, 600)
+    principal = UserPrincipal.model_validate(user)
+    # Обробник може взагалі не звертатися до БД — віддаємо з'єднання одразу
+    await release_connection(db)
+    await user_cache.set(username_or_email, principal)
+
+    return principal
+
+
+async def get_current_principal(
+    token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)
+) -> ClaimsPrincipal | UserPrincipal:
+    """
+    Retrieves the authenticated user for authorization purposes only.
 
-    return user
+    A claims-based access token is turned into a principal from its claims
+    alone, after a single Redis version check. Tokens without claims fall back
+    to `get_current_user`.
+
+    Args:
+        token (str): The OAuth2 token to verify and decode.
+        db (Session): The database session, used only on fallbacks.
+
+    Returns:
+        ClaimsPrincipal | UserPrincipal: The authenticated principal.
+
+    Raises:
+        HTTPException: If the credentials are invalid, expired or revoked.
+    """
+    payload = _decode_access_token(token)
+    if "uid" not in payload:
+        return await get_current_user(token, db)
+
+    await _check_token_version(payload, db)
+    try:
+        return ClaimsPrincipal(
+            id=payload["uid"],
+            username=payload["sub"],
+            role=UserRole(payload["role"]),
+            is_verified=bool(payload.get("vrf")),
+        )
+    except (KeyError, ValueError):
+        raise _credentials_exception()
 
 
-async def get_current_admin_user(current_user: UserSchema = Depends(get_current_user)):
+async def get_current_admin_user(
+    current_user: ClaimsPrincipal | UserPrincipal = Depends(get_current_principal),
+):
     """
     Retrieves the current user and ensures they are an administrator.
 
     Args:
-        current_user (UserSchema): The currently authenticated user.
+        current_user (ClaimsPrincipal | UserPrincipal): The currently authenticated user.
 
     Returns:
-        UserSchema: The current user if they are an admin.
+        ClaimsPrincipal | UserPrincipal: The current user if they are an admin.
 
     Raises:
         HTTPException: If the current user does not have admin rights.
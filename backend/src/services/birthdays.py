@@ -0,0 +1,85 @@
+import asyncio
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.conf.config import config
+from src.core.birthday_store import birthday_score, birthday_store
+from src.database.db import sessionmanager
+from src.repository.contacts import ContactRepository
+
+
+async def refresh_upcoming_birthdays(db: AsyncSession, today: date) -> int | None:
+    """
+    Materializes every user's upcoming birthdays for the day.
+
+    Contacts are read in id-ordered batches across all users, and each batch
+    is written to the birthday store in one pipeline. The generation is marked
+    as building before the first read, so a contact written while the run is
+    under way is either read by it or corrected into it by the write itself.
+    ``db`` must read from the primary: a lagging replica could miss a write
+    whose correction only reached the previous generation.
+
+    Args:
+        db (AsyncSession): A primary database session to read contacts with;
+            it must not have started a transaction yet.
+        today (date): The first day of the materialized window.
+
+    Returns:
+        int | None: The number of contacts stored, or None if today's
+        generation is already built or being built by another worker.
+
+    Raises:
+        redis.exceptions.RedisError: If Redis is unavailable.
+    """
+    # Спершу оголошуємо покоління: записи після цього виправляють і його
+    generation = await birthday_store.begin_build(today)
+    if generation is None:
+        return None
+    repository = ContactRepository(db)
+    next_date = today + timedelta(days=birthday_store.horizon)
+    stored, after_id = 0, 0
+    try:
+        while True:
+            rows = await repository.get_birthdays_batch(
+                today, next_date, after_id, config.BIRTHDAY_DIGEST_BATCH
+            )
+            birthdays = defaultdict(dict)
+            for row in rows:
+                birthdays[row.user_id][row.id] = birthday_score(row.birth_date, today)
+            if birthdays:
+                await birthday_store.store_batch(generation, birthdays)
+            stored += len(rows)
+            if len(rows) < config.BIRTHDAY_DIGEST_BATCH:
+                break
+            after_id = rows[-1].id
+        await birthday_store.finish_build(generation)
+    except BaseException:
+        await birthday_store.abort_build(generation)
+        raise
+    return stored
+
+
+async def run_daily_birthday_refresh() -> None:
+    """
+    Refreshes the materialized upcoming birthdays once a day.
+
+    Runs until cancelled. Every worker runs the loop; the birthday store lets
+    one of them build each day's generation. A failed run is retried after a
+    minute, otherwise the loop sleeps until the next midnight.
+    """
+    while True:
+        today = date.today()
+        try:
+            # Основна БД: відставання репліки закріпилося б у поколінні на добу
+            async with sessionmanager.session() as db:
+                await refresh_upcoming_birthdays(db, today)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"Upcoming birthdays refresh failed: {e}")
+            await asyncio.sleep(60)
+            continue
+        midnight = datetime.combine(today + timedelta(days=1), time.min)
+        await asyncio.sleep(max((midnight - datetime.now()).total_seconds(), 1))
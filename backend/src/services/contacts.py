@@ -1,10 +1,24 @@
+from pydantic import ValidationError
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional
 from datetime import date, timedelta
 
+from src.conf.config import config
+from src.core.birthday_store import birthday_score, birthday_store
+from src.core.suggest_index import suggest_index
 from src.repository.contacts import ContactRepository
-from src.schemas import ContactCreate 
+from src.schemas import ContactCreate, ContactUpdate
 from src.database.models import User
+from src.utils.contact_files import ContactFileError
+
+# Поля, з яких будується індекс підказок
+_SUGGEST_FIELDS = {"first_name", "last_name", "email"}
+
+
+def _validation_message(error: dict) -> str:
+    field = ".".join(str(part) for part in error["loc"])
+    return f"{field}: {error['msg']}" if field else error["msg"]
 
 
 class ContactService:
@@ -33,21 +47,122 @@ class ContactService:
         Returns:
             Contact: The newly created contact.
         """
-        return await self.repository.create_contact(body, user)
+        contact = await self.repository.create_contact(body, user)
+        await suggest_index.contact_saved(user.id, contact)
+        await birthday_store.contact_saved(user.id, contact, date.today())
+        return contact
 
-    async def get_contacts(self, skip: int, limit: int, user: User):
+    async def import_contacts(
+        self, records: AsyncIterator[tuple[int, object]], user: User
+    ) -> dict:
         """
-        Retrieves a paginated list of contacts for a specific user.
+        Imports contacts read from an uploaded file.
+
+        Records are validated against `ContactCreate` as they arrive and written
+        in batches of ``CONTACT_IMPORT_BATCH`` with one multi-row INSERT each,
+        so only one batch is held in memory. Each batch is committed on its
+        own; a record that fails is reported and the import goes on. If the
+        database fails to write a batch, the import stops there: earlier
+        batches stay imported, and the failed batch is reported as one error
+        on its first line.
+
+        Args:
+            records (AsyncIterator[tuple[int, object]]): ``(line, record)``
+                pairs from a reader in `src.utils.contact_files`.
+            user (User): The user who owns the imported contacts.
+
+        Returns:
+            dict: Counts of imported and failed records, and the errors of the
+            first ``CONTACT_IMPORT_MAX_ERRORS`` failed records by line.
+        """
+        report = {"imported": 0, "failed": 0, "errors": []}
+        batch, today = {}, date.today()
+
+        def fail(line: int, messages: list[str]) -> None:
+            report["failed"] += 1
+            if len(report["errors"]) < config.CONTACT_IMPORT_MAX_ERRORS:
+                report["errors"].append({"line": line, "errors": messages})
+
+        async def flush() -> bool:
+            lines = [line for line, _ in batch.values()]
+            try:
+                inserted = await self.repository.import_contacts(
+                    [row for _, row in batch.values()], user
+                )
+            except SQLAlchemyError:
+                # Попередні пачки вже закомічені: повертаємо частковий звіт
+                report["failed"] += len(lines)
+                report["errors"].append(
+                    {
+                        "line": lines[0],
+                        "errors": [
+                            f"Database error: lines {lines[0]}-{lines[-1]} and "
+                            "the rest of the file were not imported"
+                        ],
+                    }
+                )
+                batch.clear()
+                return False
+            saved = {contact.email for contact in inserted}
+            for line, row in batch.values():
+                if row["email"] not in saved:
+                    fail(line, ["Contact with this email already exists"])
+            report["imported"] += len(inserted)
+            await birthday_store.contacts_saved(user.id, inserted, today)
+            batch.clear()
+            return True
+
+        try:
+            async for line, record in records:
+                if isinstance(record, str):
+                    fail(line, [record])
+                    continue
+                try:
+                    row = ContactCreate.model_validate(record).model_dump()
+                except ValidationError as e:
+                    fail(line, [_validation_message(error) for error in e.errors()])
+                    continue
+                # Дублікат email у межах пачки INSERT тихо пропустив би
+                if row["email"] in batch:
+                    fail(line, ["Email repeats an earlier row of the file"])
+                    continue
+                batch[row["email"]] = (line, row)
+                if len(batch) >= config.CONTACT_IMPORT_BATCH and not await flush():
+                    break
+        except ContactFileError as e:
+            fail(e.line, [str(e)])
+        if batch:
+            await flush()
+        if report["imported"]:
+            await suggest_index.invalidate(user.id)
+        return report
+
+    async def get_contacts(
+        self,
+        skip: int,
+        limit: int,
+        user: User,
+        after: list | None = None,
+        sort: str = "id",
+        descending: bool = False,
+    ):
+        """
+        Retrieves a paginated, sorted list of contacts for a specific user.
 
         Args:
             skip (int): The number of records to skip for pagination.
             limit (int): The maximum number of contacts to return.
             user (User): The user whose contacts are being queried.
+            after (list | None): Keyset cursor key; replaces ``skip`` when set.
+            sort (str): The column to sort by.
+            descending (bool): Sort in descending order.
 
         Returns:
             list[Contact]: A list of Contact objects.
         """
-        return await self.repository.get_contacts(skip, limit, user)
+        return await self.repository.get_contacts(
+            skip, limit, user, after, sort, descending
+        )
 
     async def get_contact(self, contact_id: int, user: User):
         """
@@ -76,7 +191,30 @@ class ContactService:
         Returns:
             Contact | None: The updated contact or None if not found.
         """
-        return await self.repository.update_contact(contact_id, body, user)
+        contact = await self.repository.update_contact(contact_id, body, user)
+        if contact is not None:
+            await suggest_index.contact_saved(user.id, contact)
+            await birthday_store.contact_saved(user.id, contact, date.today())
+        return contact
+
+    async def patch_contact(self, contact_id: int, body: ContactUpdate, user: User):
+        """
+        Updates only the supplied fields of a contact for a given user.
+
+        Args:
+            contact_id (int): The ID of the contact to update.
+            body (ContactUpdate): The fields to change.
+            user (User): The user who owns the contact.
+
+        Returns:
+            Contact | None: The updated contact or None if not found.
+        """
+        contact = await self.repository.patch_contact(contact_id, body, user)
+        if contact is not None and body.model_fields_set & _SUGGEST_FIELDS:
+            await suggest_index.contact_saved(user.id, contact)
+        if contact is not None and "birth_date" in body.model_fields_set:
+            await birthday_store.contact_saved(user.id, contact, date.today())
+        return contact
 
     async def remove_contact(self, contact_id: int, user: User):
         """
@@ -89,7 +227,11 @@ class ContactService:
         Returns:
             Contact | None: The deleted contact or None if not found.
         """
-        return await self.repository.remove_contact(contact_id, user)
+        contact = await self.repository.remove_contact(contact_id, user)
+        if contact is not None:
+            await suggest_index.contact_removed(user.id, contact_id)
+            await birthday_store.contact_removed(user.id, contact_id)
+        return contact
 
     async def search_contacts(
         self,
@@ -99,6 +241,7 @@ class ContactService:
         last_name: Optional[str],
         email: Optional[str],
         user: User,
+        after: list | None = None,
     ) -> List[ContactCreate]:
         """
         Search for contacts by first name, last name, or email for a specific user.
@@ -110,33 +253,102 @@ class ContactService:
             last_name (Optional[str]): The last name to search for.
             email (Optional[str]): The email to search for.
             user (User): The user whose contacts are being searched.
+            after (list | None): Keyset cursor key; replaces ``skip`` when set.
 
         Returns:
             List[ContactModel]: A list of contacts matching the search criteria.
         """
         return await self.repository.search_contacts(
-            skip, limit, first_name, last_name, email, user
+            skip, limit, first_name, last_name, email, user, after
+        )
+
+    async def ranked_search(
+        self, q: str, skip: int, limit: int, user: User, after: list | None = None
+    ):
+        """
+        Searches all text fields of the user's contacts, best matches first.
+
+        Args:
+            q (str): The search query.
+            skip (int): The number of records to skip.
+            limit (int): The maximum number of records to retrieve.
+            user (User): The user whose contacts are being searched.
+            after (list | None): Keyset cursor key; replaces ``skip`` when set.
+
+        Returns:
+            list[tuple[Contact, float]]: Contacts with their relevance score.
+        """
+        return await self.repository.ranked_search(q, skip, limit, user, after)
+
+    async def suggest(self, q: str, limit: int, user: User) -> list[dict]:
+        """
+        Suggests contacts whose name or email starts with what the user typed.
+
+        Served from the in-process prefix index; the database is read only to
+        build a user's index on first use.
+
+        Args:
+            q (str): What the user has typed so far.
+            limit (int): The maximum number of suggestions.
+            user (User): The user whose contacts are suggested.
+
+        Returns:
+            list[dict]: Suggestions with id, first name, last name and email.
+        """
+        return await suggest_index.lookup(
+            user.id, q, limit, lambda: self.repository.get_suggest_entries(user)
         )
 
     async def get_upcoming_birthdays(
-        self, days: int, skip: int, limit: int, user: User
+        self, days: int, skip: int, limit: int, user: User, after: list | None = None
     ) -> List[ContactCreate]:
         """
         Retrieve contacts with upcoming birthdays within a specified date range.
 
+        Windows covered by the daily materialization are paged in the birthday
+        store and only the contacts of the page are loaded by ID; other windows,
+        an unavailable store, or a page with a stale entry query the database.
+
         Args:
             days (int): The number of days ahead to search for birthdays.
             skip (int): The number of records to skip.
             limit (int): The maximum number of records to retrieve.
             user (User): The user whose contacts are being retrieved.
+            after (list | None): Keyset cursor key; replaces ``skip`` when set.
 
         Returns:
             List[ContactModel]: A list of contacts with upcoming birthdays.
         """
         today = date.today()
         next_date = today + timedelta(days=days)
-        return await self.repository.get_upcoming_birthdays(
-            today, next_date, skip, limit, user
-        )
+        position = None
+        if after is not None:
+            # Курсор [місяць*100+день, id] переводимо в бал сховища
+            birthday_md, contact_id = after
+            birth_date = date(2000, birthday_md // 100, birthday_md % 100)
+            position = (birthday_score(birth_date, today), contact_id)
+        page = await birthday_store.window(user.id, today, days, skip, limit, position)
+        if page is None:
+            return await self.repository.get_upcoming_birthdays(
+                today, next_date, skip, limit, user, after
+            )
+        if not page:
+            return []
+        contacts = {
+            contact.id: contact
+            for contact in await self.repository.get_contacts_by_ids(
+                [contact_id for contact_id, _ in page], user
+            )
+        }
+        # Збережені id лише кандидати: сторінку із застарілим записом віддає БД
+        if any(
+            contact_id not in contacts
+            or birthday_score(contacts[contact_id].birth_date, today) != score
+            for contact_id, score in page
+        ):
+            return await self.repository.get_upcoming_birthdays(
+                today, next_date, skip, limit, user, after
+            )
+        return [contacts[contact_id] for contact_id, _ in page]
 
 
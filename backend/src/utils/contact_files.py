@@ -0,0 +1,221 @@
+"""
+Streaming readers for contact import files.
+
+Each reader takes the uploaded body as an async iterator of byte chunks and
+yields ``(line, record)`` pairs: ``line`` is the 1-based line the record starts
+on, ``record`` is a dict of `ContactCreate` fields, or an error message if the
+record itself cannot be read. Only the current record is held in memory, so
+files of any size are read in constant space.
+"""
+
+import codecs
+import csv
+import json
+import re
+from typing import AsyncIterator
+
+# Найдовший рядок (або CSV-запис), який читач тримає в пам'яті
+MAX_RECORD_LENGTH = 64 * 1024
+
+CONTENT_TYPES = {
+    "text/csv": "csv",
+    "application/csv": "csv",
+    "application/jsonl": "jsonl",
+    "application/x-ndjson": "jsonl",
+    "application/x-jsonlines": "jsonl",
+    "text/vcard": "vcard",
+    "text/x-vcard": "vcard",
+}
+
+_VCARD_ESCAPE = re.compile(r"\\(.)")
+_VCARD_PROPERTIES = {"N", "FN", "EMAIL", "TEL", "BDAY", "NOTE"}
+
+
+class ContactFileError(ValueError):
+    """
+    Raised when an import file cannot be read any further.
+
+    Attributes:
+        line (int): The line the reader stopped at.
+    """
+
+    def __init__(self, line: int, message: str):
+        super().__init__(message)
+        self.line = line
+
+
+async def _lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[tuple[int, str]]:
+    # Інкрементальний декодер не ламає символи, розрізані між чанками
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending, number = "", 0
+    try:
+        async for chunk in chunks:
+            pending += decoder.decode(chunk)
+            *complete, pending = pending.split("\n")
+            for line in complete:
+                number += 1
+                yield number, line.removesuffix("\r")
+            if len(pending) > MAX_RECORD_LENGTH:
+                raise ContactFileError(number + 1, "Line is too long")
+        pending += decoder.decode(b"", final=True)
+    except UnicodeDecodeError:
+        raise ContactFileError(number + 1, "File is not valid UTF-8")
+    if pending:
+        yield number + 1, pending.removesuffix("\r")
+
+
+async def read_csv(chunks: AsyncIterator[bytes]) -> AsyncIterator[tuple[int, object]]:
+    """
+    Reads contacts from a CSV file with a header row.
+
+    Header names are matched case-insensitively, with spaces read as
+    underscores (``First Name`` is ``first_name``). Quoted values may span
+    lines.
+
+    Args:
+        chunks (AsyncIterator[bytes]): The file body.
+
+    Yields:
+        tuple[int, object]: The line of each record and its fields, or an
+        error message.
+
+    Raises:
+        ContactFileError: If the file has no header or a record is too long.
+    """
+    header, record, start = None, "", 0
+    async for number, line in _lines(chunks):
+        if not record:
+            start = number
+            if not line.strip():
+                continue
+        record += line
+        # Непарна кількість лапок: значення в лапках продовжується з нового рядка
+        if record.count('"') % 2:
+            if len(record) > MAX_RECORD_LENGTH:
+                raise ContactFileError(start, "Record is too long")
+            record += "\n"
+            continue
+        values, record = next(csv.reader([record])), ""
+        if header is None:
+            header = [name.strip().lower().replace(" ", "_") for name in values]
+        elif len(values) != len(header):
+            yield start, f"Expected {len(header)} fields, got {len(values)}"
+        else:
+            yield start, {
+                name: value for name, value in zip(header, values) if value != ""
+            }
+    if record:
+        yield start, "Unterminated quoted field"
+    if header is None:
+        raise ContactFileError(1, "CSV file has no header row")
+
+
+async def read_jsonl(
+    chunks: AsyncIterator[bytes],
+) -> AsyncIterator[tuple[int, object]]:
+    """
+    Reads contacts from a JSON Lines file, one object per line.
+
+    Args:
+        chunks (AsyncIterator[bytes]): The file body.
+
+    Yields:
+        tuple[int, object]: The line of each record and its fields, or an
+        error message.
+
+    Raises:
+        ContactFileError: If a line is too long.
+    """
+    async for number, line in _lines(chunks):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield number, f"Invalid JSON: {e}"
+            continue
+        if isinstance(record, dict):
+            yield number, record
+        else:
+            yield number, "Expected a JSON object"
+
+
+def _vcard_value(value: str) -> str:
+    return _VCARD_ESCAPE.sub(
+        lambda match: "\n" if match[1] in "nN" else match[1], value
+    )
+
+
+def _vcard_contact(properties: dict) -> dict:
+    record = {}
+    # N: прізвище;ім'я;по батькові;префікс;суфікс
+    name = properties.get("N", "").split(";")
+    last_name = _vcard_value(name[0]).strip()
+    first_name = _vcard_value(name[1]).strip() if len(name) > 1 else ""
+    if not (first_name or last_name) and "FN" in properties:
+        first_name, _, last_name = _vcard_value(properties["FN"]).strip().partition(" ")
+    if first_name:
+        record["first_name"] = first_name
+    if last_name:
+        record["last_name"] = last_name
+    for prop, field in (("EMAIL", "email"), ("TEL", "phone_number"), ("NOTE", "note")):
+        if prop in properties:
+            record[field] = _vcard_value(properties[prop]).strip()
+    if "BDAY" in properties:
+        birthday = properties["BDAY"].strip()
+        # vCard 3.0 дозволяє базовий формат 19900515
+        if re.fullmatch(r"\d{8}", birthday):
+            birthday = f"{birthday[:4]}-{birthday[4:6]}-{birthday[6:]}"
+        record["birth_date"] = birthday
+    return record
+
+
+async def read_vcard(
+    chunks: AsyncIterator[bytes],
+) -> AsyncIterator[tuple[int, object]]:
+    """
+    Reads contacts from a vCard file.
+
+    ``N`` (or ``FN``), the first ``EMAIL`` and ``TEL``, ``BDAY`` and ``NOTE`` are
+    imported; other properties, such as embedded photos, are skipped unread.
+
+    Args:
+        chunks (AsyncIterator[bytes]): The file body.
+
+    Yields:
+        tuple[int, object]: The line of each card's ``BEGIN`` and its fields.
+
+    Raises:
+        ContactFileError: If a card is too long or is not closed.
+    """
+    properties, start, current, size = None, 0, None, 0
+    async for number, line in _lines(chunks):
+        # Згорнутий рядок продовжує попередню властивість
+        if line[:1] in (" ", "\t"):
+            if current is not None:
+                properties[current] += line[1:]
+                size += len(line)
+                if size > MAX_RECORD_LENGTH:
+                    raise ContactFileError(start, "Card is too long")
+            continue
+        current = None
+        if properties is None:
+            if line.strip().upper() == "BEGIN:VCARD":
+                properties, start, size = {}, number, 0
+            continue
+        name, _, value = line.partition(":")
+        # Група (item1.EMAIL) і параметри (EMAIL;TYPE=work) не впливають на поле
+        name = name.split(";")[0].rpartition(".")[2].strip().upper()
+        if name == "END" and value.strip().upper() == "VCARD":
+            yield start, _vcard_contact(properties)
+            properties = None
+        elif name in _VCARD_PROPERTIES and name not in properties:
+            properties[name], current = value, name
+            size += len(line)
+            if size > MAX_RECORD_LENGTH:
+                raise ContactFileError(start, "Card is too long")
+    if properties is not None:
+        raise ContactFileError(start, "Card is missing END:VCARD")
+
+
+READERS = {"csv": read_csv, "jsonl": read_jsonl, "vcard": read_vcard}
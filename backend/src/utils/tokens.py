@@ -28,6 +28,32 @@ async def create_access_token(data: dict, expires_delta: Optional[int] = None) -
     return encoded_jwt
 
 
+def principal_claims(user) -> dict:
+    """
+    Builds the payload of an access or refresh token for a user.
+
+    With ``JWT_CLAIMS_PRINCIPAL`` enabled the payload also carries the user id,
+    role, verification flag and token version; otherwise only the subject.
+
+    Args:
+        user: The ORM user the token is issued for.
+
+    Returns:
+        dict: The token payload without ``exp``.
+    """
+    claims = {"sub": user.username}
+    if config.JWT_CLAIMS_PRINCIPAL:
+        claims.update(
+            {
+                "uid": user.id,
+                "role": user.role.value,
+                "vrf": bool(user.is_verified),
+                "ver": user.token_version,
+            }
+        )
+    return claims
+
+
 async def generate_verification_token(email: str) -> str:
     """
     Generates a verification token for email verification.
@@ -1,7 +1,6 @@
 import asyncio
 import pickle
-from unittest.mock import patch, AsyncMock
-import time
+from unittest.mock import patch
 from sqlalchemy.future import select
 
 import pytest
@@ -12,7 +11,8 @@ from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, Asyn
 
 from main import app
 from src.database.models import Base, User, UserRole
-from src.database.db import get_db
+from src.database.db import get_db, get_read_db
+from src.core.memory_redis import MemoryRedis
 from src.services.auth import Hash
 from src.utils.tokens import create_access_token
 
@@ -36,6 +36,7 @@ async def override_get_db():
 
 
 app.dependency_overrides[get_db] = override_get_db
+app.dependency_overrides[get_read_db] = override_get_db
 
 test_user = {
     "username": "deadpool",
@@ -93,6 +94,7 @@ def client():
         
     
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
 
     client = TestClient(app)
     yield client
@@ -112,51 +114,22 @@ async def get_token_admin(init_models_wrap):
 
 @pytest.fixture(autouse=True)
 def mock_redis_client():
+    # Справжня семантика Redis (TTL, хеші, скрипти лімітера) без сервера
+    redis = MemoryRedis()
     targets = [
-        "src.services.auth.redis_client",
-        "src.api.users.redis_client",
+        "src.core.user_cache.redis_client",
+        "src.core.user_cache.pubsub_client",
+        "src.core.rate_limiter.redis_client",
+        "src.core.token_versions.redis_client",
+        "src.core.suggest_index.redis_client",
+        "src.core.suggest_index.pubsub_client",
+        "src.core.birthday_store.redis_client",
     ]
-    patchers = [patch(target, new_callable=AsyncMock) for target in targets]
-    mocks = [p.start() for p in patchers]
-
-    store = {}
-
-    async def fake_get(key):
-        data = store.get(key)
-        if data:
-            value, expires_at = data
-            if expires_at > time.time():
-                return str(value)
-            else:
-                del store[key]
-        return None
-
-    async def fake_set(key, value, ex=None):
-        expires_at = time.time() + ex if ex else float("inf")
-        store[key] = (int(value), expires_at)
-        return True
-
-    async def fake_incr(key):
-        value, expires_at = store.get(key, (0, float("inf")))
-        value += 1
-        store[key] = (value, expires_at)
-        return value
-
-    async def fake_delete(key):
-        return store.pop(key, None)
-
-    for mock in mocks:
-        mock.get.side_effect = fake_get
-        mock.set.side_effect = fake_set
-        mock.incr.side_effect = fake_incr
-        mock.delete.side_effect = fake_delete
-
-        # залишаєш старі заглушки, якщо десь ще використовуються
-        mock.hgetall.return_value = {}
-        mock.hset.return_value = True
-        mock.expire.return_value = True
-
-    yield mocks[0]
+    patchers = [patch(target, new=redis) for target in targets]
+    for p in patchers:
+        p.start()
+
+    yield redis
 
     for p in patchers:
         p.stop()
@@ -5,7 +5,7 @@ from sqlalchemy import select
 
 from src.database.models import User
 from tests.api.conftest import TestingSessionLocal
-from src.utils.tokens import generate_verification_token
+from src.utils.tokens import create_access_token, generate_verification_token
 
 import pytest
 
@@ -74,6 +74,47 @@ async def test_verify_email(client):
     assert response.json()["message"] == "Email verified successfully"
 
 
+@pytest.mark.asyncio
+async def test_verify_email_revokes_tokens_with_stale_claim(client):
+    async with TestingSessionLocal() as session:
+        user = User(
+            username="unverified",
+            email="unverified@example.com",
+            hashed_password="x",
+            is_verified=False,
+        )
+        session.add(user)
+        await session.commit()
+        await session.refresh(user)
+    # Токен, виданий до підтвердження, несе vrf=false
+    access_token = await create_access_token(
+        data={
+            "sub": user.username,
+            "uid": user.id,
+            "role": user.role.value,
+            "vrf": False,
+            "ver": user.token_version,
+        }
+    )
+    headers = {"Authorization": f"Bearer {access_token}"}
+    verification = await generate_verification_token(user.email)
+
+    before = client.get("/api/contacts/", headers=headers)
+    first = client.get(f"auth/verify-email?token={verification}")
+    after = client.get("/api/contacts/", headers=headers)
+    again = client.get(f"auth/verify-email?token={verification}")
+
+    assert before.status_code == 200
+    assert first.status_code == 200
+    assert after.status_code == 401
+    assert again.status_code == 200
+    async with TestingSessionLocal() as session:
+        verified = await session.get(User, user.id)
+    assert verified.is_verified
+    # Повторне підтвердження не відкликає нові токени
+    assert verified.token_version == user.token_version + 1
+
+
 @pytest.mark.asyncio
 async def test_password_reset_email(client):
     response = client.post(
@@ -99,3 +140,71 @@ async def test_password_reset_confirm(client):
 
     assert response.status_code == 200
     assert response.json()["message"] == "Password reset successfully"
+
+
+@pytest.mark.asyncio
+async def test_login_rehashes_outdated_hash(client):
+    from src.core.hashing import build_pwd_context, pwd_context
+
+    async with TestingSessionLocal() as session:
+        session.add(
+            User(
+                username="legacy",
+                email="legacy@example.com",
+                hashed_password=build_pwd_context("bcrypt", 4).hash("oldcost123"),
+                is_verified=True,
+            )
+        )
+        await session.commit()
+
+    response = client.post(
+        "/auth/login", data={"username": "legacy", "password": "oldcost123"}
+    )
+    assert response.status_code == 200
+
+    async with TestingSessionLocal() as session:
+        user = (
+            await session.execute(select(User).filter_by(username="legacy"))
+        ).scalar_one()
+    assert not pwd_context.needs_update(user.hashed_password)
+    assert pwd_context.verify("oldcost123", user.hashed_password)
+
+
+@pytest.mark.asyncio
+async def test_claims_token_revoked_after_password_reset(client, monkeypatch):
+    from jose import jwt
+    from src.conf.config import config
+    from src.services.auth import Hash
+
+    monkeypatch.setattr(config, "JWT_CLAIMS_PRINCIPAL", True)
+    async with TestingSessionLocal() as session:
+        session.add(
+            User(
+                username="claims",
+                email="claims@example.com",
+                hashed_password=Hash().get_password_hash("claims123"),
+                is_verified=True,
+            )
+        )
+        await session.commit()
+
+    response = client.post(
+        "/auth/login", data={"username": "claims", "password": "claims123"}
+    )
+    assert response.status_code == 200
+    access_token = response.json()["access_token"]
+    claims = jwt.get_unverified_claims(access_token)
+    assert claims["role"] == "user"
+    assert claims["ver"] == 0
+
+    headers = {"Authorization": f"Bearer {access_token}"}
+    assert client.get("/api/contacts/", headers=headers).status_code == 200
+
+    reset_token = generate_password_reset_token("claims@example.com")
+    response = client.post(
+        "/auth/password-reset-confirm",
+        json={"token": reset_token, "new_password": "newclaims123"},
+    )
+    assert response.status_code == 200
+
+    assert client.get("/api/contacts/", headers=headers).status_code == 401
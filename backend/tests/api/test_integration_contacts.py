@@ -1,9 +1,13 @@
 import pytest
+from unittest.mock import patch
 from httpx import AsyncClient, ASGITransport
+from sqlalchemy import select
 
 from main import app
 from src.utils.tokens import create_access_token
+from src.core.birthday_store import birthday_store
 from src.database.models import Contact
+from src.services.birthdays import refresh_upcoming_birthdays
 from tests.api.conftest import TestingSessionLocal
 from datetime import date, timedelta
 
@@ -40,6 +44,13 @@ def test_read_contacts(client, get_token):
     assert response.status_code == 200
 
 
+@pytest.mark.parametrize("query", ["limit=0", "limit=-1", "limit=1001", "skip=-1"])
+def test_read_contacts_rejects_out_of_range_paging(client, get_token, query):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    response = client.get(f"api/contacts/?{query}", headers=headers)
+    assert response.status_code == 422
+
+
 def test_get_contact(client, get_token):
     response = client.get(
         "/api/contacts/1", headers={"Authorization": f"Bearer {get_token}"}
@@ -97,6 +108,46 @@ async def test_update_contact(client, get_token):
     assert response.json()["first_name"] == "Nat"
 
 
+@pytest.mark.asyncio
+async def test_patch_contact(client, get_token):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    contact_data = {
+        "first_name": "Wanda",
+        "last_name": "Maximoff",
+        "email": "wanda@avengers.com",
+        "phone_number": "123-000-0002",
+        "birth_date": "1989-02-10",
+        "note": "Westview",
+    }
+    transport = ASGITransport(app=app)
+
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        create_response = await ac.post(
+            "/api/contacts/", json=contact_data, headers=headers
+        )
+        contact_id = create_response.json()["id"]
+
+        response = await ac.patch(
+            f"/api/contacts/{contact_id}",
+            json={"phone_number": "999-000-0002", "note": None},
+            headers=headers,
+        )
+        rejected = await ac.patch(
+            f"/api/contacts/{contact_id}", json={"email": None}, headers=headers
+        )
+        missing = await ac.patch(
+            "/api/contacts/999999", json={"note": "x"}, headers=headers
+        )
+
+    assert response.status_code == 200
+    assert response.json()["phone_number"] == "999-000-0002"
+    assert response.json()["note"] is None
+    assert response.json()["email"] == "wanda@avengers.com"
+    assert response.json()["first_name"] == "Wanda"
+    assert rejected.status_code == 422
+    assert missing.status_code == 404
+
+
 @pytest.mark.asyncio
 async def test_delete_contact(client, get_token):
     token = get_token
@@ -121,6 +172,48 @@ async def test_delete_contact(client, get_token):
     assert response.json()["email"] == "loki@asgard.com"
 
 
+@pytest.mark.asyncio
+async def test_suggest_follows_contact_writes(client, get_token):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    contact_data = {
+        "first_name": "Thor",
+        "last_name": "Typeahead",
+        "email": "thor@typeahead.com",
+        "phone_number": "555-8001",
+        "birth_date": "1000-01-01",
+    }
+    transport = ASGITransport(app=app)
+
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        created = await ac.post("/api/contacts/", json=contact_data, headers=headers)
+        contact_id = created.json()["id"]
+        first = await ac.get("/api/contacts/suggest?q=TH%20type", headers=headers)
+        await ac.patch(
+            f"/api/contacts/{contact_id}",
+            json={"first_name": "Odin"},
+            headers=headers,
+        )
+        renamed = await ac.get("/api/contacts/suggest?q=typeahead", headers=headers)
+        new_name = await ac.get("/api/contacts/suggest?q=odin%20ty", headers=headers)
+        await ac.delete(f"/api/contacts/{contact_id}", headers=headers)
+        deleted = await ac.get("/api/contacts/suggest?q=typeahead", headers=headers)
+        empty = await ac.get("/api/contacts/suggest?q=", headers=headers)
+
+    assert first.status_code == 200
+    assert first.json() == [
+        {
+            "id": contact_id,
+            "first_name": "Thor",
+            "last_name": "Typeahead",
+            "email": "thor@typeahead.com",
+        }
+    ]
+    assert [c["first_name"] for c in renamed.json()] == ["Odin"]
+    assert [c["id"] for c in new_name.json()] == [contact_id]
+    assert deleted.json() == []
+    assert empty.status_code == 422
+
+
 @pytest.mark.asyncio
 async def test_search_contacts(client, get_token):
     token = get_token
@@ -156,10 +249,17 @@ async def test_search_contacts(client, get_token):
             "/api/contacts/search/?first_name=bruce",
             headers={"Authorization": f"Bearer {token}"},
         )
+        wildcard = await ac.get(
+            "/api/contacts/search/",
+            params={"email": "%_"},
+            headers={"Authorization": f"Bearer {token}"},
+        )
     assert response.status_code == 200
     data = response.json()
     assert isinstance(data, list)
     assert any("Bruce" in c["first_name"] for c in data)
+    # Символи шаблону шукаються буквально
+    assert wildcard.json() == []
 
 
 @pytest.mark.asyncio
@@ -193,3 +293,366 @@ async def test_get_upcoming_birthdays(client, get_token):
     result = response.json()
     assert isinstance(result, list)
     assert any("birthday@example.com" in c["email"] for c in result)
+
+
+def _fixed_today(value: date):
+    # Сервіс рахує вікно від date.today()
+    class FixedDate(date):
+        @classmethod
+        def today(cls):
+            return value
+
+    return patch("src.services.contacts.date", FixedDate)
+
+
+@pytest.mark.asyncio
+async def test_upcoming_birthdays_wrap_year_and_leap_day(client, get_token):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    birthdays = {
+        "dec28": date(1990, 12, 28),
+        "dec30": date(1985, 12, 30),
+        "dec31": date(2001, 12, 31),
+        "jan03": date(1970, 1, 3),
+        "jan10": date(1999, 1, 10),
+        "feb28": date(1995, 2, 28),
+        "feb29": date(2000, 2, 29),
+        "mar01": date(1991, 3, 1),
+    }
+    async with TestingSessionLocal() as session:
+        session.add_all(
+            Contact(
+                first_name=name,
+                last_name="Calendar",
+                email=f"{name}@calendar.com",
+                phone_number="555-9000",
+                birth_date=birth_date,
+                user_id=1,
+            )
+            for name, birth_date in birthdays.items()
+        )
+        await session.commit()
+        names = {
+            contact.id: contact.first_name
+            for contact in (
+                await session.execute(
+                    select(Contact).filter_by(last_name="Calendar")
+                )
+            ).scalars()
+        }
+
+    def calendar_names(ids):
+        return [names[contact_id] for contact_id in ids if contact_id in names]
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        with _fixed_today(date(2027, 12, 29)):
+            new_year = await _follow_pages(
+                ac, "/api/contacts/birthdays/?days=7&limit=2", headers
+            )
+        with _fixed_today(date(2027, 2, 22)):
+            non_leap = await ac.get("/api/contacts/birthdays/?days=6", headers=headers)
+        with _fixed_today(date(2028, 2, 22)):
+            leap = await ac.get("/api/contacts/birthdays/?days=6", headers=headers)
+
+    # Січень іде після грудня, курсор переходить через Новий рік
+    assert calendar_names(new_year) == ["dec30", "dec31", "jan03"]
+    # 29 лютого святкують 28-го, коли року без 29-го
+    assert calendar_names(c["id"] for c in non_leap.json()) == ["feb28", "feb29"]
+    assert calendar_names(c["id"] for c in leap.json()) == ["feb28"]
+
+
+@pytest.mark.asyncio
+async def test_upcoming_birthdays_served_from_daily_store(client, get_token):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    today = date(2029, 12, 29)
+    async with TestingSessionLocal() as session:
+        session.add_all(
+            Contact(
+                first_name=name,
+                last_name="Digest",
+                email=f"{name}@digest.com",
+                phone_number="555-9100",
+                birth_date=birth_date,
+                user_id=1,
+            )
+            for name, birth_date in {
+                "dec31": date(1980, 12, 31),
+                "jan02": date(1981, 1, 2),
+                "jun01": date(1982, 6, 1),
+            }.items()
+        )
+        await session.commit()
+        stored = await refresh_upcoming_birthdays(session, today)
+
+    def digest_names(response):
+        return [c["first_name"] for c in response.json() if c["last_name"] == "Digest"]
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        hits = birthday_store.hits
+        with _fixed_today(today):
+            before = await ac.get("/api/contacts/birthdays/?days=7", headers=headers)
+            created = await ac.post(
+                "/api/contacts/",
+                json={
+                    "first_name": "dec30",
+                    "last_name": "Digest",
+                    "email": "dec30@digest.com",
+                    "phone_number": "555-9101",
+                    "birth_date": "1983-12-30",
+                },
+                headers=headers,
+            )
+            await ac.patch(
+                f"/api/contacts/{created.json()['id']}",
+                json={"first_name": "dec30b"},
+                headers=headers,
+            )
+            after = await ac.get("/api/contacts/birthdays/?days=7", headers=headers)
+            paged = await _follow_pages(
+                ac, "/api/contacts/birthdays/?days=7&limit=1", headers
+            )
+
+    assert stored >= 2
+    assert digest_names(before) == ["dec31", "jan02"]
+    assert digest_names(after) == ["dec30b", "dec31", "jan02"]
+    # Сторінки за курсором ідуть у тому ж порядку
+    assert paged == [c["id"] for c in after.json()]
+    # Усі запити обслужено зі сховища, без запиту вікна до БД
+    assert birthday_store.hits - hits == 2 + len(paged) + 1
+
+
+async def _follow_pages(ac, url, headers) -> list[int]:
+    # Проходимо всі сторінки за заголовком Link
+    ids = []
+    while url:
+        response = await ac.get(url, headers=headers)
+        assert response.status_code == 200
+        ids.extend(c["id"] for c in response.json())
+        link = response.headers.get("link")
+        url = link[1 : link.index(">")] if link else None
+    return ids
+
+
+@pytest.mark.asyncio
+async def test_cursor_pagination_follows_link_header(client, get_token):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    async with TestingSessionLocal() as session:
+        session.add_all(
+            Contact(
+                first_name=f"Page{i}",
+                last_name="Cursor",
+                email=f"page{i}@cursor.com",
+                phone_number=f"555-{i:04d}",
+                birth_date=date.today() + timedelta(days=i % 3),
+                user_id=1,
+            )
+            for i in range(5)
+        )
+        await session.commit()
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        searched = await _follow_pages(
+            ac, "/api/contacts/search/?last_name=Cursor&limit=2", headers
+        )
+        birthdays = await _follow_pages(
+            ac, "/api/contacts/birthdays/?days=7&limit=2", headers
+        )
+        first = await ac.get(
+            "/api/contacts/search/?last_name=Cursor&limit=2", headers=headers
+        )
+        link = first.headers["link"]
+        by_cursor = await ac.get(link[1 : link.index(">")], headers=headers)
+        by_offset = await ac.get(
+            "/api/contacts/search/?last_name=Cursor&limit=2&skip=2", headers=headers
+        )
+        bad = await ac.get("/api/contacts/?cursor=bogus", headers=headers)
+        other_filter = await ac.get(
+            link[1 : link.index(">")].replace("last_name=Cursor", "first_name=Page1"),
+            headers=headers,
+        )
+        first = await ac.get("/api/contacts/birthdays/?days=7&limit=1", headers=headers)
+        birthday_link = first.headers["link"]
+        other_days = await ac.get(
+            birthday_link[1 : birthday_link.index(">")].replace("days=7", "days=6"),
+            headers=headers,
+        )
+
+    assert len(searched) == len(set(searched)) == 5
+    assert len(birthdays) == len(set(birthdays))
+    assert set(searched) <= set(birthdays)
+    assert "skip" not in link
+    assert [c["id"] for c in by_cursor.json()] == [c["id"] for c in by_offset.json()]
+    assert bad.status_code == 400
+    assert other_filter.status_code == 400
+    assert other_days.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_sorted_listing_pages_by_cursor(client, get_token):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    async with TestingSessionLocal() as session:
+        session.add_all(
+            Contact(
+                first_name="Sorted",
+                last_name=last_name,
+                email=f"{last_name.lower()}@sorted.com",
+                phone_number="555-0000",
+                birth_date=date(1990, 1, 1),
+                user_id=1,
+            )
+            for last_name in ("Young", "Adams", "Moss", "Adams2", "Zimmer")
+        )
+        await session.commit()
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        listed = await ac.get(
+            "/api/contacts/?sort=last_name&order=desc&limit=1000", headers=headers
+        )
+        paged = await _follow_pages(
+            ac, "/api/contacts/?sort=last_name&order=desc&limit=2", headers
+        )
+        by_created = await _follow_pages(
+            ac, "/api/contacts/?sort=created_at&limit=3", headers
+        )
+        first = await ac.get(
+            "/api/contacts/?sort=created_at&limit=1", headers=headers
+        )
+        link = first.headers["link"]
+        other_sort = await ac.get(
+            link[1 : link.index(">")].replace("created_at", "birth_date"),
+            headers=headers,
+        )
+        invalid = await ac.get("/api/contacts/?sort=note", headers=headers)
+
+    names = [c["last_name"] for c in listed.json()]
+    assert names == sorted(names, reverse=True)
+    assert paged == [c["id"] for c in listed.json()]
+    assert sorted(by_created) == sorted(paged)
+    assert other_sort.status_code == 400
+    assert invalid.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_ranked_search_over_all_fields(client, get_token):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    async with TestingSessionLocal() as session:
+        session.add_all(
+            [
+                Contact(
+                    first_name="Quill",
+                    last_name="Ranked",
+                    email="starlord@ranked.com",
+                    phone_number="555-7001",
+                    birth_date=date(1980, 1, 1),
+                    note="Guardians",
+                    user_id=1,
+                ),
+                Contact(
+                    first_name="Gamora",
+                    last_name="Ranked",
+                    email="gamora@ranked.com",
+                    phone_number="555-7002",
+                    birth_date=date(1981, 1, 1),
+                    note="Quill's friend",
+                    user_id=1,
+                ),
+                Contact(
+                    first_name="Quill",
+                    last_name="Quillson",
+                    email="quill@quill.com",
+                    phone_number="555-7003",
+                    birth_date=date(1982, 1, 1),
+                    user_id=1,
+                ),
+            ]
+        )
+        await session.commit()
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        ranked = await ac.get("/api/contacts/search/?q=quill", headers=headers)
+        by_phone = await ac.get("/api/contacts/search/?q=555-7002", headers=headers)
+        paged = await _follow_pages(
+            ac, "/api/contacts/search/?q=quill&limit=1", headers
+        )
+        mixed = await ac.get(
+            "/api/contacts/search/?q=quill&first_name=quill", headers=headers
+        )
+
+    emails = [c["email"] for c in ranked.json()]
+    assert emails[0] == "quill@quill.com"  # збіг у трьох полях
+    assert set(emails) == {
+        "quill@quill.com",
+        "starlord@ranked.com",
+        "gamora@ranked.com",
+    }
+    assert [c["first_name"] for c in by_phone.json()] == ["Gamora"]
+    assert paged == [c["id"] for c in ranked.json()]
+    assert mixed.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_import_contacts_streams_file_in_batches(client, get_token):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    rows = [
+        "first_name,last_name,email,phone_number,birth_date,note",
+        "Peter,Parker,spidey@import.com,555-7001,2001-08-10,",
+        'Mary Jane,Watson,mj@import.com,555-7002,2000-06-01,"Tiger,\nface"',
+        "Harry,Osborn,harry@import.com,555-7003,not-a-date,",
+        "Peter,Again,spidey@import.com,555-7004,2001-08-10,",
+        "Bruce,Wayne,batman@example.com,555-7005,1980-01-01,",
+        "Short,Row",
+    ]
+    body = "\r\n".join(rows).encode()
+
+    async def chunks():
+        # Тіло надходить частинами, як у справжньому завантаженні
+        for start in range(0, len(body), 16):
+            yield body[start : start + 16]
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        response = await ac.post(
+            "/api/contacts/import",
+            content=chunks(),
+            headers={**headers, "Content-Type": "text/csv; charset=utf-8"},
+        )
+        jsonl = await ac.post(
+            "/api/contacts/import?format=jsonl",
+            content=b'{"first_name": "Miles", "last_name": "Morales", '
+            b'"email": "miles@import.com", "phone_number": "555-7006", '
+            b'"birth_date": "2003-03-03"}\n',
+            headers=headers,
+        )
+        unknown = await ac.post(
+            "/api/contacts/import", content=b"{}", headers=headers
+        )
+        suggested = await ac.get("/api/contacts/suggest?q=parker", headers=headers)
+
+    assert response.status_code == 200, response.text
+    report = response.json()
+    assert report["imported"] == 2
+    assert report["failed"] == 4
+    assert [error["line"] for error in report["errors"]] == [5, 6, 8, 7]
+    assert report["errors"][3]["errors"] == ["Contact with this email already exists"]
+    assert jsonl.json() == {"imported": 1, "failed": 0, "errors": []}
+    assert unknown.status_code == 415
+    assert [c["email"] for c in suggested.json()] == ["spidey@import.com"]
+    async with TestingSessionLocal() as session:
+        imported = (
+            await session.execute(
+                select(Contact).where(Contact.email.like("%@import.com"))
+            )
+        ).scalars().all()
+    assert {c.email for c in imported} == {
+        "spidey@import.com",
+        "mj@import.com",
+        "miles@import.com",
+    }
+    mj = next(c for c in imported if c.email == "mj@import.com")
+    assert mj.note == "Tiger,\nface"
+    assert mj.birthday_md == 601
+    assert mj.user_id == 1
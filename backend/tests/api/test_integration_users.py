@@ -85,3 +85,18 @@ async def test_update_avatar_for_non_admin(client, get_token):
     )
 
 
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_headers(client, get_token):
+    headers = {"Authorization": f"Bearer {get_token}"}
+    response = client.get("/api/users/me", headers=headers)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["X-RateLimit-Limit"] == "10"
+    assert response.headers["X-RateLimit-Remaining"] == "9"
+
+    for _ in range(9):
+        client.get("/api/users/me", headers=headers)
+    response = client.get("/api/users/me", headers=headers)
+    assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+    assert "Retry-After" in response.headers
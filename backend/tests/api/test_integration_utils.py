@@ -0,0 +1,13 @@
+def test_metrics_require_admin(client, get_token, get_token_admin):
+    anonymous = client.get("/api/metrics")
+    user = client.get(
+        "/api/metrics", headers={"Authorization": f"Bearer {get_token}"}
+    )
+    admin = client.get(
+        "/api/metrics", headers={"Authorization": f"Bearer {get_token_admin}"}
+    )
+
+    assert anonymous.status_code == 401
+    assert user.status_code == 403
+    assert admin.status_code == 200, admin.text
+    assert "database" in admin.json()
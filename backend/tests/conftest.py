@@ -0,0 +1,73 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from src.core.birthday_store import birthday_store
+from src.core.jwt_cache import jwt_cache
+from src.core.rate_limiter import clear_local_rate_limits
+from src.core.recent_writes import recent_writes
+from src.core.redis_batch import redis_breaker
+from src.core.suggest_index import suggest_index
+from src.core.user_cache import user_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_local_caches():
+    # Локальні кеші живуть у процесі, тож ізолюємо тести один від одного
+    user_cache.clear()
+    jwt_cache.clear()
+    clear_local_rate_limits()
+    recent_writes.clear()
+    suggest_index.clear()
+    birthday_store.clear()
+    redis_breaker.reset()
+    yield
+    user_cache.clear()
+    jwt_cache.clear()
+    clear_local_rate_limits()
+    recent_writes.clear()
+    suggest_index.clear()
+    birthday_store.clear()
+
+
+class FakePipeline:
+    # Черга команд, що виконуються на мок-клієнті при execute()
+    def __init__(self, client):
+        self.client = client
+        self.commands = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.commands.append((name, args, kwargs))
+            return self
+
+        return queue
+
+    def __len__(self):
+        return len(self.commands)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.commands = []
+
+    async def execute(self, raise_on_error=True):
+        results = []
+        for name, args, kwargs in self.commands:
+            try:
+                results.append(await getattr(self.client, name)(*args, **kwargs))
+            except Exception as e:
+                if raise_on_error:
+                    raise
+                results.append(e)
+        self.commands = []
+        return results
+
+
+@pytest.fixture
+def redis_mock():
+    client = AsyncMock()
+    client.pipeline = MagicMock(
+        side_effect=lambda transaction=True: FakePipeline(client)
+    )
+    return client
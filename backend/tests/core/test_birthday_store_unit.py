@@ -0,0 +1,215 @@
+import pytest
+from datetime import date
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+from redis.exceptions import ConnectionError
+
+from src.core.birthday_store import (
+    GENERATION_TTL,
+    POINTER_KEY,
+    BirthdayStore,
+    birthday_score,
+    next_birthday,
+)
+from src.core.memory_redis import MemoryRedis
+
+TODAY = date(2027, 12, 29)
+
+
+@pytest.fixture
+def redis():
+    redis = MemoryRedis()
+    with patch("src.core.birthday_store.redis_client", new=redis):
+        yield redis
+
+
+@pytest.fixture
+def store(redis):
+    return BirthdayStore(horizon=10)
+
+
+async def build(store, birthdays, today=TODAY):
+    generation = await store.begin_build(today)
+    await store.store_batch(generation, birthdays)
+    await store.finish_build(generation)
+    return generation
+
+
+def contact(id, birth_date):
+    return SimpleNamespace(id=id, birth_date=birth_date)
+
+
+async def window_ids(store, user_id, days, skip=0, limit=10, after=None):
+    page = await store.window(user_id, TODAY, days, skip, limit, after)
+    return None if page is None else [contact_id for contact_id, _ in page]
+
+
+def test_next_birthday():
+    assert next_birthday(date(1990, 12, 30), TODAY) == date(2027, 12, 30)
+    assert next_birthday(date(1990, 1, 3), TODAY) == date(2028, 1, 3)
+    assert next_birthday(date(1990, 12, 29), TODAY) == TODAY
+    # 29 лютого у невисокосний рік припадає на 28-ме
+    assert next_birthday(date(2000, 2, 29), date(2027, 2, 1)) == date(2027, 2, 28)
+    assert next_birthday(date(2000, 2, 29), date(2028, 2, 1)) == date(2028, 2, 29)
+
+
+@pytest.mark.asyncio
+async def test_window_reads_the_built_generation(store):
+    assert await window_ids(store, 1, 7) is None  # ще не побудовано
+
+    await build(
+        store,
+        {
+            1: {5: date(2028, 1, 3).toordinal(), 4: date(2027, 12, 30).toordinal()},
+            2: {9: date(2027, 12, 31).toordinal()},
+        },
+    )
+
+    assert await window_ids(store, 1, 7) == [4, 5]
+    assert await window_ids(store, 1, 2) == [4]
+    assert await window_ids(store, 3, 7) == []
+    # Вікно за межами горизонту не покрите
+    assert await window_ids(store, 1, 11) is None
+    assert store.hits == 3
+    assert store.misses == 2
+
+
+@pytest.mark.asyncio
+async def test_only_one_build_per_day(store):
+    generation = await store.begin_build(TODAY)
+
+    assert await store.begin_build(TODAY) is None  # інший воркер уже будує
+    await store.finish_build(generation)
+    assert await store.begin_build(TODAY) is None  # уже побудовано
+
+
+@pytest.mark.asyncio
+async def test_aborted_build_can_be_retried(store, redis):
+    generation = await store.begin_build(TODAY)
+    await store.abort_build(generation)
+
+    assert await store.begin_build(TODAY) == generation
+    assert "building" in await redis.hgetall(POINTER_KEY)
+
+
+@pytest.mark.asyncio
+async def test_corrections_follow_contact_writes(store):
+    await build(store, {1: {4: date(2027, 12, 30).toordinal()}})
+
+    await store.contact_saved(1, contact(6, date(1980, 1, 2)), TODAY)
+    await store.contact_saved(1, contact(4, date(1980, 6, 1)), TODAY)  # поза вікном
+    assert await window_ids(store, 1, 7) == [6]
+
+    await store.contact_removed(1, 6)
+    assert await window_ids(store, 1, 7) == []
+    assert store.corrections == 3
+
+
+@pytest.mark.asyncio
+async def test_corrections_reach_the_generation_being_built(store):
+    await build(store, {}, today=date(2027, 12, 28))
+    generation = await store.begin_build(TODAY)
+
+    await store.contact_saved(1, contact(6, date(1980, 1, 2)), TODAY)
+    await store.finish_build(generation)
+
+    assert await window_ids(store, 1, 7) == [6]
+
+
+@pytest.mark.asyncio
+async def test_corrections_without_generation_are_noops(store, redis):
+    await store.contact_saved(1, contact(6, date(1980, 1, 2)), TODAY)
+
+    assert await redis.dbsize() == 0
+    assert store.corrections == 0
+
+
+@pytest.mark.asyncio
+async def test_redis_failure_falls_back(store):
+    failing = AsyncMock()
+    failing.hgetall.side_effect = ConnectionError("down")
+    with patch("src.core.birthday_store.redis_client", new=failing):
+        assert await window_ids(store, 1, 7) is None
+        await store.contact_removed(1, 6)
+
+    assert store.redis_errors == 2
+
+
+@pytest.mark.asyncio
+async def test_bulk_corrections_use_one_pipeline(store):
+    await build(store, {1: {4: date(2027, 12, 30).toordinal()}})
+
+    await store.contacts_saved(
+        1,
+        [
+            contact(6, date(1980, 1, 2)),
+            contact(7, date(1981, 12, 31)),
+            contact(4, date(1980, 6, 1)),  # поза вікном
+        ],
+        TODAY,
+    )
+
+    assert await window_ids(store, 1, 7) == [7, 6]
+    assert store.corrections == 1
+
+
+@pytest.mark.asyncio
+async def test_corrections_keep_generation_keys_expiring(store, redis):
+    generation = await build(store, {})
+
+    # У поколінні ще немає множини користувача, тож її створює корекція
+    await store.contact_saved(1, contact(6, date(1980, 1, 2)), TODAY)
+
+    ttl = await redis.ttl(f"birthdays:{generation}:1")
+    assert 0 < ttl <= GENERATION_TTL
+
+
+def test_birthday_score_orders_moved_leap_day_after_the_28th():
+    today = date(2027, 2, 1)
+    feb28 = birthday_score(date(1990, 2, 28), today)
+
+    assert feb28 == date(2027, 2, 28).toordinal()
+    assert birthday_score(date(2000, 2, 29), today) == feb28 + 0.5
+    assert birthday_score(date(2000, 2, 29), date(2028, 2, 1)) == (
+        date(2028, 2, 29).toordinal()
+    )
+
+
+@pytest.mark.asyncio
+async def test_window_pages_in_the_sorted_set(store):
+    day = date(2027, 12, 30)
+    # Рівні бали йдуть за числовим id, а не за рядком ("10" < "9")
+    await build(
+        store,
+        {
+            1: {
+                10: birthday_score(day, TODAY),
+                9: birthday_score(day, TODAY),
+                2: birthday_score(date(2028, 1, 2), TODAY),
+                3: birthday_score(TODAY, TODAY),
+            }
+        },
+    )
+
+    assert await window_ids(store, 1, 7) == [3, 9, 10, 2]
+    assert await window_ids(store, 1, 7, skip=1, limit=2) == [9, 10]
+    after = (birthday_score(day, TODAY), 9)
+    assert await window_ids(store, 1, 7, limit=2, after=after) == [10, 2]
+    assert await window_ids(store, 1, 7, limit=1, after=after) == [10]
+    last = (birthday_score(date(2028, 1, 2), TODAY), 2)
+    assert await window_ids(store, 1, 7, after=last) == []
+    page = await store.window(1, TODAY, 7, 0, 1)
+    assert page == [(3, float(TODAY.toordinal()))]
+
+
+@pytest.mark.asyncio
+async def test_moved_leap_day_on_the_last_day_is_in_the_window(store):
+    today = date(2027, 2, 18)
+    await build(store, {}, today=today)  # покриває до 28 лютого
+
+    await store.contacts_saved(
+        1, [contact(5, date(2000, 2, 29)), contact(4, date(1990, 2, 28))], today
+    )
+
+    page = await store.window(1, today, 10, 0, 10)
+    assert [contact_id for contact_id, _ in page] == [4, 5]
@@ -0,0 +1,29 @@
+import base64
+import pytest
+
+from src.core.cursors import InvalidCursorError, decode_cursor, encode_cursor
+
+
+def test_round_trip():
+    token = encode_cursor("birthdays", [45, 17])
+    assert decode_cursor(token, "birthdays") == [45, 17]
+    assert "=" not in token
+
+
+def test_tampered_cursor_is_rejected():
+    raw = base64.urlsafe_b64decode(encode_cursor("contacts", [10]) + "==")
+    forged = base64.urlsafe_b64encode(raw.replace(b"[10]", b"[99]")).decode()
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(forged, "contacts")
+
+
+def test_cursor_of_another_listing_is_rejected():
+    token = encode_cursor("search", [10])
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(token, "contacts")
+
+
+@pytest.mark.parametrize("token", ["", "not base64!", "QUJD"])
+def test_malformed_cursor_is_rejected(token):
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(token, "contacts")
@@ -0,0 +1,78 @@
+import asyncio
+import threading
+import pytest
+
+from src.core.calibrate_hashing import calibrate
+from src.core.hashing import (
+    HashExecutor,
+    HashQueueFull,
+    build_pwd_context,
+    hash_password,
+    verify_password,
+)
+
+
+@pytest.mark.asyncio
+async def test_run_in_thread_pool_records_latency():
+    executor = HashExecutor(kind="thread", max_workers=1, max_queue=4)
+    try:
+        hashed = await executor.run(hash_password, "secret")
+        assert await executor.run(verify_password, "secret", hashed)
+    finally:
+        executor.shutdown()
+
+    stats = executor.stats()
+    assert stats["completed"] == 2
+    assert stats["in_flight"] == 0
+    assert stats["run_ms"]["p50"] > 0
+
+
+@pytest.mark.asyncio
+async def test_full_queue_sheds_calls():
+    executor = HashExecutor(kind="thread", max_workers=1, max_queue=1)
+    release = threading.Event()
+    try:
+        running = asyncio.ensure_future(executor.run(release.wait))
+        queued = asyncio.ensure_future(executor.run(release.wait))
+        await asyncio.sleep(0)
+        assert executor.queue_depth == 1
+
+        with pytest.raises(HashQueueFull):
+            await executor.run(release.wait)
+        assert executor.rejected == 1
+    finally:
+        release.set()
+        await asyncio.gather(running, queued)
+        executor.shutdown()
+
+
+def test_unknown_kind_rejected():
+    with pytest.raises(ValueError):
+        HashExecutor(kind="gpu", max_workers=1, max_queue=1)
+
+
+def test_context_flags_outdated_cost_for_rehash():
+    legacy_hash = build_pwd_context("bcrypt", 4).hash("secret")
+    context = build_pwd_context("bcrypt", 5)
+
+    verified, new_hash = context.verify_and_update("secret", legacy_hash)
+
+    assert verified
+    assert new_hash.startswith("$2b$05$")
+    assert not context.needs_update(new_hash)
+
+
+def test_context_upgrades_legacy_scheme():
+    legacy_hash = build_pwd_context("bcrypt", 4).hash("secret")
+    context = build_pwd_context("pbkdf2_sha256", 1000)
+
+    verified, new_hash = context.verify_and_update("secret", legacy_hash)
+
+    assert verified
+    assert new_hash.startswith("$pbkdf2-sha256$1000$")
+
+
+def test_calibrate_returns_minimum_for_tiny_target():
+    rounds, elapsed = calibrate("bcrypt", target_seconds=0)
+    assert rounds == 4
+    assert elapsed > 0
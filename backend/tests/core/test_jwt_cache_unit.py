@@ -0,0 +1,64 @@
+import time
+import pytest
+from unittest.mock import patch
+from jose import JWTError, jwt
+
+from src.core.jwt_cache import VerifiedClaimsCache
+
+SECRET = "test-secret"
+ALGORITHM = "HS256"
+
+
+def make_token(sub="testuser", exp_in=3600, secret=SECRET):
+    return jwt.encode(
+        {"sub": sub, "exp": int(time.time()) + exp_in}, secret, algorithm=ALGORITHM
+    )
+
+
+@pytest.fixture
+def cache():
+    return VerifiedClaimsCache(maxsize=100, max_ttl=300)
+
+
+def test_repeat_token_skips_verification(cache):
+    token = make_token()
+    with patch("src.core.jwt_cache.jwt.decode", wraps=jwt.decode) as decode:
+        first = cache.decode(token, SECRET, ALGORITHM)
+        second = cache.decode(token, SECRET, ALGORITHM)
+
+    assert first == second
+    assert first["sub"] == "testuser"
+    decode.assert_called_once()
+
+
+def test_returned_claims_are_copies(cache):
+    token = make_token()
+    cache.decode(token, SECRET, ALGORITHM)["sub"] = "mallory"
+    assert cache.decode(token, SECRET, ALGORITHM)["sub"] == "testuser"
+
+
+def test_partitioned_by_secret(cache):
+    token = make_token()
+    cache.decode(token, SECRET, ALGORITHM)
+    with pytest.raises(JWTError):
+        cache.decode(token, "other-secret", ALGORITHM)
+
+
+def test_entry_does_not_outlive_exp(cache):
+    token = make_token(exp_in=2)
+    cache.decode(token, SECRET, ALGORITHM)
+    ((_, expires_at),) = cache.local._data.values()
+    assert expires_at <= time.monotonic() + 2
+
+
+def test_invalid_token_is_not_cached(cache):
+    with pytest.raises(JWTError):
+        cache.decode("not-a-token", SECRET, ALGORITHM)
+    assert len(cache.local) == 0
+
+
+def test_token_without_exp_is_not_cached(cache):
+    token = jwt.encode({"sub": "testuser"}, SECRET, algorithm=ALGORITHM)
+    assert cache.decode(token, SECRET, ALGORITHM)["sub"] == "testuser"
+    assert len(cache.local) == 0
+    assert cache.uncacheable == 1
@@ -0,0 +1,148 @@
+import pytest
+from unittest.mock import patch
+from redis.exceptions import NoScriptError, ResponseError
+
+from src.core.memory_redis import MemoryRedis, register_script
+from src.core.rate_limiter import ALGORITHMS, RateLimiter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def redis(clock):
+    return MemoryRedis(clock=clock)
+
+
+@pytest.mark.asyncio
+async def test_string_ttl_semantics(redis, clock):
+    await redis.set("a", 1, ex=10)
+    assert await redis.get("a") == "1"
+    assert await redis.ttl("a") == 10
+
+    await redis.incr("a")  # INCR зберігає TTL
+    clock.now = 9.999
+    assert await redis.get("a") == "2"
+    clock.now = 10
+    assert await redis.get("a") is None
+    assert await redis.ttl("a") == -2
+
+    await redis.set("b", "x", ex=5)
+    await redis.set("b", "y")  # SET без EX знімає TTL
+    clock.now = 100
+    assert await redis.get("b") == "y"
+    assert await redis.ttl("b") == -1
+
+
+@pytest.mark.asyncio
+async def test_expired_keys_are_purged_without_reads(redis, clock):
+    for i in range(100):
+        await redis.set(f"k{i}", i, px=500)
+    clock.now = 1
+    await redis.set("other", 1)
+    assert await redis.dbsize() == 1
+    assert redis.store.expired == 100
+
+
+@pytest.mark.asyncio
+async def test_hashes(redis, clock):
+    assert await redis.hset("h", mapping={"id": 1, "name": "a"}) == 2
+    await redis.expire("h", 5)
+    assert await redis.hgetall("h") == {"id": "1", "name": "a"}
+    assert await redis.hmget("h", "id", "missing") == ["1", None]
+    assert await redis.hgetall("missing") == {}
+
+    clock.now = 5
+    assert await redis.hgetall("h") == {}
+
+
+@pytest.mark.asyncio
+async def test_sorted_set_score_ranges(redis):
+    await redis.zadd("z", {"b": 2, "a": 2, "c": 3, "d": 10})
+    assert await redis.zrangebyscore("z", 2, 3) == ["a", "b", "c"]
+    assert await redis.zrangebyscore("z", "(2", "+inf", withscores=True) == [
+        ("c", 3.0),
+        ("d", 10.0),
+    ]
+    assert await redis.zrangebyscore("z", 0, "+inf", start=1, num=2) == ["b", "c"]
+    assert await redis.zrangebyscore("z", 0, "+inf", start=2, num=-1) == ["c", "d"]
+    assert await redis.zrangebyscore("missing", 0, 1) == []
+
+
+@pytest.mark.asyncio
+async def test_wrong_type(redis):
+    await redis.set("s", "1")
+    with pytest.raises(ResponseError):
+        await redis.hgetall("s")
+    await redis.hset("h", "f", "v")
+    with pytest.raises(ResponseError):
+        await redis.incr("h")
+
+
+@pytest.mark.asyncio
+async def test_pipeline_runs_all_and_reports_errors(redis):
+    await redis.set("s", "x")
+    async with redis.pipeline(transaction=True) as pipe:
+        pipe.set("a", 1).incr("s").incr("a")
+        assert len(pipe) == 3
+        results = await pipe.execute(raise_on_error=False)
+
+    assert results[0] is True
+    assert isinstance(results[1], ResponseError)
+    assert results[2] == 2
+
+    pipe = redis.pipeline()
+    pipe.incr("s")
+    with pytest.raises(ResponseError):
+        await pipe.execute()
+
+
+@pytest.mark.asyncio
+async def test_pubsub(redis):
+    pubsub = redis.pubsub()
+    await pubsub.subscribe("chan")
+    assert await redis.publish("chan", "hello") == 1
+    assert await redis.publish("other", "ignored") == 0
+
+    messages = pubsub.listen()
+    assert (await anext(messages))["type"] == "subscribe"
+    message = await anext(messages)
+    assert message["type"] == "message"
+    assert message["data"] == "hello"
+
+    await pubsub.aclose()
+    assert await redis.publish("chan", "gone") == 0
+
+
+@pytest.mark.asyncio
+async def test_unknown_scripts(redis):
+    with pytest.raises(NoScriptError):
+        await redis.evalsha("0" * 40, 0)
+    with pytest.raises(ResponseError):
+        await redis.eval("return 1", 0)
+
+    sha = register_script("return ARGV[1]", lambda store, keys, args: args[0])
+    assert await redis.evalsha(sha, 0, 7) == "7"
+    assert await redis.script_load("return ARGV[1]") == sha
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("algorithm", sorted(ALGORITHMS))
+async def test_rate_limiter_scripts_enforce_limit(algorithm, redis):
+    limiter = RateLimiter(limit=5, window=60, algorithm=algorithm, local=False)
+    with patch("src.core.rate_limiter.redis_client", new=redis):
+        results = [await limiter.hit("user:1") for _ in range(7)]
+
+    assert [result.allowed for result in results] == [True] * 5 + [False] * 2
+    assert [result.remaining for result in results[:5]] == [4, 3, 2, 1, 0]
+    assert results[-1].retry_after > 0
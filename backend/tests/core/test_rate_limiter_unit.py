@@ -0,0 +1,187 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from fastapi import HTTPException
+from redis.exceptions import ConnectionError, NoScriptError
+
+from src.core.rate_limiter import (
+    ALGORITHMS,
+    LocalPreLimiter,
+    RateLimiter,
+    RateLimitResult,
+    client_ip_key,
+    user_or_ip_key,
+)
+from src.utils.tokens import create_access_token
+
+
+def make_request(authorization=None, host="10.0.0.1"):
+    request = MagicMock()
+    request.headers = {"Authorization": authorization} if authorization else {}
+    request.client.host = host
+    return request
+
+
+def test_unknown_algorithm_rejected():
+    with pytest.raises(ValueError):
+        RateLimiter(limit=10, window=60, algorithm="leaky")
+
+
+@pytest.mark.asyncio
+async def test_user_key_from_bearer_token():
+    token = await create_access_token(data={"sub": "deadpool"})
+    assert user_or_ip_key(make_request(f"Bearer {token}")) == "user:deadpool"
+
+
+def test_invalid_token_keyed_by_ip():
+    assert user_or_ip_key(make_request("Bearer garbage")) == "ip:10.0.0.1"
+    assert client_ip_key(make_request()) == "ip:10.0.0.1"
+
+
+def test_sliding_window_counter_uses_current_and_previous_window():
+    limiter = RateLimiter(limit=10, window=60, algorithm="sliding_window_counter")
+    keys, args = limiter._keys_and_args("user:1", now_ms=125_000)
+    assert keys == [
+        "ratelimit:default:sliding_window_counter:user:1:2",
+        "ratelimit:default:sliding_window_counter:user:1:1",
+    ]
+    assert args == [10, 60_000, 5_000]
+
+
+def test_sliding_window_log_members_are_unique():
+    limiter = RateLimiter(limit=10, window=60, algorithm="sliding_window_log")
+    _, first = limiter._keys_and_args("user:1", now_ms=1)
+    _, second = limiter._keys_and_args("user:1", now_ms=1)
+    assert first[3] != second[3]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("algorithm", sorted(ALGORITHMS))
+async def test_hit_is_single_round_trip(algorithm):
+    limiter = RateLimiter(limit=10, window=60, algorithm=algorithm)
+    with patch("src.core.rate_limiter.redis_client", new=AsyncMock()) as redis:
+        redis.evalsha.return_value = [1, 9, 0, 60_000]
+        result = await limiter.hit("user:1")
+
+    assert result == RateLimitResult(
+        allowed=True, limit=10, remaining=9, retry_after=0, reset_after=60
+    )
+    redis.evalsha.assert_awaited_once()
+    redis.eval.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_hit_loads_script_when_missing():
+    limiter = RateLimiter(limit=10, window=60)
+    with patch("src.core.rate_limiter.redis_client", new=AsyncMock()) as redis:
+        redis.evalsha.side_effect = NoScriptError("NOSCRIPT")
+        redis.eval.return_value = [1, 9, 0, 60_000]
+        result = await limiter.hit("user:1")
+
+    assert result.allowed
+    assert redis.eval.await_args.args[0] == ALGORITHMS[limiter.algorithm]
+
+
+@pytest.mark.asyncio
+async def test_dependency_sets_headers_and_rejects():
+    limiter = RateLimiter(limit=10, window=60)
+    response = MagicMock(headers={})
+    with patch("src.core.rate_limiter.redis_client", new=AsyncMock()) as redis:
+        redis.evalsha.return_value = [1, 3, 0, 42_000]
+        await limiter(make_request(), response)
+        assert response.headers == {
+            "X-RateLimit-Limit": "10",
+            "X-RateLimit-Remaining": "3",
+            "X-RateLimit-Reset": "42",
+        }
+
+        redis.evalsha.return_value = [0, 0, 1_500, 1_500]
+        with pytest.raises(HTTPException) as exc_info:
+            await limiter(make_request(), response)
+
+    assert exc_info.value.status_code == 429
+    assert exc_info.value.headers["Retry-After"] == "2"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def redis_result(allowed, retry_after=0.0):
+    return RateLimitResult(
+        allowed=allowed,
+        limit=3,
+        remaining=0,
+        retry_after=retry_after,
+        reset_after=retry_after,
+    )
+
+
+def test_pre_limiter_unknown_key_goes_to_redis():
+    pre = LocalPreLimiter(limit=3, window=60, maxsize=100)
+    assert pre.check("user:1") is None
+
+
+def test_pre_limiter_rejects_after_local_budget_spent():
+    clock = FakeClock()
+    pre = LocalPreLimiter(limit=3, window=60, maxsize=100, clock=clock)
+    for _ in range(3):
+        assert pre.check("user:1") is None
+        pre.record("user:1", redis_result(True))
+
+    assert pre.check("user:1") == pytest.approx(20)
+    clock.now = 20
+    assert pre.check("user:1") is None
+
+
+def test_pre_limiter_blocks_for_redis_retry_after():
+    clock = FakeClock()
+    pre = LocalPreLimiter(limit=3, window=60, maxsize=100, clock=clock)
+    pre.record("user:1", redis_result(False, retry_after=5))
+
+    assert pre.check("user:1") == pytest.approx(5)
+    clock.now = 5
+    assert pre.check("user:1") is None
+
+
+@pytest.mark.asyncio
+async def test_hit_rejects_locally_without_redis():
+    limiter = RateLimiter(limit=10, window=60)
+    with patch("src.core.rate_limiter.redis_client", new=AsyncMock()) as redis:
+        redis.evalsha.return_value = [0, 0, 30_000, 30_000]
+        first = await limiter.hit("user:1")
+        second = await limiter.hit("user:1")
+
+    assert not first.allowed and not second.allowed
+    assert second.retry_after == pytest.approx(30, abs=1)
+    redis.evalsha.assert_awaited_once()
+    assert limiter.stats()["local_rejections"] == 1
+    assert limiter.stats()["redis_decisions"] == 1
+    assert limiter.stats()["local_share"] == 0.5
+
+
+@pytest.mark.asyncio
+async def test_hit_without_pre_limiter_always_asks_redis():
+    limiter = RateLimiter(limit=10, window=60, local=False)
+    with patch("src.core.rate_limiter.redis_client", new=AsyncMock()) as redis:
+        redis.evalsha.return_value = [0, 0, 30_000, 30_000]
+        await limiter.hit("user:1")
+        await limiter.hit("user:1")
+
+    assert redis.evalsha.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_redis_outage_falls_back_to_local_limit():
+    limiter = RateLimiter(limit=2, window=60)
+    with patch("src.core.rate_limiter.redis_client", new=AsyncMock()) as redis:
+        redis.evalsha.side_effect = ConnectionError("refused")
+        results = [await limiter.hit("user:1") for _ in range(3)]
+
+    assert [result.allowed for result in results] == [True, True, False]
+    assert results[0].remaining == 1
+    assert limiter.stats()["fallback_decisions"] == 2
+    assert limiter.stats()["local_rejections"] == 1
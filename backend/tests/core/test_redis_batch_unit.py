@@ -0,0 +1,83 @@
+import asyncio
+import pytest
+from redis.exceptions import ConnectionError, NoScriptError
+
+from src.core import redis_batch
+from src.core.circuit_breaker import CircuitOpenError
+from src.core.redis_batch import batched, pipeline
+
+
+@pytest.mark.asyncio
+async def test_concurrent_commands_share_one_pipeline(redis_mock):
+    redis_mock.get.return_value = "3"
+    redis_mock.hgetall.return_value = {"id": "1"}
+
+    version, cached = await asyncio.gather(
+        batched(redis_mock, "get", "user:1:token_version"),
+        batched(redis_mock, "hgetall", "user:alice"),
+    )
+
+    assert version == "3"
+    assert cached == {"id": "1"}
+    redis_mock.pipeline.assert_called_once_with(transaction=False)
+
+
+@pytest.mark.asyncio
+async def test_single_command_skips_pipeline(redis_mock):
+    redis_mock.get.return_value = "1"
+    assert await batched(redis_mock, "get", "key") == "1"
+    redis_mock.pipeline.assert_not_called()
+    redis_mock.get.assert_awaited_once_with("key")
+
+
+@pytest.mark.asyncio
+async def test_error_is_raised_only_for_its_command(redis_mock):
+    redis_mock.evalsha.side_effect = NoScriptError("NOSCRIPT")
+    redis_mock.get.return_value = "1"
+
+    results = await asyncio.gather(
+        batched(redis_mock, "evalsha", "sha", 0),
+        batched(redis_mock, "get", "key"),
+        return_exceptions=True,
+    )
+
+    assert isinstance(results[0], NoScriptError)
+    assert results[1] == "1"
+
+
+@pytest.mark.asyncio
+async def test_pipeline_executes_transaction_on_exit(redis_mock):
+    before = redis_batch.stats()["round_trips"]
+
+    async with pipeline(redis_mock) as pipe:
+        pipe.hset("user:alice", mapping={"id": "1"})
+        pipe.expire("user:alice", 600)
+        redis_mock.hset.assert_not_awaited()
+
+    redis_mock.pipeline.assert_called_once_with(transaction=True)
+    redis_mock.hset.assert_awaited_once_with("user:alice", mapping={"id": "1"})
+    redis_mock.expire.assert_awaited_once_with("user:alice", 600)
+    assert redis_batch.stats()["round_trips"] == before + 1
+
+
+@pytest.mark.asyncio
+async def test_connection_errors_open_the_circuit(redis_mock):
+    redis_mock.get.side_effect = ConnectionError("refused")
+    threshold = redis_batch.redis_breaker.failure_threshold
+    for _ in range(threshold):
+        with pytest.raises(ConnectionError):
+            await batched(redis_mock, "get", "key")
+
+    assert redis_batch.redis_breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        await batched(redis_mock, "get", "key")
+    assert redis_mock.get.await_count == threshold
+
+
+@pytest.mark.asyncio
+async def test_command_errors_do_not_open_the_circuit(redis_mock):
+    redis_mock.evalsha.side_effect = NoScriptError("NOSCRIPT")
+    for _ in range(redis_batch.redis_breaker.failure_threshold):
+        with pytest.raises(NoScriptError):
+            await batched(redis_mock, "evalsha", "sha", 0)
+    assert redis_batch.redis_breaker.state == "closed"
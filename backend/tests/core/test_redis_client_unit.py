@@ -0,0 +1,24 @@
+import importlib.util
+from unittest.mock import patch
+
+from src.conf.config import config
+
+
+def load_redis_client():
+    # Окрема копія модуля, щоб не підмінити клієнта, яким користуються інші тести
+    spec = importlib.util.find_spec("src.core.redis_client")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_pubsub_connections_have_no_read_timeout():
+    with patch.object(config, "REDIS_URL", "redis://localhost:6379"):
+        module = load_redis_client()
+
+    commands = module.redis_client.connection_pool.connection_kwargs
+    subscriptions = module.pubsub_client.connection_pool.connection_kwargs
+    assert commands["socket_timeout"] == config.REDIS_SOCKET_TIMEOUT
+    assert subscriptions["socket_timeout"] is None
+    assert subscriptions["socket_keepalive"] is True
+    assert module.pubsub_client.connection_pool is not module.redis_pool
@@ -0,0 +1,235 @@
+import asyncio
+import json
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+from redis.exceptions import ConnectionError
+
+from src.core.suggest_index import (
+    INVALIDATION_CHANNEL,
+    SuggestIndex,
+    UserPrefixIndex,
+    normalize,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def contact(id, first_name, last_name, email):
+    return SimpleNamespace(
+        id=id, first_name=first_name, last_name=last_name, email=email
+    )
+
+
+CONTACTS = [
+    contact(1, "John", "Smith", "john@example.com"),
+    contact(2, "Jane", "Johnson", "jane@example.com"),
+    contact(3, "Ärne", "Brown", "arne@mail.org"),
+]
+
+
+def loader(contacts=CONTACTS):
+    return AsyncMock(return_value=contacts)
+
+
+def ids(suggestions):
+    return [suggestion["id"] for suggestion in suggestions]
+
+
+def test_normalize_folds_case_and_width():
+    assert normalize("  ＪＯＨＮ ") == "john"
+    assert normalize("Straße") == "strasse"
+    assert normalize(None) == ""
+
+
+def test_lookup_matches_prefix_of_any_field():
+    index = UserPrefixIndex(CONTACTS)
+
+    assert ids(index.lookup("jo", 10)) == [1, 2]  # "john" < "johnson"
+    assert ids(index.lookup("ÄR", 10)) == [3]
+    assert ids(index.lookup("jane@", 10)) == [2]
+    assert index.lookup("mith", 10) == []
+    assert index.lookup("   ", 10) == []
+    assert index.lookup("j", 10)[0] == {
+        "id": 2,
+        "first_name": "Jane",
+        "last_name": "Johnson",
+        "email": "jane@example.com",
+    }
+
+
+def test_lookup_requires_every_word_and_respects_limit():
+    index = UserPrefixIndex(CONTACTS)
+
+    assert ids(index.lookup("jo sm", 10)) == [1]
+    assert ids(index.lookup("j", 1)) == [2]
+    assert index.lookup("jo br", 10) == []
+
+
+def test_upsert_and_remove_keep_terms_sorted():
+    index = UserPrefixIndex(CONTACTS)
+    size = len(index)
+
+    index.upsert(contact(1, "Bob", "Smith", "bob@example.com"))
+    assert ids(index.lookup("john", 10)) == [2]
+    assert ids(index.lookup("bo", 10)) == [1]
+    assert len(index) == size
+
+    index.remove(1)
+    index.remove(42)
+    assert index.lookup("smith", 10) == []
+    assert len(index) == size - 3
+
+
+@pytest.mark.asyncio
+async def test_index_is_built_once_per_user():
+    suggest = SuggestIndex(max_terms=100, ttl=60)
+    load = loader()
+
+    assert ids(await suggest.lookup(1, "jo", 10, load)) == [1, 2]
+    assert ids(await suggest.lookup(1, "sm", 10, load)) == [1]
+
+    load.assert_awaited_once()
+    assert suggest.stats()["users"] == 1
+    assert suggest.stats()["terms"] == 9
+    assert suggest.hits == 1
+    assert suggest.misses == 1
+
+
+@pytest.mark.asyncio
+async def test_whole_users_are_evicted_in_lru_order():
+    suggest = SuggestIndex(max_terms=20, ttl=60)
+    await suggest.lookup(1, "a", 10, loader())
+    await suggest.lookup(2, "a", 10, loader())
+    await suggest.lookup(1, "a", 10, loader())  # користувач 2 тепер найстаріший
+    await suggest.lookup(3, "a", 10, loader())
+
+    assert suggest.evictions == 1
+    assert suggest.stats()["users"] == 2
+    assert suggest.stats()["terms"] == 18
+    load = loader()
+    await suggest.lookup(1, "a", 10, load)
+    load.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_user_larger_than_capacity_is_not_cached():
+    suggest = SuggestIndex(max_terms=5, ttl=60)
+    load = loader()
+
+    assert ids(await suggest.lookup(1, "sm", 10, load)) == [1]
+    await suggest.lookup(1, "sm", 10, load)
+
+    assert load.await_count == 2
+    assert suggest.stats()["terms"] == 0
+
+
+@pytest.mark.asyncio
+async def test_index_is_rebuilt_after_ttl():
+    clock = FakeClock()
+    suggest = SuggestIndex(max_terms=100, ttl=60, clock=clock)
+    load = loader()
+    await suggest.lookup(1, "jo", 10, load)
+    clock.now = 60
+
+    await suggest.lookup(1, "jo", 10, load)
+
+    assert load.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_writes_update_a_built_index_and_notify_other_workers():
+    suggest = SuggestIndex(max_terms=100, ttl=60)
+    await suggest.lookup(1, "a", 10, loader())
+
+    with patch("src.core.suggest_index.redis_client", new_callable=AsyncMock) as redis:
+        await suggest.contact_saved(1, contact(4, "Alice", "Cooper", "al@c.com"))
+        await suggest.contact_removed(1, 3)
+
+    load = loader()
+    assert ids(await suggest.lookup(1, "a", 10, load)) == [4]
+    load.assert_not_awaited()
+    assert suggest.stats()["terms"] == 9
+    message = json.dumps({"worker": suggest.worker_id, "user_id": 1})
+    assert redis.publish.await_args_list == [
+        ((INVALIDATION_CHANNEL, message),),
+        ((INVALIDATION_CHANNEL, message),),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_write_during_build_is_not_lost():
+    suggest = SuggestIndex(max_terms=100, ttl=60)
+    loading = asyncio.Event()
+    release = asyncio.Event()
+
+    async def slow_load():
+        loading.set()
+        await release.wait()
+        return CONTACTS  # знімок без контакту, доданого під час завантаження
+
+    lookup = asyncio.create_task(suggest.lookup(1, "a", 10, slow_load))
+    await loading.wait()
+    with patch("src.core.suggest_index.redis_client", new_callable=AsyncMock):
+        await suggest.contact_saved(1, contact(4, "Alice", "Cooper", "al@c.com"))
+    release.set()
+    await lookup
+
+    # Застарілий знімок не закешовано, тож наступний запит бачить новий контакт
+    load = loader(CONTACTS + [contact(4, "Alice", "Cooper", "al@c.com")])
+    assert ids(await suggest.lookup(1, "al", 10, load)) == [4]
+    load.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_publish_failure_keeps_local_update():
+    suggest = SuggestIndex(max_terms=100, ttl=60)
+    await suggest.lookup(1, "a", 10, loader())
+
+    with patch("src.core.suggest_index.redis_client", new_callable=AsyncMock) as redis:
+        redis.publish.side_effect = ConnectionError("down")
+        await suggest.contact_removed(1, 3)
+
+    assert await suggest.lookup(1, "ar", 10, loader()) == []
+    assert suggest.redis_errors == 1
+
+
+@pytest.mark.asyncio
+async def test_listener_drops_users_changed_by_other_workers():
+    suggest = SuggestIndex(max_terms=100, ttl=60)
+
+    class FakePubSub:
+        subscribe = AsyncMock()
+        aclose = AsyncMock()
+
+        async def listen(self):
+            # Заповнено після підписки
+            await suggest.lookup(1, "a", 10, loader())
+            await suggest.lookup(2, "a", 10, loader())
+            yield {"type": "subscribe", "data": 1}
+            own = {"worker": suggest.worker_id, "user_id": 2}
+            yield {"type": "message", "data": json.dumps(own)}
+            other = {"worker": "other", "user_id": 1}
+            yield {"type": "message", "data": json.dumps(other)}
+            raise RuntimeError("connection lost")
+
+    with patch("src.core.suggest_index.pubsub_client", new=MagicMock()) as redis, patch(
+        "src.core.suggest_index.asyncio.sleep",
+        new=AsyncMock(side_effect=StopAsyncIteration),
+    ):
+        redis.pubsub.return_value = FakePubSub()
+        with pytest.raises(StopAsyncIteration):
+            await suggest.listen_for_invalidations()
+
+    assert suggest.invalidations_received == 1
+    load = loader()
+    await suggest.lookup(2, "a", 10, load)
+    load.assert_not_awaited()
+    await suggest.lookup(1, "a", 10, load)
+    load.assert_awaited_once()
@@ -0,0 +1,119 @@
+import json
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from redis.exceptions import ConnectionError
+
+from src.core.user_cache import (
+    INVALIDATION_CHANNEL,
+    UserCache,
+    principal_to_cache,
+)
+from src.database.models import UserRole
+from src.schemas import UserPrincipal
+
+
+@pytest.fixture
+def principal():
+    return UserPrincipal(
+        id=1,
+        username="testuser",
+        email="test@example.com",
+        role=UserRole.USER,
+        avatar="avatar.png",
+        is_verified=True,
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_prefers_local_tier(principal):
+    cache = UserCache(local_size=10, local_ttl=60, redis_ttl=600)
+    with patch("src.core.user_cache.redis_client", new_callable=AsyncMock) as redis:
+        redis.hgetall.return_value = principal_to_cache(principal)
+
+        first = await cache.get("testuser")
+        second = await cache.get("testuser")
+
+    assert first == principal
+    assert second is first
+    redis.hgetall.assert_awaited_once_with("user:testuser")
+    assert cache.redis_hits == 1
+    assert cache.local.hits == 1
+
+
+@pytest.mark.asyncio
+async def test_get_miss_in_both_tiers():
+    cache = UserCache(local_size=10, local_ttl=60, redis_ttl=600)
+    with patch("src.core.user_cache.redis_client", new_callable=AsyncMock) as redis:
+        redis.hgetall.return_value = {}
+        assert await cache.get("nobody") is None
+    assert cache.redis_misses == 1
+
+
+@pytest.mark.asyncio
+async def test_set_is_one_transaction(principal, redis_mock):
+    cache = UserCache(local_size=10, local_ttl=60, redis_ttl=600)
+    with patch("src.core.user_cache.redis_client", new=redis_mock) as redis:
+        await cache.set("testuser", principal)
+
+    redis.pipeline.assert_called_once_with(transaction=True)
+    redis.hset.assert_awaited_once_with(
+        "user:testuser", mapping=principal_to_cache(principal)
+    )
+    redis.expire.assert_awaited_once_with("user:testuser", 600)
+    assert cache.local.get("testuser") == principal
+
+
+@pytest.mark.asyncio
+async def test_redis_outage_degrades_to_local_tier(principal, redis_mock):
+    cache = UserCache(local_size=10, local_ttl=60, redis_ttl=600)
+    redis_mock.hgetall.side_effect = ConnectionError("refused")
+    redis_mock.hset.side_effect = ConnectionError("refused")
+    with patch("src.core.user_cache.redis_client", new=redis_mock):
+        assert await cache.get("testuser") is None
+        await cache.set("testuser", principal)
+        assert await cache.get("testuser") == principal
+
+    assert cache.redis_errors == 2
+
+
+@pytest.mark.asyncio
+async def test_invalidate_evicts_and_publishes(principal, redis_mock):
+    cache = UserCache(local_size=10, local_ttl=60, redis_ttl=600)
+    with patch("src.core.user_cache.redis_client", new=redis_mock) as redis:
+        await cache.set("testuser", principal)
+        await cache.set("test@example.com", principal)
+
+        await cache.invalidate(principal)
+
+    assert len(cache.local) == 0
+    redis.delete.assert_awaited_once_with("user:testuser", "user:test@example.com")
+    redis.publish.assert_awaited_once_with(
+        INVALIDATION_CHANNEL, json.dumps(["testuser", "test@example.com"])
+    )
+
+
+@pytest.mark.asyncio
+async def test_listener_evicts_on_message(principal):
+    cache = UserCache(local_size=10, local_ttl=60, redis_ttl=600)
+    cache.local.set("testuser", principal)
+    cache.local.set("other", principal)
+
+    class FakePubSub:
+        subscribe = AsyncMock()
+        aclose = AsyncMock()
+
+        async def listen(self):
+            cache.local.set("testuser", principal)  # заповнено після підписки
+            yield {"type": "subscribe", "data": 1}
+            yield {"type": "message", "data": json.dumps(["testuser"])}
+            raise RuntimeError("connection lost")
+
+    with patch("src.core.user_cache.pubsub_client", new=MagicMock()) as redis, patch(
+        "src.core.user_cache.asyncio.sleep", new=AsyncMock(side_effect=StopAsyncIteration)
+    ):
+        redis.pubsub.return_value = FakePubSub()
+        with pytest.raises(StopAsyncIteration):
+            await cache.listen_for_invalidations()
+
+    assert cache.local.get("testuser") is None
+    assert cache.invalidations_received == 1
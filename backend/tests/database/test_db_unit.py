@@ -0,0 +1,165 @@
+import pytest
+from unittest.mock import patch
+from fastapi import Request
+from sqlalchemy import text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from src.core.memory_redis import MemoryRedis
+from src.core.recent_writes import recent_writes
+from src.database.db import (
+    DatabaseSessionManager,
+    get_db,
+    get_read_db,
+    release_connection,
+    request_metrics,
+)
+from src.database.models import User
+
+
+def _request() -> Request:
+    return Request({"type": "http", "headers": []})
+
+
+@pytest.fixture
+def manager(tmp_path):
+    return DatabaseSessionManager(
+        f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+
+
+@pytest.mark.asyncio
+async def test_pool_stats_track_checkouts(manager):
+    async with manager.session() as session:
+        await session.execute(text("SELECT 1"))
+        stats = manager.pool_stats()
+        assert stats["checked_out"] == 1
+        assert stats["overflow_in_use"] == 0
+
+    stats = manager.pool_stats()
+    assert stats["checked_out"] == 0
+    assert stats["acquired"] == 1
+    assert stats["timeouts"] == 0
+    assert stats["wait_ms"]["p50"] is not None
+
+
+@pytest.mark.asyncio
+async def test_pool_timeouts_are_counted(manager):
+    async with manager.session() as holder:
+        await holder.execute(text("SELECT 1"))
+        async with manager.session() as waiter:
+            with pytest.raises(PoolTimeoutError):
+                await waiter.execute(text("SELECT 1"))
+
+    assert manager.pool_stats()["timeouts"] == 1
+
+
+@pytest.fixture
+def replicated(tmp_path):
+    urls = [f"sqlite+aiosqlite:///{tmp_path / name}" for name in ("r1.db", "r2.db")]
+    return DatabaseSessionManager(
+        f"sqlite+aiosqlite:///{tmp_path / 'primary.db'}", replica_urls=urls
+    )
+
+
+async def _database_file(session) -> str:
+    result = await session.execute(text("PRAGMA database_list"))
+    return result.all()[0][2].rsplit("/", 1)[-1]
+
+
+@pytest.mark.asyncio
+async def test_read_only_sessions_rotate_over_replicas(replicated):
+    used = []
+    for _ in range(4):
+        async with replicated.session(read_only=True) as session:
+            used.append(await _database_file(session))
+    async with replicated.session() as session:
+        primary = await _database_file(session)
+
+    assert used == ["r1.db", "r2.db", "r1.db", "r2.db"]
+    assert primary == "primary.db"
+    assert len(replicated.pool_stats()["replicas"]) == 2
+
+
+@pytest.mark.asyncio
+async def test_least_busy_replica_is_chosen(tmp_path):
+    urls = [f"sqlite+aiosqlite:///{tmp_path / name}" for name in ("r1.db", "r2.db")]
+    manager = DatabaseSessionManager(
+        f"sqlite+aiosqlite:///{tmp_path / 'primary.db'}",
+        replica_urls=urls,
+        replica_selection="least_busy",
+    )
+    async with manager.session(read_only=True) as busy:
+        assert await _database_file(busy) == "r1.db"
+        async with manager.session(read_only=True) as other:
+            assert await _database_file(other) == "r2.db"
+
+
+@pytest.mark.asyncio
+async def test_sessions_flag_writes(replicated):
+    async with replicated.session() as session:
+        await session.execute(text("SELECT 1"))
+        assert not session.info.get("wrote")
+
+    async with replicated.session() as session:
+        await session.run_sync(lambda s: User.metadata.create_all(s.connection()))
+        session.add(User(username="a", email="a@example.com", hashed_password="x"))
+        await session.commit()
+        assert session.info["wrote"] is True
+
+
+@pytest.mark.asyncio
+async def test_reads_stick_to_primary_after_a_write(replicated):
+    memory = MemoryRedis()
+    with patch("src.database.db.sessionmanager", new=replicated), patch(
+        "src.database.db.bearer_subject", return_value="alice"
+    ), patch("src.core.recent_writes.redis_client", new=memory):
+        reader = get_read_db(_request())
+        assert await _database_file(await anext(reader)) == "r1.db"
+        await reader.aclose()
+
+        writer = get_db(_request())
+        session = await anext(writer)
+        session.info["wrote"] = True
+        with pytest.raises(StopAsyncIteration):
+            await anext(writer)
+
+        recent_writes.clear()  # інший воркер бачить запис лише через Redis
+        reader = get_read_db(_request())
+        assert await _database_file(await anext(reader)) == "primary.db"
+        await reader.aclose()
+
+
+@pytest.mark.asyncio
+async def test_sessions_check_out_lazily(manager):
+    before = request_metrics.stats()
+    with patch("src.database.db.sessionmanager", new=manager):
+        unused = get_db(_request())
+        await anext(unused)
+        assert manager.pool_stats()["checked_out"] == 0
+        await unused.aclose()
+
+        request = _request()
+        auth, handler = get_db(request), get_read_db(request)
+        await anext(auth)
+        await (await anext(handler)).execute(text("SELECT 1"))
+        await handler.aclose()
+        await auth.aclose()
+
+    stats = request_metrics.stats()
+    assert stats["requests"] == before["requests"] + 2
+    assert stats["without_connection"] == before["without_connection"] + 1
+
+
+@pytest.mark.asyncio
+async def test_release_connection_returns_it_to_the_pool(manager):
+    async with manager.session() as session:
+        await session.execute(text("SELECT 1"))
+        assert manager.pool_stats()["checked_out"] == 1
+        await release_connection(session)
+        assert manager.pool_stats()["checked_out"] == 0
+
+        await session.execute(text("SELECT 1"))
+        assert manager.pool_stats()["checked_out"] == 1
@@ -0,0 +1,36 @@
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateIndex, CreateTable
+
+from src.database.models import Base, Contact
+
+
+def test_search_columns_are_generated_on_postgresql():
+    ddl = str(CreateTable(Contact.__table__).compile(dialect=postgresql.dialect()))
+
+    assert "search_text TEXT GENERATED ALWAYS AS (lower(" in ddl
+    assert "search_vector TSVECTOR GENERATED ALWAYS AS (to_tsvector(" in ddl
+
+
+def test_search_columns_are_plain_and_unindexed_elsewhere():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    schema = inspect(engine)
+
+    columns = {
+        column["name"]: column for column in schema.get_columns("contacts")
+    }
+    indexes = {index["name"] for index in schema.get_indexes("contacts")}
+    assert columns["search_vector"]["nullable"]
+    assert "search_text" in columns
+    assert "ix_contacts_user_id_id" in indexes
+    assert "ix_contacts_user_search_vector" not in indexes
+    engine.dispose()
+
+
+def test_ranked_search_indexes_lead_with_user_id():
+    indexes = {index.name: index for index in Contact.__table__.indexes}
+
+    for name in ("ix_contacts_user_search_vector", "ix_contacts_user_search_text_trgm"):
+        ddl = str(CreateIndex(indexes[name]).compile(dialect=postgresql.dialect()))
+        assert "USING gin (user_id, search_" in ddl
@@ -2,11 +2,13 @@ import pytest
 from unittest.mock import AsyncMock, MagicMock
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.engine import Result
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.dialects import postgresql
 from datetime import date
 
 from src.database.models import Contact, User
 from src.repository.contacts import ContactRepository
-from src.schemas import ContactCreate
+from src.schemas import ContactCreate, ContactUpdate
 
 
 @pytest.fixture
@@ -99,23 +101,21 @@ async def test_create_contact(contact_repository, mock_session, user):
         user_id=user.id,
     )
 
-    mock_session.add = AsyncMock()
-    mock_session.commit = AsyncMock()
-    mock_session.refresh = AsyncMock()
-
-    contact_repository.get_contact_by_id = AsyncMock(return_value=created_contact)
+    mock_result = MagicMock(spec=Result)
+    mock_result.scalar_one.return_value = created_contact
+    mock_session.execute = AsyncMock(return_value=mock_result)
 
     # Викликаємо метод
     res = await contact_repository.create_contact(contact_test, user=user)
-    
 
-    assert res is not None
-    assert res.first_name == "Bob"
-    assert res.email == "bobthomson@example.com"
+    assert res is created_contact
     assert res.user_id == user.id
-    mock_session.add.assert_called_once()
+    # INSERT ... RETURNING, без refresh і повторного SELECT
+    mock_session.execute.assert_awaited_once()
+    stmt = mock_session.execute.await_args.args[0]
+    assert stmt.is_insert and stmt._returning
     mock_session.commit.assert_awaited_once()
-    mock_session.refresh.assert_awaited_once()
+    mock_session.refresh.assert_not_awaited()
 
 @pytest.mark.asyncio
 async def test_update_contact(contact_repository, mock_session, user):
@@ -126,31 +126,164 @@ async def test_update_contact(contact_repository, mock_session, user):
         phone_number="18689200033",
         birth_date=date(1991, 5, 20),
     )
-    existing_contact = Contact(
-        id=1,
-        first_name="Bob",
-        last_name="Thomson",
-        email="bobthomson@example.com",
-        phone_number="18689200055",
-        birth_date=date(1995, 5, 15),
-        user_id=user.id
+    updated_contact = Contact(
+        id=1, **contact_data.model_dump(), user_id=user.id
     )
-    
-    contact_repository.get_contact_by_id = AsyncMock(return_value=existing_contact)
-
-    mock_session.commit = AsyncMock()
-    mock_session.refresh = AsyncMock()
+    mock_result = MagicMock(spec=Result)
+    mock_result.scalar_one_or_none.return_value = updated_contact
+    mock_session.execute = AsyncMock(return_value=mock_result)
 
     result = await contact_repository.update_contact(
         contact_id=1, body=contact_data, user=user
     )
 
-    
-    assert result is not None
-    assert result.first_name == "Mark"
-    assert result.email == "markthomson@example.com"
+    assert result is updated_contact
+    mock_session.execute.assert_awaited_once()
+    stmt = mock_session.execute.await_args.args[0]
+    assert stmt.is_update and stmt._returning
+    mock_session.commit.assert_awaited_once()
+    mock_session.refresh.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_update_contact_of_other_user(contact_repository, mock_session, user):
+    mock_result = MagicMock(spec=Result)
+    mock_result.scalar_one_or_none.return_value = None
+    mock_session.execute = AsyncMock(return_value=mock_result)
+
+    result = await contact_repository.update_contact(
+        contact_id=2,
+        body=ContactCreate(
+            first_name="Mark",
+            last_name="Thomson",
+            email="markthomson@example.com",
+            phone_number="18689200033",
+            birth_date=date(1991, 5, 20),
+        ),
+        user=user,
+    )
+
+    assert result is None
+    mock_session.commit.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_patch_contact_sets_only_supplied_columns(
+    contact_repository, mock_session, user
+):
+    patched = Contact(id=1, first_name="Bob", note=None, user_id=user.id)
+    mock_result = MagicMock(spec=Result)
+    mock_result.scalar_one_or_none.return_value = patched
+    mock_session.execute = AsyncMock(return_value=mock_result)
+
+    result = await contact_repository.patch_contact(
+        contact_id=1, body=ContactUpdate(note=None), user=user
+    )
+
+    assert result is patched
+    stmt = mock_session.execute.await_args.args[0]
+    assert stmt.is_update
+    assert [column.key for column in stmt._values] == ["note"]
     mock_session.commit.assert_awaited_once()
-    mock_session.refresh.assert_awaited_once_with(existing_contact)
+
+
+@pytest.mark.asyncio
+async def test_patch_birth_date_keeps_birthday_md_in_sync(
+    contact_repository, mock_session, user
+):
+    mock_session.execute = AsyncMock(return_value=MagicMock(spec=Result))
+
+    await contact_repository.patch_contact(
+        contact_id=1, body=ContactUpdate(birth_date=date(1990, 12, 31)), user=user
+    )
+
+    stmt = mock_session.execute.await_args.args[0]
+    values = {column.key: value.value for column, value in stmt._values.items()}
+    assert values == {"birth_date": date(1990, 12, 31), "birthday_md": 1231}
+
+
+def test_orm_contact_computes_birthday_md():
+    contact = Contact(first_name="Leap", birth_date=date(2000, 2, 29))
+    assert contact.birthday_md == 229
+    contact.birth_date = date(2000, 1, 5)
+    assert contact.birthday_md == 105
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "today, next_date, wraps_year, start_md, end_md",
+    [
+        (date(2027, 6, 1), date(2027, 6, 8), False, 601, 608),
+        (date(2027, 12, 29), date(2028, 1, 5), True, 1229, 105),
+        # У невисокосний рік 29 лютого потрапляє у вікно, що закінчується 28-го
+        (date(2027, 2, 22), date(2027, 2, 28), False, 222, 229),
+        (date(2028, 2, 22), date(2028, 2, 28), False, 222, 228),
+    ],
+)
+async def test_upcoming_birthdays_window(
+    contact_repository,
+    mock_session,
+    user,
+    today,
+    next_date,
+    wraps_year,
+    start_md,
+    end_md,
+):
+    mock_session.execute = AsyncMock(return_value=MagicMock(spec=Result))
+
+    await contact_repository.get_upcoming_birthdays(today, next_date, 0, 10, user)
+
+    stmt, params = mock_session.execute.await_args.args
+    assert (params["start_md"], params["end_md"]) == (start_md, end_md)
+    sql = str(stmt.compile(dialect=postgresql.asyncpg.dialect()))
+    assert "birthday_md" in sql and "EXTRACT" not in sql
+    assert (" OR " in sql) is wraps_year
+
+
+@pytest.mark.asyncio
+async def test_birthdays_batch_spans_all_users(contact_repository, mock_session):
+    mock_session.execute = AsyncMock(return_value=MagicMock(spec=Result))
+
+    await contact_repository.get_birthdays_batch(
+        date(2027, 12, 29), date(2028, 1, 29), after_id=500, limit=1000
+    )
+
+    stmt, params = mock_session.execute.await_args.args
+    sql = str(stmt.compile(dialect=postgresql.asyncpg.dialect()))
+    assert "contacts.user_id IS NOT NULL" in sql and "ORDER BY contacts.id" in sql
+    assert params == {"start_md": 1229, "end_md": 129, "after_id": 500, "limit": 1000}
+
+
+@pytest.mark.asyncio
+async def test_upcoming_birthdays_cursor_after_new_year(
+    contact_repository, mock_session, user
+):
+    mock_session.execute = AsyncMock(return_value=MagicMock(spec=Result))
+
+    await contact_repository.get_upcoming_birthdays(
+        date(2027, 12, 29), date(2028, 1, 5), 0, 10, user, after=[102, 7]
+    )
+
+    params = mock_session.execute.await_args.args[1]
+    # Ключ курсора доповнюється ознакою наступного року
+    assert [params[f"after_{i}"] for i in range(3)] == [1, 102, 7]
+
+
+@pytest.mark.asyncio
+async def test_patch_contact_without_fields_only_reads(
+    contact_repository, mock_session, user
+):
+    existing = Contact(id=1, first_name="Bob", user_id=user.id)
+    contact_repository.get_contact_by_id = AsyncMock(return_value=existing)
+
+    result = await contact_repository.patch_contact(
+        contact_id=1, body=ContactUpdate(), user=user
+    )
+
+    assert result is existing
+    mock_session.execute.assert_not_awaited()
+    mock_session.commit.assert_not_awaited()
 
 
 @pytest.mark.asyncio
@@ -163,17 +296,19 @@ async def test_remove_contact(contact_repository, mock_session, user):
         email="bobthomson@example.com",
         user_id=user.id,
     )
-    contact_repository.get_contact_by_id = AsyncMock(return_value=existing_contact)
-    mock_session.delete = AsyncMock()
-    mock_session.commit = AsyncMock()
+    mock_result = MagicMock(spec=Result)
+    mock_result.scalar_one_or_none.return_value = existing_contact
+    mock_session.execute = AsyncMock(return_value=mock_result)
 
     # Call method
     result = await contact_repository.remove_contact(contact_id=1, user=user)
 
     # Assertions
-    assert result is not None
-    assert result.first_name == "Bob"
-    mock_session.delete.assert_awaited_once_with(existing_contact)
+    assert result is existing_contact
+    mock_session.execute.assert_awaited_once()
+    stmt = mock_session.execute.await_args.args[0]
+    assert stmt.is_delete and stmt._returning
+    mock_session.delete.assert_not_awaited()
     mock_session.commit.assert_awaited_once()
 
 
@@ -206,3 +341,92 @@ async def test_get_contacts_by_ids(contact_repository, mock_session, user):
     assert result[0].id == 1
     assert result[1].id == 2
     mock_session.execute.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_get_suggest_entries_loads_only_indexed_fields(
+    contact_repository, mock_session, user
+):
+    rows = [(1, "Alice", "Smith", "alice@example.com")]
+    mock_result = MagicMock(spec=Result)
+    mock_result.all.return_value = rows
+    mock_session.execute = AsyncMock(return_value=mock_result)
+
+    result = await contact_repository.get_suggest_entries(user)
+
+    assert result == rows
+    stmt, params = mock_session.execute.await_args.args
+    assert [column.name for column in stmt.selected_columns] == [
+        "id",
+        "first_name",
+        "last_name",
+        "email",
+    ]
+    assert params == {"user_id": user.id}
+
+
+@pytest.mark.asyncio
+async def test_ranked_search_uses_full_text_on_postgresql(
+    contact_repository, mock_session, user
+):
+    contact = Contact(id=3, first_name="Bob", user_id=user.id)
+    mock_session.bind = MagicMock()
+    mock_session.bind.dialect.name = "postgresql"
+    mock_result = MagicMock(spec=Result)
+    mock_result.all.return_value = [(contact, 0.5)]
+    mock_session.execute = AsyncMock(return_value=mock_result)
+
+    rows = await contact_repository.ranked_search("bob", 0, 10, user)
+
+    assert rows == [(contact, 0.5)]
+    stmt, params = mock_session.execute.await_args.args
+    sql = str(stmt.compile(dialect=postgresql.asyncpg.dialect()))
+    assert "@@ websearch_to_tsquery" in sql
+    assert "<% contacts.search_text" in sql
+    assert "ORDER BY score DESC" in sql
+    assert params["q"] == "bob"
+
+
+@pytest.mark.asyncio
+async def test_import_contacts_skips_taken_emails(
+    contact_repository, mock_session, user
+):
+    mock_session.bind = MagicMock()
+    mock_session.bind.dialect.name = "postgresql"
+    mock_result = MagicMock(spec=Result)
+    mock_result.all.return_value = [(7, "a@b.c", date(1990, 5, 15))]
+    mock_session.execute = AsyncMock(return_value=mock_result)
+    row = ContactCreate(
+        first_name="Ann",
+        last_name="Lee",
+        email="a@b.c",
+        phone_number="555",
+        birth_date=date(1990, 5, 15),
+    ).model_dump()
+
+    inserted = await contact_repository.import_contacts([row], user)
+
+    assert inserted == [(7, "a@b.c", date(1990, 5, 15))]
+    stmt, values = mock_session.execute.await_args.args
+    sql = str(stmt.compile(dialect=postgresql.asyncpg.dialect()))
+    assert "ON CONFLICT (email) DO NOTHING" in sql
+    assert "RETURNING contacts.id, contacts.email, contacts.birth_date" in sql
+    assert values == [{**row, "birthday_md": 515, "user_id": user.id}]
+    mock_session.commit.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_import_contacts_rolls_back_a_failed_batch(
+    contact_repository, mock_session, user
+):
+    mock_session.bind = MagicMock()
+    mock_session.bind.dialect.name = "postgresql"
+    mock_session.execute = AsyncMock(
+        side_effect=OperationalError("INSERT", {}, Exception("connection lost"))
+    )
+
+    with pytest.raises(OperationalError):
+        await contact_repository.import_contacts([], user)
+
+    mock_session.rollback.assert_awaited_once()
+    mock_session.commit.assert_not_awaited()
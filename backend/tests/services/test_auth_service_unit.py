@@ -2,8 +2,12 @@
 import pytest
 from unittest.mock import AsyncMock, patch, MagicMock
 from fastapi import HTTPException
-from src.services.auth import get_current_user, get_current_admin_user
-from src.schemas import User as UserSchema
+from src.services.auth import (
+    get_current_user,
+    get_current_admin_user,
+    get_current_principal,
+)
+from src.schemas import User as UserSchema, ClaimsPrincipal, UserPrincipal
 from src.database.models import UserRole, User
 from jose import JWTError
 
@@ -35,11 +39,11 @@ def admin_user_schema():
     )
 
 
-# Тест для перевірки ORM моделі User:
+# Кеш Redis повертає принципала без звернення до БД:
 @pytest.mark.asyncio
-async def test_get_current_user_from_cache(valid_payload, user_schema):
-    with patch("src.services.auth.jwt.decode", return_value=valid_payload), patch(
-        "src.services.auth.redis_client.hgetall",
+async def test_get_current_user_from_cache(valid_payload):
+    with patch("src.core.jwt_cache.jwt.decode", return_value=valid_payload), patch(
+        "src.core.user_cache.redis_client.hgetall",
         new=AsyncMock(
             return_value={
                 "id": "1",
@@ -47,41 +51,53 @@ async def test_get_current_user_from_cache(valid_payload, user_schema):
                 "email": "test@example.com",
                 "avatar": "avatar.png",
                 "role": "user",
+                "is_verified": "1",
             }
         ),
-    ):
+    ), patch(
+        "src.services.auth.UserService.get_user_by_username", new=AsyncMock()
+    ) as get_by_username:
         db_mock = MagicMock()
-        # Створюємо мок для db.query(User).get(), щоб він повертав реальний екземпляр User
-        db_mock.query(User).get.return_value = User(
-            id=1,
-            username="testuser",
-            email="test@example.com",
-            avatar="avatar.png",
-            role=UserRole.USER,
-        )
 
         result = await get_current_user(token="token", db=db_mock)
 
-        # Перевіряємо, що результат є ORM моделлю User
-        assert isinstance(result, User)
-
-        # Перевіряємо значення
+        assert isinstance(result, UserPrincipal)
+        assert result.id == 1
         assert result.username == "testuser"
         assert result.email == "test@example.com"
         assert result.role == UserRole.USER
+        assert result.is_verified is True
+        get_by_username.assert_not_awaited()
+        assert db_mock.mock_calls == []
 
 
 @pytest.mark.asyncio
-async def test_get_current_user_from_db(valid_payload, user_schema):
-    with patch("src.services.auth.jwt.decode", return_value=valid_payload), patch(
-        "src.services.auth.redis_client.hgetall", new=AsyncMock(return_value={})
+async def test_get_current_user_stale_cache_falls_back_to_db(
+    valid_payload, user_schema, redis_mock
+):
+    redis_mock.hgetall.return_value = {"id": "1", "username": "testuser"}
+    with patch("src.core.jwt_cache.jwt.decode", return_value=valid_payload), patch(
+        "src.core.user_cache.redis_client", new=redis_mock
     ), patch(
         "src.services.auth.UserService.get_user_by_username",
         new=AsyncMock(return_value=user_schema),
+    ):
+        result = await get_current_user(token="token", db=MagicMock())
+
+        assert result.username == "testuser"
+        redis_mock.delete.assert_awaited_once_with("user:testuser")
+        mapping = redis_mock.hset.await_args.kwargs["mapping"]
+        assert mapping["is_verified"] == "0"
+
+
+@pytest.mark.asyncio
+async def test_get_current_user_from_db(valid_payload, user_schema, redis_mock):
+    redis_mock.hgetall.return_value = {}
+    with patch("src.core.jwt_cache.jwt.decode", return_value=valid_payload), patch(
+        "src.core.user_cache.redis_client", new=redis_mock
     ), patch(
-        "src.services.auth.redis_client.hset", new=AsyncMock()
-    ), patch(
-        "src.services.auth.redis_client.expire", new=AsyncMock()
+        "src.services.auth.UserService.get_user_by_username",
+        new=AsyncMock(return_value=user_schema),
     ):
         db_mock = MagicMock()
         db_mock.return_value = db_mock
@@ -92,7 +108,7 @@ async def test_get_current_user_from_db(valid_payload, user_schema):
 
 @pytest.mark.asyncio
 async def test_get_current_user_invalid_token():
-    with patch("src.services.auth.jwt.decode", side_effect=JWTError("Invalid token")):
+    with patch("src.core.jwt_cache.jwt.decode", side_effect=JWTError("Invalid token")):
         with pytest.raises(HTTPException) as exc_info:
             await get_current_user(token="invalid", db=MagicMock())
         assert exc_info.value.status_code == 401
@@ -110,3 +126,64 @@ async def test_get_current_admin_user_forbidden(user_schema):
         await get_current_admin_user(user_schema)
     assert exc_info.value.status_code == 403
     assert exc_info.value.detail == "Недостатньо прав доступу"
+
+
+@pytest.fixture
+def claims_payload():
+    return {"sub": "testuser", "uid": 1, "role": "admin", "vrf": True, "ver": 2}
+
+
+@pytest.mark.asyncio
+async def test_get_current_principal_from_claims(claims_payload):
+    with patch("src.core.jwt_cache.jwt.decode", return_value=claims_payload), patch(
+        "src.services.auth.get_token_version", new=AsyncMock(return_value=2)
+    ), patch(
+        "src.services.auth.UserService.get_user_by_id", new=AsyncMock()
+    ) as get_by_id:
+        db_mock = MagicMock()
+        result = await get_current_principal(token="token", db=db_mock)
+
+    assert isinstance(result, ClaimsPrincipal)
+    assert result.id == 1
+    assert result.role == UserRole.ADMIN
+    assert result.is_verified is True
+    get_by_id.assert_not_awaited()
+    assert db_mock.mock_calls == []
+
+
+@pytest.mark.asyncio
+async def test_get_current_principal_revoked_version(claims_payload):
+    with patch("src.core.jwt_cache.jwt.decode", return_value=claims_payload), patch(
+        "src.services.auth.get_token_version", new=AsyncMock(return_value=3)
+    ):
+        with pytest.raises(HTTPException) as exc_info:
+            await get_current_principal(token="token", db=MagicMock())
+    assert exc_info.value.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_get_current_principal_version_miss_loads_from_db(claims_payload):
+    db_user = User(id=1, username="testuser", token_version=2)
+    with patch("src.core.jwt_cache.jwt.decode", return_value=claims_payload), patch(
+        "src.services.auth.get_token_version", new=AsyncMock(return_value=None)
+    ), patch(
+        "src.services.auth.mirror_token_version", new=AsyncMock()
+    ) as set_version, patch(
+        "src.services.auth.UserService.get_user_by_id",
+        new=AsyncMock(return_value=db_user),
+    ):
+        result = await get_current_principal(token="token", db=MagicMock())
+
+    assert result.id == 1
+    set_version.assert_awaited_once_with(1, 2)
+
+
+@pytest.mark.asyncio
+async def test_get_current_principal_legacy_token_falls_back(valid_payload, user_schema):
+    with patch("src.core.jwt_cache.jwt.decode", return_value=valid_payload), patch(
+        "src.services.auth.get_current_user", new=AsyncMock(return_value=user_schema)
+    ) as get_user:
+        result = await get_current_principal(token="token", db=MagicMock())
+
+    assert result is user_schema
+    get_user.assert_awaited_once()
@@ -0,0 +1,71 @@
+import asyncio
+import pytest
+from contextlib import asynccontextmanager
+from datetime import date, timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from src.core.birthday_store import birthday_score, birthday_store
+from src.core.memory_redis import MemoryRedis
+from src.services.birthdays import (
+    refresh_upcoming_birthdays,
+    run_daily_birthday_refresh,
+)
+
+TODAY = date(2027, 12, 29)
+
+
+@pytest.fixture(autouse=True)
+def redis():
+    redis = MemoryRedis()
+    with patch("src.core.birthday_store.redis_client", new=redis):
+        yield redis
+
+
+def row(id, birth_date, user_id=1):
+    return SimpleNamespace(id=id, user_id=user_id, birth_date=birth_date)
+
+
+@pytest.mark.asyncio
+async def test_write_during_build_reaches_the_new_generation():
+    # Учорашнє покоління, яке ще бачать читачі
+    previous = await birthday_store.begin_build(TODAY - timedelta(days=1))
+    await birthday_store.finish_build(previous)
+    written = row(7, date(1990, 12, 31))
+
+    async def batch(today, next_date, after_id, limit):
+        if after_id == 0:
+            # Запис між begin_build і першим читанням, якого читання не бачить
+            await birthday_store.contact_saved(1, written, today)
+            return [row(3, date(1985, 1, 2))]
+        return []
+
+    with patch("src.services.birthdays.ContactRepository") as repository:
+        repository.return_value.get_birthdays_batch.side_effect = batch
+        assert await refresh_upcoming_birthdays(MagicMock(), TODAY) == 1
+
+    birthday_store.clear()
+    page = await birthday_store.window(1, TODAY, 7, 0, 10)
+    assert page == [
+        (7, birthday_score(written.birth_date, TODAY)),
+        (3, birthday_score(date(1985, 1, 2), TODAY)),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_daily_refresh_reads_from_the_primary():
+    sessions = MagicMock()
+
+    @asynccontextmanager
+    async def session(*args, **kwargs):
+        sessions(*args, **kwargs)
+        yield MagicMock()
+
+    with patch("src.services.birthdays.sessionmanager.session", new=session), patch(
+        "src.services.birthdays.refresh_upcoming_birthdays",
+        new=AsyncMock(side_effect=asyncio.CancelledError),
+    ):
+        with pytest.raises(asyncio.CancelledError):
+            await run_daily_birthday_refresh()
+
+    sessions.assert_called_once_with()
@@ -1,10 +1,15 @@
 import pytest
-from unittest.mock import AsyncMock, MagicMock
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+from sqlalchemy.exc import OperationalError
 
+from src.conf.config import config
+from src.core.birthday_store import birthday_score
 from src.services.contacts import ContactService
-from src.schemas import ContactCreate
-from src.database.models import User
-from datetime import date
+from src.utils.contact_files import ContactFileError
+from src.schemas import ContactCreate, ContactUpdate
+from src.database.models import Contact, User
+from datetime import date, timedelta
 
 @pytest.fixture
 def mock_user():
@@ -32,6 +37,19 @@ def contact_data():
     )
 
 
+@pytest.fixture(autouse=True)
+def suggest_index():
+    with patch("src.services.contacts.suggest_index", new=AsyncMock()) as index:
+        yield index
+
+
+@pytest.fixture(autouse=True)
+def birthday_store():
+    with patch("src.services.contacts.birthday_store", new=AsyncMock()) as store:
+        store.window.return_value = None
+        yield store
+
+
 @pytest.fixture
 def service():
     mock_repo = AsyncMock()
@@ -41,13 +59,16 @@ def service():
 
 
 @pytest.mark.asyncio
-async def test_create_contact(service, contact_data, mock_user, mock_contact):
+async def test_create_contact(
+    service, contact_data, mock_user, mock_contact, suggest_index
+):
     service.repository.create_contact.return_value = mock_contact
 
     result = await service.create_contact(contact_data, mock_user)
 
     service.repository.create_contact.assert_awaited_once_with(contact_data, mock_user)
     assert result == mock_contact
+    suggest_index.contact_saved.assert_awaited_once_with(1, mock_contact)
 
 
 @pytest.mark.asyncio
@@ -57,7 +78,9 @@ async def test_get_contacts(service, mock_user):
 
     result = await service.get_contacts(skip=0, limit=10, user=mock_user)
 
-    service.repository.get_contacts.assert_awaited_once_with(0, 10, mock_user)
+    service.repository.get_contacts.assert_awaited_once_with(
+        0, 10, mock_user, None, "id", False
+    )
     assert result == expected
 
 
@@ -92,7 +115,21 @@ async def test_update_contact(service, contact_data, mock_user):
 
 
 @pytest.mark.asyncio
-async def test_remove_contact(service, mock_user):
+async def test_patch_contact(service, mock_user, suggest_index, birthday_store):
+    body = ContactUpdate(note="updated")
+    service.repository.patch_contact.return_value = {"id": 1, "note": "updated"}
+
+    result = await service.patch_contact(1, body, mock_user)
+
+    service.repository.patch_contact.assert_awaited_once_with(1, body, mock_user)
+    assert result["note"] == "updated"
+    # Нотатка не входить до індексу підказок
+    suggest_index.contact_saved.assert_not_awaited()
+    birthday_store.contact_saved.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_remove_contact(service, mock_user, suggest_index, birthday_store):
     deleted_contact = {"id": 1}
     service.repository.remove_contact.return_value = deleted_contact
 
@@ -100,3 +137,238 @@ async def test_remove_contact(service, mock_user):
 
     service.repository.remove_contact.assert_awaited_once_with(1, mock_user)
     assert result == deleted_contact
+    suggest_index.contact_removed.assert_awaited_once_with(1, 1)
+    birthday_store.contact_removed.assert_awaited_once_with(1, 1)
+
+
+@pytest.mark.asyncio
+async def test_patch_name_updates_suggest_index(service, mock_user, suggest_index):
+    patched = {"id": 1, "first_name": "Jon"}
+    service.repository.patch_contact.return_value = patched
+
+    await service.patch_contact(1, ContactUpdate(first_name="Jon"), mock_user)
+
+    suggest_index.contact_saved.assert_awaited_once_with(1, patched)
+
+
+@pytest.mark.asyncio
+async def test_missing_contact_leaves_suggest_index(service, mock_user, suggest_index):
+    service.repository.remove_contact.return_value = None
+
+    await service.remove_contact(1, mock_user)
+
+    suggest_index.contact_removed.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_suggest_builds_index_from_repository(service, mock_user, suggest_index):
+    suggest_index.lookup.return_value = [{"id": 1}]
+
+    result = await service.suggest("jo", 5, mock_user)
+
+    assert result == [{"id": 1}]
+    user_id, q, limit, load = suggest_index.lookup.await_args.args
+    assert (user_id, q, limit) == (1, "jo", 5)
+    await load()
+    service.repository.get_suggest_entries.assert_awaited_once_with(mock_user)
+
+
+@pytest.mark.asyncio
+async def test_upcoming_birthdays_fall_back_to_database(
+    service, mock_user, birthday_store
+):
+    service.repository.get_upcoming_birthdays.return_value = [{"id": 1}]
+
+    result = await service.get_upcoming_birthdays(7, 0, 10, mock_user)
+
+    assert result == [{"id": 1}]
+    birthday_store.window.assert_awaited_once_with(1, date.today(), 7, 0, 10, None)
+    today, next_date, *rest = service.repository.get_upcoming_birthdays.await_args.args
+    assert (next_date - today).days == 7
+    assert rest == [0, 10, mock_user, None]
+
+
+@pytest.mark.asyncio
+async def test_upcoming_birthdays_from_store(service, mock_user, birthday_store):
+    today = date.today()
+    first = Contact(id=3, birth_date=today + timedelta(days=1), user_id=1)
+    second = Contact(id=2, birth_date=today + timedelta(days=2), user_id=1)
+    birthday_store.window.return_value = [
+        (3, birthday_score(first.birth_date, today)),
+        (2, birthday_score(second.birth_date, today)),
+    ]
+    service.repository.get_contacts_by_ids.return_value = [second, first]
+
+    result = await service.get_upcoming_birthdays(7, 0, 2, mock_user)
+
+    # Лише контакти сторінки, у порядку сховища
+    assert result == [first, second]
+    service.repository.get_contacts_by_ids.assert_awaited_once_with([3, 2], mock_user)
+    service.repository.get_upcoming_birthdays.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_store_page_resumes_after_cursor(service, mock_user, birthday_store):
+    birthday_store.window.return_value = []
+
+    await service.get_upcoming_birthdays(7, 0, 10, mock_user, after=[229, 5])
+
+    today = date.today()
+    position = (birthday_score(date(2000, 2, 29), today), 5)
+    birthday_store.window.assert_awaited_once_with(1, today, 7, 0, 10, position)
+
+
+@pytest.mark.asyncio
+async def test_stale_store_page_falls_back_to_database(
+    service, mock_user, birthday_store
+):
+    today = date.today()
+    moved = Contact(id=3, birth_date=today + timedelta(days=30), user_id=1)
+    birthday_store.window.return_value = [(3, float(today.toordinal() + 2))]
+    service.repository.get_contacts_by_ids.return_value = [moved]
+    service.repository.get_upcoming_birthdays.return_value = []
+
+    # День народження змінили, а сховище ще не виправлене
+    assert await service.get_upcoming_birthdays(7, 0, 10, mock_user) == []
+    service.repository.get_upcoming_birthdays.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_empty_store_window_skips_database(service, mock_user, birthday_store):
+    birthday_store.window.return_value = []
+
+    assert await service.get_upcoming_birthdays(7, 0, 10, mock_user) == []
+    service.repository.get_contacts_by_ids.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_birth_date_patch_corrects_birthday_store(
+    service, mock_user, birthday_store
+):
+    patched = {"id": 1}
+    service.repository.patch_contact.return_value = patched
+
+    body = ContactUpdate(birth_date=date(1990, 1, 1))
+    await service.patch_contact(1, body, mock_user)
+
+    birthday_store.contact_saved.assert_awaited_once_with(1, patched, date.today())
+
+
+def import_record(name, **fields):
+    return {
+        "first_name": name,
+        "last_name": "Import",
+        "email": f"{name}@import.com",
+        "phone_number": "555",
+        "birth_date": "1990-05-15",
+        **fields,
+    }
+
+
+async def import_records(records, error=None):
+    for record in records:
+        yield record
+    if error:
+        raise error
+
+
+@pytest.mark.asyncio
+async def test_import_contacts_batches_rows_and_reports_errors(
+    service, mock_user, suggest_index, birthday_store
+):
+    stored = {"taken@import.com"}  # уже є в базі
+
+    async def insert(rows, user):
+        inserted = [
+            SimpleNamespace(id=i, email=row["email"], birth_date=row["birth_date"])
+            for i, row in enumerate(rows)
+            if row["email"] not in stored
+        ]
+        stored.update(contact.email for contact in inserted)
+        return inserted
+
+    service.repository.import_contacts.side_effect = insert
+    records = import_records(
+        [
+            (2, import_record("a")),
+            (3, "Expected 6 fields, got 2"),
+            (4, import_record("b", birth_date="not a date")),
+            (5, import_record("taken")),
+            (6, import_record("c")),
+            (7, import_record("a")),
+            (8, import_record("d")),
+        ],
+        error=ContactFileError(9, "Line is too long"),
+    )
+
+    with patch.object(config, "CONTACT_IMPORT_BATCH", 2):
+        report = await service.import_contacts(records, mock_user)
+
+    assert report["imported"] == 3
+    assert report["failed"] == 5
+    assert [error["line"] for error in report["errors"]] == [3, 4, 5, 7, 9]
+    assert report["errors"][1]["errors"][0].startswith("birth_date: ")
+    assert report["errors"][2] == {
+        "line": 5,
+        "errors": ["Contact with this email already exists"],
+    }
+    batches = service.repository.import_contacts.await_args_list
+    assert [[row["email"] for row in call.args[0]] for call in batches] == [
+        ["a@import.com", "taken@import.com"],
+        ["c@import.com", "a@import.com"],
+        ["d@import.com"],
+    ]
+    assert birthday_store.contacts_saved.await_count == 3
+    suggest_index.invalidate.assert_awaited_once_with(1)
+
+
+@pytest.mark.asyncio
+async def test_import_stops_with_a_partial_report_on_database_error(
+    service, mock_user, suggest_index, birthday_store
+):
+    async def insert(rows, user):
+        if rows[0]["email"] == "c@import.com":
+            raise OperationalError("INSERT", {}, Exception("connection lost"))
+        return [
+            SimpleNamespace(id=i, email=row["email"], birth_date=row["birth_date"])
+            for i, row in enumerate(rows)
+        ]
+
+    service.repository.import_contacts.side_effect = insert
+    records = import_records(
+        (line, import_record(name))
+        for line, name in zip(range(2, 8), ("a", "b", "c", "d", "e", "f"))
+    )
+
+    with patch.object(config, "CONTACT_IMPORT_BATCH", 2):
+        report = await service.import_contacts(records, mock_user)
+
+    assert report == {
+        "imported": 2,
+        "failed": 2,
+        "errors": [
+            {
+                "line": 4,
+                "errors": [
+                    "Database error: lines 4-5 and the rest of the file were "
+                    "not imported"
+                ],
+            }
+        ],
+    }
+    assert service.repository.import_contacts.await_count == 2
+    birthday_store.contacts_saved.assert_awaited_once()
+    suggest_index.invalidate.assert_awaited_once_with(1)
+
+
+@pytest.mark.asyncio
+async def test_import_error_list_is_capped(service, mock_user, suggest_index):
+    records = import_records([(line, "bad") for line in range(1, 6)])
+
+    with patch.object(config, "CONTACT_IMPORT_MAX_ERRORS", 2):
+        report = await service.import_contacts(records, mock_user)
+
+    assert report["failed"] == 5
+    assert [error["line"] for error in report["errors"]] == [1, 2]
+    service.repository.import_contacts.assert_not_awaited()
+    suggest_index.invalidate.assert_not_awaited()
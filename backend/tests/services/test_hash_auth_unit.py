@@ -34,3 +34,13 @@ def test_verify_password_failure(hasher):
     password = "securepassword"
     hashed = hasher.get_password_hash(password)
     assert not hasher.verify_password("wrongpassword", hashed)
+
+
+@pytest.mark.asyncio
+async def test_async_hash_and_verify(hasher):
+    """
+    Test hashing and verifying a password in the hashing executor.
+    """
+    hashed = await hasher.get_password_hash_async("securepassword")
+    assert await hasher.verify_password_async("securepassword", hashed)
+    assert not await hasher.verify_password_async("wrongpassword", hashed)
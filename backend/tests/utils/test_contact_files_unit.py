@@ -0,0 +1,140 @@
+import pytest
+
+from src.utils.contact_files import (
+    MAX_RECORD_LENGTH,
+    ContactFileError,
+    read_csv,
+    read_jsonl,
+    read_vcard,
+)
+
+
+async def chunked(data: bytes, size: int = 7):
+    # Дрібні чанки розрізають рядки й багатобайтові символи
+    for start in range(0, len(data), size):
+        yield data[start : start + size]
+
+
+async def read(reader, text: str, size: int = 7) -> list:
+    return [record async for record in reader(chunked(text.encode(), size))]
+
+
+@pytest.mark.asyncio
+async def test_csv_records_follow_the_header():
+    text = (
+        "\ufeffFirst Name,last_name,EMAIL,phone_number,birth_date,note\r\n"
+        "Тарас,Шевченко,taras@kobzar.ua,555-0001,1814-03-09,\r\n"
+        "\r\n"
+        'Lesya,Ukrainka,lesya@example.com,555-0002,1871-02-25,"Poet, ""Contra'
+        '\nspem spero"\n'
+        "Short,Row\n"
+    )
+
+    assert await read(read_csv, text) == [
+        (
+            2,
+            {
+                "first_name": "Тарас",
+                "last_name": "Шевченко",
+                "email": "taras@kobzar.ua",
+                "phone_number": "555-0001",
+                "birth_date": "1814-03-09",
+            },
+        ),
+        (
+            4,
+            {
+                "first_name": "Lesya",
+                "last_name": "Ukrainka",
+                "email": "lesya@example.com",
+                "phone_number": "555-0002",
+                "birth_date": "1871-02-25",
+                "note": 'Poet, "Contra\nspem spero',
+            },
+        ),
+        (6, "Expected 6 fields, got 2"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_csv_without_header_or_with_open_quote():
+    with pytest.raises(ContactFileError):
+        await read(read_csv, "\n\n")
+
+    assert await read(read_csv, 'email,note\na@b.c,"open\n') == [
+        (2, "Unterminated quoted field")
+    ]
+
+
+@pytest.mark.asyncio
+async def test_jsonl_reports_bad_lines():
+    text = '{"first_name": "Ivan"}\n\n[1, 2]\n{oops\n{"email": "i@f.ua"}'
+
+    records = await read(read_jsonl, text)
+
+    assert records[0] == (1, {"first_name": "Ivan"})
+    assert records[1] == (3, "Expected a JSON object")
+    assert records[2][0] == 4 and records[2][1].startswith("Invalid JSON")
+    assert records[3] == (5, {"email": "i@f.ua"})
+
+
+@pytest.mark.asyncio
+async def test_overlong_line_stops_the_reader():
+    with pytest.raises(ContactFileError) as e:
+        await read(read_jsonl, "x" * (MAX_RECORD_LENGTH + 1), size=4096)
+
+    assert e.value.line == 1
+
+
+@pytest.mark.asyncio
+async def test_invalid_utf8_stops_the_reader():
+    async def body():
+        yield b'{"a": 1}\n\xff\xfe\n'
+
+    with pytest.raises(ContactFileError, match="UTF-8"):
+        [record async for record in read_jsonl(body())]
+
+
+@pytest.mark.asyncio
+async def test_vcard_maps_properties_to_contact_fields():
+    text = (
+        "BEGIN:VCARD\r\n"
+        "VERSION:3.0\r\n"
+        "N:Franko;Ivan;Yakovych;;\r\n"
+        "FN:Ivan Franko\r\n"
+        "item1.EMAIL;TYPE=INTERNET:ivan@franko.ua\r\n"
+        "EMAIL:second@franko.ua\r\n"
+        "TEL;TYPE=CELL:555-0003\r\n"
+        "BDAY:18560827\r\n"
+        "PHOTO;ENCODING=b;TYPE=JPEG:AAAA\r\n"
+        " BBBB\r\n"
+        "NOTE:Kameniari\\, poem\\nsecond line fol\r\n"
+        " ded\r\n"
+        "END:VCARD\r\n"
+        "BEGIN:VCARD\r\n"
+        "FN:Marko Vovchok\r\n"
+        "END:VCARD\r\n"
+    )
+
+    assert await read(read_vcard, text) == [
+        (
+            1,
+            {
+                "first_name": "Ivan",
+                "last_name": "Franko",
+                "email": "ivan@franko.ua",
+                "phone_number": "555-0003",
+                "note": "Kameniari, poem\nsecond line folded",
+                "birth_date": "1856-08-27",
+            },
+        ),
+        (14, {"first_name": "Marko", "last_name": "Vovchok"}),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_unclosed_vcard_stops_the_reader():
+    with pytest.raises(ContactFileError) as e:
+        await read(read_vcard, "BEGIN:VCARD\nFN:A B\n")
+
+    assert e.value.line == 1